@@ -15,6 +15,7 @@ from astroquery.jplhorizons import Horizons
 # Epoch for which to pull the elements (J2000.0)
 EPOCH = 2451545.0
 KM_PER_AU = 149597870.7  # kilometers in one AU
+DAYS_PER_YEAR = 365.25
 # Horizons location code for the Sun
 LOCATION = "@sun"
 
@@ -72,7 +73,8 @@ def fetch_elements(horizons_id):
         "inc":    float(el["incl"]),   # inclination (deg)
         "Omega":  float(el["Omega"]),  # longitude of ascending node (deg)
         "omega":  float(el["w"]),      # argument of perihelion (deg)
-        "M":      float(el["M"])       # mean anomaly at epoch (deg)
+        "M":      float(el["M"]),      # mean anomaly at epoch (deg)
+        "P":      float(el["P"])       # sidereal orbital period (days)
     }
 
 def make_planet_dict(horizons_id, name, moon_ids):
@@ -100,6 +102,7 @@ def make_planet_dict(horizons_id, name, moon_ids):
             "theta":       mev["Omega"],
             "alpha":       mev["omega"],
             "start_phase": (mev["M"] % 360) / 360.0,
+            "period":      mev["P"] / DAYS_PER_YEAR,
             "bound_objects": []
         })
 
@@ -111,6 +114,7 @@ def make_planet_dict(horizons_id, name, moon_ids):
         "theta":        el["Omega"],
         "alpha":        el["omega"],
         "start_phase":  start_phase,
+        "period":       el["P"] / DAYS_PER_YEAR,
         "bound_objects": moons
     }
 
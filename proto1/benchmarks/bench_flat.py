@@ -0,0 +1,81 @@
+"""
+Memory per body and depth first traversal speed: StarSystem object graphs against FlatSystem record arrays.
+
+    python benchmarks/bench_flat.py [n_systems]
+"""
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import framework as fr
+from framework.objects.ship import Ship
+
+
+def resident(build):
+    """Result of build() and the memory it still holds once built."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed * 1000:10.2f} ms")
+    return elapsed
+
+
+def object_mass(systems):
+    total = 0.0
+    for system in systems:
+        for body in system.walk():
+            if not isinstance(body, Ship):
+                total += body.mass
+    return total
+
+
+def flat_mass(flats):
+    total = 0.0
+    for flat in flats:
+        total += float(flat.records["mass"].sum())
+    return total
+
+
+def display_all(systems):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for system in systems:
+            system.display()
+
+
+if __name__ == "__main__":
+    n_systems = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+    def generate():
+        universe = fr.Universe()
+        universe.generate(n_systems, 5.0, seed=42, processes=1)
+        return list(universe.systems.values())
+
+    systems, object_bytes = resident(generate)
+    flats, flat_bytes = resident(lambda: [fr.FlatSystem.from_system(system) for system in systems])
+    n_bodies = sum(len(flat) for flat in flats)
+
+    print(f"{n_systems} systems, {n_bodies} bodies\n")
+    print(f"{'object graph':<36} {object_bytes / n_bodies:10.0f} bytes/body")
+    print(f"{'FlatSystem':<36} {flat_bytes / n_bodies:10.0f} bytes/body")
+    print(f"{'  of which records':<36} {sum(f.records.nbytes for f in flats) / n_bodies:10.0f} bytes/body\n")
+
+    assert abs(object_mass(systems) - flat_mass(flats)) < 1e-6 * abs(flat_mass(flats))
+    assert fr.exporters.system_to_dict(flats[0]) == fr.exporters.system_to_dict(systems[0])
+    timed("walk objects, sum mass", lambda: object_mass(systems))
+    timed("flat records, sum mass", lambda: flat_mass(flats))
+    timed("walk FlatSystem views", lambda: sum(1 for flat in flats for _ in flat.walk()))
+    timed("display, object graph", lambda: display_all(systems))
+    timed("display, FlatSystem", lambda: display_all(flats))
@@ -0,0 +1,63 @@
+"""
+Ship bookkeeping with many ships: the old scheme (ships inserted at the front of the
+orbit lists, found by walking the trees) against the Fleet registry.
+
+    python benchmarks/bench_fleet.py [n_ships]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import framework as fr
+from framework.utils_class import Rng
+
+
+def timed(label, fn, count, unit):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {count / elapsed:12,.0f} {unit}/s")
+
+
+if __name__ == "__main__":
+    n_ships = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = Rng(1)
+    system = fr.StarSystem(1, name="AAA-0001")
+    system.generate(8, rng=rng)
+    bodies = list(system.walk())
+    owners = [f"player-{i}" for i in range(20)]
+    stats = [{"name": f"ship-{i}", "owner": owners[i % len(owners)], "type": ("frigate", "cargo")[i % 2]}
+             for i in range(n_ships)]
+    home, away = bodies[1], bodies[-1]
+    print(f"{n_ships} ships, {len(bodies)} bodies\n")
+
+    # ==== Old scheme, reproduced on plain lists
+    orbit = list(home.orbit)
+    def old_spawn():
+        for s in stats:
+            orbit.insert(0, s)
+    timed("orbit.insert(0, ship)", old_spawn, n_ships, "spawns")
+    moved = stats[::2]
+    destination = []
+    def old_move():
+        for s in moved:
+            orbit.remove(s)
+            destination.insert(0, s)
+    timed("orbit.remove + insert, half the ships", old_move, len(moved), "moves")
+    timed("owner lookup by walking the orbit", lambda: [s for s in orbit + destination if isinstance(s, dict) and s["owner"] == owners[0]], 1, "lookups")
+
+    # ==== Fleet
+    fleet = fr.Fleet()
+    ships = []
+    timed("Ship(...) in a Fleet", lambda: ships.extend(fr.Ship(i, s, home, fleet=fleet) for i, s in enumerate(stats)), n_ships, "spawns")
+    timed("fleet.move, half the ships at once", lambda: fleet.move(ships[::2], away), len(ships[::2]), "moves")
+    timed("fleet.owned_by", lambda: fleet.owned_by(owners[0]), 1, "lookups")
+    timed("fleet.where(owner, type, location)", lambda: fleet.where(owner=owners[0], type="cargo", location=away), 1, "lookups")
+
+    assert len(fleet.at(away)) == len(ships[::2]) and system.get_object("ship-0") is ships[0]
+
+    universe = fr.Universe()
+    universe.add_system(system)
+    assert fr.Ship(n_ships, {}, away).fleet is universe.fleet  # no fleet given: the universe's
@@ -0,0 +1,34 @@
+"""
+Systems/second of Universe.generate: the per-system loop against the bulk (columnar) path.
+
+    python benchmarks/bench_generation.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import framework as fr
+
+
+def bench(label, n_systems, **kwargs):
+    universe = fr.Universe()
+    start = time.perf_counter()
+    universe.generate(n_systems, 5.0, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {n_systems:>9} systems  {elapsed:8.3f} s  {n_systems / elapsed:12.0f} systems/s")
+    return universe
+
+
+if __name__ == "__main__":
+    bench("loop", 5_000)
+    universe = bench("bulk", 1_000_000, bulk=True)
+
+    # Cost of building the systems that actually get visited
+    names = list(universe.systems)[:5_000]
+    start = time.perf_counter()
+    for name in names:
+        universe.get_system(name)
+    elapsed = time.perf_counter() - start
+    print(f"{'bulk, materialize on access':<28} {len(names):>9} systems  {elapsed:8.3f} s  {len(names) / elapsed:12.0f} systems/s")
@@ -0,0 +1,69 @@
+"""
+Heightmap generation time per resolution and octave count, and the smoothing pass alone:
+dense convolve2d (cost grows with the kernel area) against the separable binomial blur.
+Then the on-disk TileCache: file size and read time per quantization, against generating.
+
+    python benchmarks/bench_heightmap.py [max_rows]
+"""
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from scipy.signal import convolve2d
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework.objects.planet import generate_heightmap, smooth
+from framework.tile_cache import TileCache
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+
+    print(f"{'smoothing':<12} {'size':>4} {'convolve2d':>12} {'separable':>12}")
+    field = np.random.default_rng(0).random((1024, 2048))
+    for size in (3, 4, 5, 6):
+        row = np.array([math.comb(size - 1, k) for k in range(size)]) / 2 ** (size - 1)
+        dense = timed(lambda: convolve2d(field, np.outer(row, row), mode="same", boundary="wrap"))
+        separable = timed(lambda: smooth(field, size))
+        print(f"{'1024x2048':<12} {size:>4} {dense * 1000:9.1f} ms {separable * 1000:9.1f} ms")
+
+    print(f"\n{'heightmap':<12} {'octaves':>7} {'time':>12}")
+    rows = 32
+    while rows <= max_rows:
+        for octaves in sorted({1, int(math.log2(rows // 32)) + 1}):
+            elapsed = timed(lambda: generate_heightmap(rows, 2 * rows, surface_seed=1234, octaves=octaves))
+            print(f"{f'{rows}x{2 * rows}':<12} {octaves:>7} {elapsed * 1000:9.1f} ms")
+        rows *= 4
+
+    rows = min(max_rows, 2048)
+    octaves = int(math.log2(rows // 32)) + 1
+    generated = timed(lambda: generate_heightmap(rows, 2 * rows, surface_seed=1234, octaves=octaves))
+    print(f"\n{rows}x{2 * rows}, {octaves} octaves: generated in {generated * 1000:.1f} ms, "
+          f"{rows * 2 * rows * 8 / 2**20:.1f} MiB as float64")
+    print(f"{'tile cache':<16} {'file':>10} {'get':>12} {'get_quantized':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for bits, compress in ((16, False), (8, False), (16, True), (8, True)):
+            tiles = TileCache(os.path.join(directory, f"{bits}{compress}"), bits=bits, compress=compress)
+            tiles.get(1234, rows, 2 * rows, octaves)
+            size = tiles.nbytes
+            read = timed(lambda: tiles.get(1234, rows, 2 * rows, octaves))
+            mapped = timed(lambda: tiles.get_quantized(1234, rows, 2 * rows, octaves))
+            label = f"uint{bits}{' + zip' if compress else ''}"
+            print(f"{label:<16} {size / 2**20:6.1f} MiB {read * 1000:9.1f} ms {mapped * 1000:11.1f} ms")
+
+            # A truncated file (interrupted copy, full disk) is a miss, regenerated and stored again
+            expected = tiles.get(1234, rows, 2 * rows, octaves)
+            path = tiles.path(1234, rows, 2 * rows, octaves)
+            with open(path, "r+b") as f:
+                f.truncate(os.path.getsize(path) // 2)
+            assert np.array_equal(tiles.get(1234, rows, 2 * rows, octaves), expected)
@@ -0,0 +1,42 @@
+"""
+Resident bytes per body of a generated universe, and Universe.memory_report() for the
+breakdown by class.
+
+    python benchmarks/bench_memory.py [n_systems]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import framework as fr
+
+
+if __name__ == "__main__":
+    n_systems = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    universe = fr.Universe()
+    universe.generate(n_systems, 5.0, seed=42, processes=1)
+    elapsed = time.perf_counter() - start
+    resident = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    stats = universe.tree_stats()
+    print(stats, "\n")
+    print(f"{'generation':<36} {elapsed:10.2f} s")
+    print(f"{'resident, traced':<36} {resident / stats.bodies:10.0f} bytes/body\n")
+
+    totals = []
+    for sample in (None, 500):
+        start = time.perf_counter()
+        report = universe.memory_report(sample=sample)
+        totals.append(report.total)
+        print(report)
+        print(f"{'report, sample=' + str(sample):<36} {(time.perf_counter() - start) * 1000:10.0f} ms\n")
+
+    print(f"{'sampled total / full total':<36} {totals[1] / totals[0]:10.3f}")
+    assert abs(totals[1] / totals[0] - 1) < 0.1
@@ -0,0 +1,39 @@
+"""
+Scaling of seeded multi-process generation with the worker count.
+Also checks the universe is identical for every worker count.
+
+    python benchmarks/bench_parallel.py [n_systems]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import framework as fr
+
+
+def fingerprint(universe):
+    return [str(system) for system in universe.systems.values()]
+
+
+if __name__ == "__main__":
+    n_systems = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    n_cores = os.cpu_count()
+    workers = sorted({1, 2, 4, 8, 16, 32, n_cores} & set(range(1, n_cores + 1)))
+
+    reference = None
+    base = None
+    for processes in workers:
+        universe = fr.Universe()
+        start = time.perf_counter()
+        universe.generate(n_systems, 5.0, seed=1234, processes=processes)
+        elapsed = time.perf_counter() - start
+
+        base = base or elapsed
+        print(f"{processes:>3} processes  {elapsed:8.3f} s  {n_systems / elapsed:10.0f} systems/s  speedup {base / elapsed:5.2f}x")
+
+        if reference is None:
+            reference = fingerprint(universe)
+        elif fingerprint(universe) != reference:
+            raise SystemExit(f"universe differs with {processes} processes")
@@ -0,0 +1,78 @@
+"""
+Planets per second: Planet(...) one by one against Planet.batch, then whole systems
+built one at a time against a chunk through StarSystem.generate_many. Also checks that
+both paths sample the same distributions (two sample Kolmogorov-Smirnov per property).
+
+    python benchmarks/bench_planet_batch.py [n_planets]
+"""
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+from scipy.stats import ks_2samp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import framework as fr
+from framework.utils_class import Rng
+from framework.system_table import SystemTable
+
+
+PROPERTIES = ("mass", "radius", "density", "surface_gravity", "escape_velocity",
+              "orbital_period", "rotation_period", "temperature")
+
+
+def rate(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {count / elapsed:12,.0f} planets/s")
+    return elapsed
+
+
+def compare(label, scalar, batch):
+    print(f"\n{label}: KS p-value per property (small values would mean different distributions)")
+    for name in PROPERTIES:
+        p = ks_2samp([getattr(x, name) for x in scalar], [getattr(x, name) for x in batch]).pvalue
+        print(f"  {name:<20} {p:6.3f}")
+    for name in ("planet_type", "atmosphere"):
+        counts = Counter(getattr(x, name) for x in scalar), Counter(getattr(x, name) for x in batch)
+        print(f"  {name:<20} " + ", ".join(f"{k} {counts[0][k]}/{counts[1][k]}" for k in sorted(counts[0] | counts[1])))
+
+
+if __name__ == "__main__":
+    n_planets = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = Rng(1)
+    radii = rng.np.uniform(0.5, 12.0, n_planets)
+    parent = fr.Planet(0, 5.0, planet_type="Gas", rng=rng)
+
+    scalar_time = rate("Planet(...) one by one", lambda: [fr.Planet(i, r, rng=rng) for i, r in enumerate(radii)], n_planets)
+    for size in (10, 100, 1000, n_planets):
+        def run():
+            for start in range(0, n_planets, size):
+                fr.Planet.batch([None] * len(radii[start:start + size]), radii[start:start + size], rng=rng)
+        rate(f"Planet.batch, {size} per call", run, n_planets)
+
+    n = min(n_planets, 20_000)
+    compare("Planets", [fr.Planet(i, r, rng=rng) for i, r in enumerate(radii[:n])],
+            fr.Planet.batch([None] * n, radii[:n], rng=rng))
+    moon_radii = rng.np.uniform(0.02, 0.3, n)
+    compare("Moons", [fr.Planet(i, r, is_moon=True, parent_planet=parent, rng=rng) for i, r in enumerate(moon_radii)],
+            fr.Planet.batch([None] * n, moon_radii, is_moon=True, parents=parent, rng=rng))
+
+    # ==== Whole systems, seeded rows of a SystemTable
+    table = SystemTable.sample(max(1, n_planets // 20), 5.0, seed=42)
+    print()
+    start = time.perf_counter()
+    alone = [table.build_system(row) for row in range(len(table))]
+    alone_time = time.perf_counter() - start
+    start = time.perf_counter()
+    together = [system for chunk in range(0, len(table), 256) for system in table.build_systems(range(chunk, min(chunk + 256, len(table))))]
+    together_time = time.perf_counter() - start
+
+    assert [s.star.orbit[-1].mass for s in alone] == [s.star.orbit[-1].mass for s in together]
+    print(f"{len(table)} systems, {int(table.n_planets.sum())} planets")
+    print(f"{'build_system one by one':<36} {len(table) / alone_time:12,.0f} systems/s")
+    print(f"{'build_systems, 256 per chunk':<36} {len(table) / together_time:12,.0f} systems/s")
@@ -0,0 +1,86 @@
+"""
+"G-class systems with a Rock planet between 0.8 and 1.5 AU at 250-320 K":
+walking the object tree against the columnar BodyTable.
+
+    python benchmarks/bench_query.py [n_systems]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import framework as fr
+from framework import col
+from framework.storage import celestial_bodies
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<36} {elapsed * 1000:10.2f} ms")
+    return result, elapsed
+
+
+def walk_query(universe):
+    names = set()
+    for name, system in universe.systems.items():
+        if system.star.spectral_class != "G":
+            continue
+        for body, _ in celestial_bodies(system):
+            if body.planet_type == "Rock" and 0.8 <= body.orbit_radius <= 1.5 and 250 <= body.temperature <= 320:
+                names.add(name)
+                break
+    return names
+
+
+if __name__ == "__main__":
+    n_systems = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    universe = fr.Universe()
+    universe.generate(n_systems, 5.0, seed=42, processes=1)
+    query = (
+        (col("spectral_class") == "G") & (col("planet_type") == "Rock")
+        & col("orbit_radius").between(0.8, 1.5) & col("temperature").between(250, 320)
+    )
+
+    table, _ = timed("build BodyTable from objects", lambda: universe.body_table)
+    print(f"{len(table)} bodies\n")
+
+    expected, walk_time = timed("walk the object tree", lambda: walk_query(universe))
+    result, column_time = timed("columnar query", lambda: universe.query(query), repeat=20)
+    assert set(result.systems()) == expected
+    print(f"{len(expected)} systems match, {walk_time / column_time:.0f}x faster, "
+          f"{column_time * 1000 / len(table) * 1e6:.1f} ms per million bodies\n")
+
+    name = next(iter(universe.systems))
+    system = universe.systems[name]
+    timed("remove one system", lambda: universe.remove_system(name))
+    timed("add it back", lambda: universe.add_system(system))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "universe.bin")
+        universe.save(path)
+        opened = fr.Universe.open(path)
+        timed("BodyTable from an opened file", lambda: opened.body_table)
+
+    # Bodies removed from systems that went through worker processes (pickled back), and
+    # from lazy systems that are evicted and rebuilt from their seed afterwards
+    pooled = fr.Universe()
+    pooled.generate(200, 5.0, seed=42, processes=2)
+    lazy = fr.Universe()
+    lazy.generate(200, 5.0, seed=42, lazy=True, max_systems=5)
+    for removing in (pooled, lazy):
+        removing.body_table
+        for name in list(removing.systems)[:20]:
+            system = removing.systems[name]
+            body = next(body for body, _ in celestial_bodies(system))
+            assert removing.remove_object(body.name) is body and body not in system.walk()
+        result = removing.query(col("mass") > 0)
+        objects = result.objects()
+        assert [body.id for body in objects] == result.ids().tolist()
+        assert [body.mass for body in objects] == result.column("mass").tolist()
+        print(f"\n{len(result)} bodies left after removals, body_table in sync")
@@ -0,0 +1,51 @@
+"""
+Frames per second of the terminal heightmap renderer: the original per cell version
+against the lookup table one, frames written to /dev/null.
+
+    python benchmarks/bench_render.py [scheme]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework.objects.planet import height_to_color, render_heightmap
+
+
+def render_per_cell(map_data, file):
+    """The renderer before the lookup table, two height_to_color calls and one print per line."""
+    rows, cols = map_data.shape
+    for y in range(0, rows, 2):
+        top = map_data[y]
+        bottom = map_data[y+1] if y+1 < rows else np.zeros(cols)
+        line = ""
+        for t, b in zip(top, bottom):
+            color_top = height_to_color(t)
+            color_bottom = height_to_color(b)
+            line += f"\x1b[48;5;{color_bottom}m\x1b[38;5;{color_top}m▀"
+        print(line + "\x1b[0m", file=file)
+
+
+def fps(render, min_time=0.5):
+    frames = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time:
+        render()
+        frames += 1
+    return frames / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    scheme = sys.argv[1] if len(sys.argv) > 1 else "earth"
+    rng = np.random.default_rng(0)
+
+    with open(os.devnull, "w") as devnull:
+        print(f"{'heightmap':<12} {'width':>6} {'per cell':>12} {'lookup table':>14}")
+        for rows, cols, width in ((32, 64, None), (128, 256, None), (512, 1024, None), (512, 1024, 160)):
+            heightmap = rng.random((rows, cols))
+            old = fps(lambda: render_per_cell(heightmap, devnull)) if width is None and scheme == "earth" else float("nan")
+            new = fps(lambda: render_heightmap(heightmap, scheme, width=width, file=devnull))
+            print(f"{rows}x{cols:<8} {width or cols:>6} {old:10.1f}/s {new:12.1f}/s")
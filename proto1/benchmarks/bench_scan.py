@@ -0,0 +1,78 @@
+"""
+Scanning every planet of a universe: planet.scan() in a loop against scan_planets on a pool.
+Only the compute is timed (terminal output goes to /dev/null).
+
+    python benchmarks/bench_scan.py [n_systems] [processes]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import framework as fr
+from framework.objects.planet import HEIGHTMAP_CACHE
+
+
+def planets_of(n_systems):
+    universe = fr.Universe()
+    universe.generate(n_systems, 5.0, seed=42, processes=1)
+    return [body for system in universe.systems.values() for body in system.walk() if isinstance(body, fr.Planet)]
+
+
+def timed(label, fn, n_planets):
+    HEIGHTMAP_CACHE.clear()
+    random.seed(0)
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f} s   {n_planets / elapsed:8.0f} planets/s")
+
+
+def serial(planets):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for planet in planets:
+            planet.compute_scan()
+            planet.heightmap
+
+
+if __name__ == "__main__":
+    n_systems = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    HEIGHTMAP_CACHE.max_bytes = 2**30  # keep every map, nothing is regenerated
+
+    n_planets = len(planets_of(n_systems))
+    print(f"{n_planets} planets, {os.cpu_count()} cores\n")
+    timed("serial compute_scan", lambda: serial(planets_of(n_systems)), n_planets)
+    timed("scan_planets, 1 process", lambda: list(fr.scan_planets(planets_of(n_systems), processes=1)), n_planets)
+    timed(f"scan_planets, {processes} processes", lambda: list(fr.scan_planets(planets_of(n_systems), processes=processes)), n_planets)
+
+    # A lazy universe keeping 2 systems built: scans must outlive the evictions
+    lazy = fr.Universe()
+    lazy.generate(n_systems, 5.0, seed=42, lazy=True, max_systems=2)
+    names = list(lazy.systems)
+    first_planet = lambda name: next(body for body in lazy.systems[name].walk() if isinstance(body, fr.Planet))
+
+    held = first_planet(names[0])
+    for name in names[1:4]:
+        lazy.systems[name]
+    held.compute_scan()  # its system was evicted meanwhile
+    for name in names[4:7]:
+        lazy.systems[name]
+    live = lazy.get_object(held.name)
+    assert live is not held and live.has_been_scanned and live.surface_seed == held.surface_seed
+    print("\nscan of a planet held across an eviction kept")
+
+    requested = [first_planet(name).name for name in names[10:16]]
+    list(lazy.scan_bodies(requested, processes=processes))
+    assert all(lazy.get_object(name).has_been_scanned for name in requested)
+    print("scan_bodies over more systems than max_systems, every scan kept")
+
+    planets = [body for body in lazy.systems[names[20]].walk() if isinstance(body, fr.Planet)]
+    scanning = fr.scan_planets(planets, processes=1)
+    next(scanning)
+    scanning.close()
+    assert all(planet.surface_seed is None for planet in planets if not planet.has_been_scanned)
+    print("planets of an abandoned scan_planets left untouched")
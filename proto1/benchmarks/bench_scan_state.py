@@ -0,0 +1,66 @@
+"""
+Save size and resident memory of scanned planets: heightmap arrays kept on every planet
+(as before) against planets that only keep surface_seed and rebuild maps through the cache.
+
+    python benchmarks/bench_scan_state.py [n_planets] [cache_mib]
+"""
+import contextlib
+import json
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import framework as fr
+from framework.objects.planet import HEIGHTMAP_CACHE, generate_heightmap
+from framework.memory import public_attributes
+
+
+def to_serializable(obj):
+    """Same as main.py"""
+    data = {}
+    for k, v in public_attributes(obj).items():
+        if isinstance(v, np.ndarray):
+            data[k] = v.tolist()
+        elif hasattr(v, "__dict__") or hasattr(v, "__slots__"):
+            data[k] = to_serializable(v)
+        elif isinstance(v, (list, dict, str, int, float, bool)) or v is None:
+            data[k] = v
+        else:
+            data[k] = str(v)
+    return data
+
+
+def scanned_planets(n_planets, keep_arrays):
+    planets = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(n_planets):
+            planet = fr.Planet(i, 1.0 + i % 7, planet_type="Rock")
+            planet.scan()
+            if keep_arrays:
+                # What scan() used to leave on the planet
+                planet.custom_heightmap = generate_heightmap(32, 64, planet.surface_seed)
+            planets.append(planet)
+    return planets
+
+
+def measure(label, n_planets, keep_arrays):
+    HEIGHTMAP_CACHE.clear()
+    tracemalloc.start()
+    planets = scanned_planets(n_planets, keep_arrays)
+    resident = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    saved = sum(len(json.dumps(to_serializable(planet))) for planet in planets)
+    print(f"{label:<24} save {saved / 2**20:8.2f} MiB   resident {resident / 2**20:8.2f} MiB   "
+          f"({saved / n_planets / 1024:6.1f} KiB per planet on disk)")
+
+
+if __name__ == "__main__":
+    n_planets = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    HEIGHTMAP_CACHE.max_bytes = int(sys.argv[2] if len(sys.argv) > 2 else 8) * 2**20
+    print(f"{n_planets} scanned planets, heightmap cache bounded to {HEIGHTMAP_CACHE.max_bytes / 2**20:.0f} MiB\n")
+    measure("heightmap arrays", n_planets, keep_arrays=True)
+    measure("surface_seed only", n_planets, keep_arrays=False)
@@ -0,0 +1,66 @@
+"""
+Load time and peak memory: pickle of the whole Universe against the memory mapped binary format.
+
+    python benchmarks/bench_storage.py [n_systems]
+"""
+import os
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import framework as fr
+
+
+def measure(label, fn):
+    # Timed without tracemalloc, which slows allocation heavy code down a lot
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {elapsed * 1000:10.2f} ms   peak {peak / 2**20:9.2f} MiB")
+    return result
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+if __name__ == "__main__":
+    n_systems = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    universe = fr.Universe()
+    universe.generate(n_systems, 5.0, seed=42, processes=1)
+    some_name = list(universe.systems)[n_systems // 2]
+
+    with tempfile.TemporaryDirectory() as directory:
+        pickle_path = os.path.join(directory, "universe.pkl")
+        binary_path = os.path.join(directory, "universe.bin")
+
+        with open(pickle_path, "wb") as f:
+            pickle.dump(universe, f)
+        universe.save(binary_path)
+        print(f"{n_systems} systems   pickle {os.path.getsize(pickle_path) / 2**20:.1f} MiB   "
+              f"binary {os.path.getsize(binary_path) / 2**20:.1f} MiB\n")
+
+        loaded = measure("pickle.load", lambda: load_pickle(pickle_path))
+        measure("pickle, one system", lambda: loaded.get_system(some_name))
+        del loaded
+
+        opened = measure("Universe.open", lambda: fr.Universe.open(binary_path))
+        measure("binary, one system by name", lambda: opened.get_system(some_name))
+        measure("binary, one system by row", lambda: opened.table.build_system(n_systems // 3))
+
+    # universe.pkl was written before the model classes had __slots__, it must still load
+    old = load_pickle(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "universe.pkl"))
+    system = next(iter(old.systems.values()))
+    assert old.get_object(system.star.name) is system.star and len(old.query(fr.col("mass") > 0)) > 0
+    print(f"\nuniverse.pkl from before the slots: {len(old.systems)} systems loaded")
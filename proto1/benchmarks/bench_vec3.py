@@ -0,0 +1,71 @@
+"""
+Distances and angles over many positions: loops over Vec3 against one Vec3Array call.
+
+    python benchmarks/bench_vec3.py [n_vectors]
+"""
+import math
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from framework.utils_class import Vec3, Vec3Array, Vec3View
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed * 1000:10.2f} ms")
+    return result, elapsed
+
+
+def compare(label, loop, batched):
+    expected, loop_time = timed(f"{label}, Vec3 loop", loop)
+    result, batch_time = timed(f"{label}, Vec3Array", batched)
+    assert np.allclose(expected, result)
+    print(f"{'':<36} {loop_time / batch_time:10.0f}x\n")
+
+
+if __name__ == "__main__":
+    n_vectors = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    positions = Vec3Array(rng.random((n_vectors, 3)))
+    headings = Vec3Array(rng.random((n_vectors, 3)) - 0.5)
+    vectors = [Vec3(*row) for row in positions.data.tolist()]
+    heading_vectors = [Vec3(*row) for row in headings.data.tolist()]
+    ship = Vec3(0.5, 0.5, 0.5)
+
+    compare("norm", lambda: [v.norm() for v in vectors], positions.norm)
+    compare("distance to one point", lambda: [math.dist(v.to_list(), ship.to_list()) for v in vectors],
+            lambda: positions.distance_to(ship))
+    compare("angle, row by row", lambda: [v.angle_with(h) for v, h in zip(vectors, heading_vectors)],
+            lambda: positions.angle_with(headings))
+    compare("cross, row by row", lambda: [v.cross(h).to_list() for v, h in zip(vectors, heading_vectors)],
+            lambda: positions.cross(headings).data)
+
+    m = min(n_vectors, 2000)
+    compare(f"pairwise distances, {m}x{m}",
+            lambda: [[math.dist(a.to_list(), b.to_list()) for b in vectors[:m]] for a in vectors[:m]],
+            lambda: positions[:m].pairwise_distances())
+
+    # Vec3View.SHARED_PICKLE_ROWS: a chunk of views pickled with their whole array or a row each
+    chunk = rng.random((256, 3))
+    views = [Vec3View(chunk, row) for row in range(len(chunk))]
+    shared_rows = Vec3View.SHARED_PICKLE_ROWS
+    for label, rows in (("whole array", shared_rows), ("own row", 0)):
+        Vec3View.SHARED_PICKLE_ROWS = rows
+        data = pickle.dumps(views)
+        tracemalloc.start()
+        loaded = pickle.loads(data)
+        resident = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{'256 views, ' + label:<36} {len(data) / len(views):7.0f} B pickled {resident / len(views):7.0f} B resident per view")
+    Vec3View.SHARED_PICKLE_ROWS = shared_rows
+    lone = len(pickle.dumps(Vec3View(np.zeros((Vec3View.SHARED_PICKLE_ROWS, 3)), 0)))
+    print(f"{f'1 view of {Vec3View.SHARED_PICKLE_ROWS} rows, whole array':<36} {lone:7.0f} B pickled")
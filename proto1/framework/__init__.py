@@ -1,8 +1,20 @@
 from .objects.star import Star
 from .objects.planet import Planet
-from .objects.star_system import StarSystem
+from .objects.star_system import StarSystem, TreeStats
 from .objects.universe import Universe
 
 
 
 from .objects.ship import Ship
+from .fleet import Fleet, FLEET
+
+from .spatial_index import SpatialIndex
+from .utils_class import Vec3, Vec3Array
+
+from .storage import UniverseWriter, UniverseFile
+from .exporters import JsonLinesWriter, SectorWriter
+from .query import BodyTable, col
+from .flat_system import FlatSystem
+from .tile_cache import TileCache
+from .scanning import scan_planets
+from .memory import MemoryReport
@@ -0,0 +1,113 @@
+"""
+Writers universes can be streamed into, one system at a time.
+
+Every writer is a context manager with add(system) and extend(systems), extend also
+accepts the chunks Universe.iter_generate yields. UniverseWriter (binary format) follows
+the same interface.
+"""
+import json
+import os
+
+import numpy as np
+
+from .objects.star import Star
+from .objects.planet import Planet
+from .objects.ship import Ship
+
+
+def body_to_dict(body):
+    if isinstance(body, Star):
+        data = {
+            "kind": "star", "id": body.id, "name": body.name, "spectral_class": body.spectral_class,
+            "temperature": body.temperature, "mass": body.mass, "radius": body.radius, "luminosity": body.luminosity,
+        }
+    elif isinstance(body, Planet):
+        data = {
+            "kind": "moon" if body.is_moon else "planet", "id": body.id, "name": body.name,
+            "planet_type": body.planet_type, "orbit_radius": body.orbit_radius, "mass": body.mass,
+            "radius": body.radius, "density": body.density, "surface_gravity": body.surface_gravity,
+            "escape_velocity": body.escape_velocity, "orbital_period": body.orbital_period,
+            "rotation_period": body.rotation_period, "atmosphere": body.atmosphere,
+            "temperature": body.temperature, "core_composition": body.core_composition,
+        }
+    elif isinstance(body, Ship):
+        return {"kind": "ship", "id": body.id, "name": body.name, "type": body.type, "owner": body.owner}
+    else:
+        raise TypeError(f"Cannot export {type(body).__name__}")
+
+    data["orbit"] = [body_to_dict(child) for child in body.satellites()]
+    return data
+
+
+def system_to_dict(system):
+    return {
+        "id": system.id,
+        "name": system.name,
+        "position": system.position.to_list(),
+        "star": body_to_dict(system.star) if system.star else None,
+    }
+
+
+class SystemWriter:
+    """Base of the writers: subclasses implement add(system) and close()."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def extend(self, systems):
+        for item in systems:
+            if isinstance(item, list):
+                for system in item:
+                    self.add(system)
+            else:
+                self.add(item)
+
+
+class JsonLinesWriter(SystemWriter):
+    """One JSON object per line and per system."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+
+    def add(self, system):
+        self._file.write(json.dumps(system_to_dict(system)))
+        self._file.write("\n")
+
+    def close(self):
+        self._file.close()
+
+
+class SectorWriter(SystemWriter):
+    """
+    Splits the unit cube into sectors_per_axis^3 sectors and routes every system
+    to the file of its sector, e.g. sector_1_0_3.jsonl.
+    writer_factory(path) builds the writer of one sector (JsonLinesWriter, UniverseWriter, ...).
+    """
+
+    def __init__(self, directory, sectors_per_axis: int = 4, writer_factory=JsonLinesWriter, extension="jsonl"):
+        self.directory = directory
+        self.sectors_per_axis = sectors_per_axis
+        self.writer_factory = writer_factory
+        self.extension = extension
+        self._writers = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def sector_of(self, position):
+        cell = np.floor(np.asarray(position.to_list()) * self.sectors_per_axis).astype(int)
+        return tuple(np.clip(cell, 0, self.sectors_per_axis - 1).tolist())
+
+    def add(self, system):
+        sector = self.sector_of(system.position)
+        writer = self._writers.get(sector)
+        if writer is None:
+            path = os.path.join(self.directory, "sector_{}_{}_{}.{}".format(*sector, self.extension))
+            writer = self._writers[sector] = self.writer_factory(path)
+        writer.add(system)
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
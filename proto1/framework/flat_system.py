@@ -0,0 +1,276 @@
+"""
+Compact form of a StarSystem: one contiguous record array instead of a graph of Python objects.
+
+Rows are the star and its planets/moons/subplanets in depth first (pre)order, so a
+depth first traversal is a plain scan of the rows. Every row links its parent,
+first child and next sibling (-1 when there is none). Names live in one string,
+rows point into it. Ships are player state and are not flattened.
+
+Row access goes through thin views, StarView/PlanetView, which read their
+attributes from the record so code written against Star/Planet keeps working.
+"""
+import sys
+
+import numpy as np
+
+from .utils_class import *
+from .objects.star import Star
+from .objects.planet import Planet
+from .objects.ship import Ship
+from .objects.star_system import StarSystem, system_header, body_line
+from .system_table import SPECTRAL_CLASSES
+from .storage import PLANET_TYPES, ATMOSPHERES, CORE_COMPOSITIONS
+
+
+STAR, PLANET, MOON = 0, 1, 2
+NO_CODE = 255
+
+FLAT_DTYPE = np.dtype([
+    ("id", "<i8"),
+    ("parent", "<i4"),
+    ("first_child", "<i4"),
+    ("next_sibling", "<i4"),
+    ("depth", "u1"),
+    ("kind", "u1"),
+    ("spectral_class", "u1"),
+    ("planet_type", "u1"),
+    ("atmosphere", "u1"),
+    ("core_composition", "u1"),
+    ("is_moon", "?"),
+    ("name_length", "<i4"),
+    ("name_offset", "<i4"),
+    ("orbit_radius", "<f8"),
+    ("mass", "<f8"),
+    ("radius", "<f8"),
+    ("density", "<f8"),
+    ("surface_gravity", "<f8"),
+    ("escape_velocity", "<f8"),
+    ("orbital_period", "<f8"),
+    ("rotation_period", "<f8"),
+    ("temperature", "<f8"),
+    ("luminosity", "<f8"),
+])
+
+# Positions in the record tuples views read from
+PARENT, NEXT_SIBLING, DEPTH, KIND, NAME_OFFSET, NAME_LENGTH = (
+    FLAT_DTYPE.names.index(name) for name in ("parent", "next_sibling", "depth", "kind", "name_offset", "name_length")
+)
+
+PLANET_FIELDS = ("orbit_radius", "mass", "radius", "density", "surface_gravity", "escape_velocity",
+                 "orbital_period", "rotation_period", "temperature")
+CATEGORIES = {
+    "spectral_class": SPECTRAL_CLASSES,
+    "planet_type": PLANET_TYPES,
+    "atmosphere": ATMOSPHERES,
+    "core_composition": CORE_COMPOSITIONS,
+}
+
+
+def _code(labels, value):
+    return NO_CODE if value is None else labels.index(value)
+
+
+class FlatSystem:
+    """Record array form of a StarSystem, see the module docstring."""
+
+    def __init__(self, id, name, position, records, names):
+        self.id = id
+        self.name = name
+        self.position = position
+        self.records = records
+        self.names = names
+
+    @classmethod
+    def from_system(cls, system):
+        rows = []
+        parents = []
+        names = []
+        offset = 0
+        stack = [(system.star, -1, 0)] if system.star else []
+        while stack:
+            body, parent, depth = stack.pop()
+            if isinstance(body, Ship):
+                continue
+            index = len(rows)
+            stack.extend((child, index, depth + 1) for child in reversed(body.orbit))
+
+            if isinstance(body, Star):
+                row = (
+                    body.id, parent, -1, -1, depth, STAR, _code(SPECTRAL_CLASSES, body.spectral_class),
+                    NO_CODE, NO_CODE, NO_CODE, False, len(body.name), offset,
+                    np.nan, body.mass, body.radius, np.nan, np.nan, np.nan, np.nan, np.nan,
+                    body.temperature, body.luminosity,
+                )
+            else:
+                row = (
+                    body.id, parent, -1, -1, depth, MOON if body.is_moon else PLANET, NO_CODE,
+                    _code(PLANET_TYPES, body.planet_type), _code(ATMOSPHERES, body.atmosphere),
+                    _code(CORE_COMPOSITIONS, body.core_composition), body.is_moon, len(body.name), offset,
+                    *(getattr(body, field) for field in PLANET_FIELDS), np.nan,
+                )
+            rows.append(row)
+            parents.append(parent)
+            names.append(body.name)
+            offset += len(body.name)
+
+        records = np.array(rows, dtype=FLAT_DTYPE)
+
+        # Children come after their parent in preorder, so one pass links them
+        last_child = {}
+        for index, parent in enumerate(parents):
+            if parent < 0:
+                continue
+            if parent in last_child:
+                records["next_sibling"][last_child[parent]] = index
+            else:
+                records["first_child"][parent] = index
+            last_child[parent] = index
+
+        return cls(system.id, system.name, system.position, records, "".join(names))
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def nbytes(self):
+        """Size of the arrays and the name string."""
+        return self.records.nbytes + sys.getsizeof(self.names)
+
+    # ==== Traversal
+
+    def name_of(self, index):
+        record = self.records[index]
+        offset = int(record["name_offset"])
+        return self.names[offset:offset + int(record["name_length"])]
+
+    def view(self, index, row=None):
+        """View of one row, row being records[index] as a tuple when the caller already has it."""
+        row = self.records[index].item() if row is None else row
+        return (StarView if row[KIND] == STAR else PlanetView)(self, index, row)
+
+    def children(self, index):
+        """Row indices of the bodies orbiting a row, following the sibling links."""
+        child = int(self.records["first_child"][index])
+        while child >= 0:
+            yield child
+            child = int(self.records["next_sibling"][child])
+
+    def walk(self):
+        """Views of every body depth first, the rows are already in that order."""
+        for index, row in enumerate(self.records.tolist()):
+            yield self.view(index, row)
+
+    @property
+    def star(self):
+        return self.view(0) if len(self.records) else None
+
+    def get_object(self, name):
+        for index in range(len(self.records)):
+            if self.name_of(index) == name:
+                return self.view(index)
+        return None
+
+    # ==== Output, the same as StarSystem
+
+    __str__ = StarSystem.__str__
+
+    def display(self):
+        lines = [system_header(self.name)]
+        ancestors_last = []  # is_last of the bodies on the path to the current row
+        for view in self.walk():
+            is_last = view._row[NEXT_SIBLING] < 0
+            del ancestors_last[view._row[DEPTH]:]
+            spacer = "".join("     " if last else " │   " for last in ancestors_last)
+            lines.append(spacer + (" └──>" if is_last else " ├──>") + body_line(view))
+            ancestors_last.append(is_last)
+        print("\n".join(lines))
+
+    def to_system(self):
+        """Rebuilds the StarSystem object graph."""
+        system = StarSystem(id=self.id, name=self.name, position=self.position)
+        if not len(self.records):
+            return system
+
+        bodies = []
+        for view in self.walk():
+            if isinstance(view, StarView):
+                body = Star(view.id, view.spectral_class, name=view.name, temperature=view.temperature,
+                            mass=view.mass, radius=view.radius, luminosity=view.luminosity)
+                system.star = body
+                system.orbit.append(body)
+            else:
+                parent = bodies[view._parent]
+                body = Planet.from_properties(
+                    view.id, view.orbit_radius, view.name, view.planet_type,
+                    **{field: getattr(view, field) for field in PLANET_FIELDS if field != "orbit_radius"},
+                    atmosphere=view.atmosphere, is_moon=view.is_moon,
+                    parent_planet=parent if view.is_moon else None, core_composition=view.core_composition,
+                )
+                parent.orbit.append(body)
+            bodies.append(body)
+        system.reindex()
+        return system
+
+
+# ==== Views
+
+def _field(name):
+    labels = CATEGORIES.get(name)
+    position = FLAT_DTYPE.names.index(name)
+    if labels is None:
+        return property(lambda self: self._row[position])
+    return property(lambda self: labels[self._row[position]])
+
+
+class _RecordView:
+    """Reads its attributes from one row of a FlatSystem. Read only, scan state is not kept."""
+
+    position = property(lambda self: Vec3(0.0, 0.0, 0.0))
+    system = None
+    ships = None
+    id = _field("id")
+    temperature = _field("temperature")
+    mass = _field("mass")
+    radius = _field("radius")
+
+    def __init__(self, flat, index, row):
+        self._flat = flat
+        self._index = index
+        self._row = row  # the record as a tuple, read once
+
+    @property
+    def _parent(self):
+        return self._row[PARENT]
+
+    @property
+    def name(self):
+        offset = self._row[NAME_OFFSET]
+        return self._flat.names[offset:offset + self._row[NAME_LENGTH]]
+
+    @property
+    def orbit(self):
+        return [self._flat.view(child) for child in self._flat.children(self._index)]
+
+
+class StarView(_RecordView, Star):
+    spectral_class = _field("spectral_class")
+    luminosity = _field("luminosity")
+
+
+class PlanetView(_RecordView, Planet):
+    orbit_radius = _field("orbit_radius")
+    density = _field("density")
+    surface_gravity = _field("surface_gravity")
+    escape_velocity = _field("escape_velocity")
+    orbital_period = _field("orbital_period")
+    rotation_period = _field("rotation_period")
+    planet_type = _field("planet_type")
+    atmosphere = _field("atmosphere")
+    core_composition = _field("core_composition")
+    is_moon = _field("is_moon")
+
+    _scan = None  # never scanned, the scan properties give their defaults
+
+    @property
+    def parent_planet(self):
+        return self._flat.view(self._parent) if self.is_moon else None
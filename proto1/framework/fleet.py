@@ -0,0 +1,106 @@
+"""
+Registry of player ships.
+
+Ships do not sit in the orbit lists of celestial bodies. Every location keeps the ships
+present in its own `ships` dict (used as an ordered set, created with the first ship),
+so spawning, moving and finding the ships at a body are O(1) per ship. The Fleet adds
+the owner and type indices on top. Object.satellites() gives ships and orbiting bodies
+together, which is what display(), walk() and the system index go through.
+"""
+
+
+class Fleet:
+    """
+    Every ship spawned with this fleet, indexed by location, owner and type.
+
+        fleet.at(planet)                      # ships at a body, newest first
+        fleet.where(owner="Léo", type="frigate")
+        fleet.move(fleet.owned_by("Léo"), star)
+    """
+
+    def __init__(self):
+        self.ships = {}  # ship -> None, in spawn order
+        self._by_owner = {}
+        self._by_type = {}
+
+    def __len__(self):
+        return len(self.ships)
+
+    def __iter__(self):
+        return iter(self.ships)
+
+    def __contains__(self, ship):
+        return ship in self.ships
+
+    # ==== Registration
+
+    def add(self, ship):
+        """Puts a ship at its current_location and in the indices."""
+        self.ships[ship] = None
+        self._by_owner.setdefault(ship.owner, {})[ship] = None
+        self._by_type.setdefault(ship.type, {})[ship] = None
+        self._dock(ship, ship.current_location)
+
+    def remove(self, ship):
+        """Takes a ship out of the game: its location, its system's index and the indices."""
+        self._undock(ship)
+        self.ships.pop(ship, None)
+        for index, key in ((self._by_owner, ship.owner), (self._by_type, ship.type)):
+            ships = index.get(key)
+            if ships is not None:
+                ships.pop(ship, None)
+                if not ships:
+                    del index[key]
+
+    def move(self, ships, destination):
+        """Moves ships to destination, O(1) per ship whatever the number of ships around."""
+        for ship in ships:
+            self._undock(ship)
+            self._dock(ship, destination)
+
+    def _dock(self, ship, location):
+        location = location.live()
+        ship.current_location = location
+        if location.ships is None:
+            location.ships = {}
+        location.ships[ship] = None
+        if location.system is not None:
+            location.system.register(ship, location)
+
+    def _undock(self, ship):
+        location = ship.current_location
+        if location.ships is not None:
+            location.ships.pop(ship, None)
+        if ship.system is not None:
+            ship.system.unregister(ship)
+
+    # ==== Lookups
+
+    def at(self, location):
+        """Ships at a body, newest first like they are displayed."""
+        return list(reversed(location.ships)) if location.ships else []
+
+    def owned_by(self, owner):
+        return list(self._by_owner.get(owner, ()))
+
+    def of_type(self, type):
+        return list(self._by_type.get(type, ()))
+
+    def where(self, owner=None, type=None, location=None):
+        """Ships matching every criterion given, starting from the smallest index."""
+        candidates = []
+        if owner is not None:
+            candidates.append(self._by_owner.get(owner, {}))
+        if type is not None:
+            candidates.append(self._by_type.get(type, {}))
+        if location is not None:
+            candidates.append(location.ships or {})
+        if not candidates:
+            return list(self.ships)
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        return [ship for ship in smallest if all(ship in other for other in others)]
+
+
+# Default registry for ships spawned outside a Universe (each Universe has its own fleet)
+FLEET = Fleet()
@@ -0,0 +1,109 @@
+"""
+Resident size of the object model, broken down by class.
+
+Every model object (bodies, systems, Vec3, ScanData) is charged for itself plus what
+only it points to: attribute values, lists, dicts, arrays. Other model objects it
+references are charged to their own class, and a value reached twice is counted once.
+A Vec3View is charged its own row of the shared array, not the array, so sampled
+reports scale up like full ones.
+"""
+import sys
+from collections import Counter
+from types import MemberDescriptorType
+from functools import lru_cache
+
+import numpy as np
+
+from .utils_class import Vec3, Vec3View
+from .objects.object import Object
+from .objects.planet import Planet, ScanData, SCAN_ATTRIBUTES
+
+
+MODEL_TYPES = (Object, Vec3, ScanData)
+
+
+@lru_cache(maxsize=None)
+def slot_names(cls):
+    """Slots that hold values, not the ones a subclass replaced with a property (Vec3View)."""
+    return [name for klass in cls.__mro__ for name in klass.__dict__.get("__slots__", ())
+            if isinstance(getattr(cls, name, None), MemberDescriptorType)]
+
+
+def attributes(obj):
+    """name -> value of every attribute set on obj, from its __slots__ and its __dict__."""
+    values = {name: getattr(obj, name) for name in slot_names(type(obj)) if hasattr(obj, name)}
+    values.update(getattr(obj, "__dict__", {}))
+    return values
+
+
+def public_attributes(obj):
+    """attributes(obj) as seen from outside: no private attributes, a planet's _scan is given as its scan properties."""
+    values = {name: value for name, value in attributes(obj).items() if not name.startswith("_")}
+    if isinstance(obj, Planet):
+        values.update((name, getattr(obj, name)) for name in SCAN_ATTRIBUTES)
+    return values
+
+
+class MemoryReport:
+    """
+    Objects and bytes per class over the objects reachable from what is added.
+
+        report = MemoryReport()
+        for system in systems:
+            report.add(system)
+        print(report)
+    """
+
+    def __init__(self):
+        self.count = Counter()
+        self.bytes = Counter()
+        self._seen = set()
+
+    def add(self, root, weight=1.0):
+        """Charges root and what it reaches, weight times (sampled reports scale up)."""
+        pending = [root]
+        while pending:
+            obj = pending.pop()
+            if id(obj) in self._seen:
+                continue
+            self._seen.add(id(obj))
+            size = sys.getsizeof(obj)
+            if hasattr(obj, "__dict__"):
+                size += sys.getsizeof(obj.__dict__)
+            values = attributes(obj)
+            if isinstance(obj, Vec3View):
+                data = values.pop("_data")
+                size += data.itemsize * data.shape[1]
+            for value in values.values():
+                size += self._owned(value, pending)
+            name = type(obj).__name__
+            self.count[name] += weight
+            self.bytes[name] += size * weight
+
+    def _owned(self, value, pending):
+        """Bytes of value that are not another model object, those go to pending."""
+        if isinstance(value, MODEL_TYPES):
+            pending.append(value)
+            return 0
+        if id(value) in self._seen or value is None or isinstance(value, (bool, type)):
+            return 0
+        self._seen.add(id(value))
+        size = sys.getsizeof(value)
+        if isinstance(value, np.ndarray) and value.base is not None:
+            size += value.nbytes  # views do not count their data in getsizeof
+        if isinstance(value, dict):
+            size += sum(self._owned(k, pending) + self._owned(v, pending) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set)):
+            size += sum(self._owned(item, pending) for item in value)
+        return size
+
+    @property
+    def total(self):
+        return sum(self.bytes.values())
+
+    def __str__(self):
+        lines = [f"{'type':<14} {'objects':>12} {'bytes':>14} {'bytes/object':>13}"]
+        for name, size in self.bytes.most_common():
+            lines.append(f"{name:<14} {self.count[name]:>12,.0f} {size:>14,.0f} {size / self.count[name]:>13.0f}")
+        lines.append(f"{'total':<14} {sum(self.count.values()):>12,.0f} {self.total:>14,.0f}")
+        return "\n".join(lines)
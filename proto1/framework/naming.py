@@ -0,0 +1,107 @@
+import numpy as np
+
+from .utils_class import *
+
+
+# "AAA-0000" names: 26^3 letter prefixes times 10^4 numeric suffixes
+LETTER_SPACE = 26**3
+DIGIT_SPACE = 10**4
+NAME_SPACE = LETTER_SPACE * DIGIT_SPACE
+
+MASK64 = 2**64 - 1
+FEISTEL_ROUNDS = 8  # even, so the two halves end up back in their own ranges
+
+
+def codes_to_names(codes):
+    """Vectorized conversion of integer codes in [0, NAME_SPACE) to 'AAA-0000' names."""
+    codes = np.asarray(codes, dtype=np.int64)
+    letters, digits = np.divmod(codes, DIGIT_SPACE)
+
+    chars = np.empty((len(codes), 8), dtype=np.uint8)
+    chars[:, 0] = ord('A') + letters // 26**2
+    chars[:, 1] = ord('A') + (letters // 26) % 26
+    chars[:, 2] = ord('A') + letters % 26
+    chars[:, 3] = ord('-')
+    for k in range(4):
+        chars[:, 7 - k] = ord('0') + digits % 10
+        digits = digits // 10
+
+    return chars.view('S8').ravel().astype('U8')
+
+
+def name_to_code(name: str):
+    """Inverse of codes_to_names for one name, None if it is not an 'AAA-0000' name."""
+    if len(name) != 8 or name[3] != '-' or not name[4:].isdigit():
+        return None
+    letters = 0
+    for char in name[:3]:
+        if not 'A' <= char <= 'Z':
+            return None
+        letters = letters * 26 + ord(char) - ord('A')
+    return letters * DIGIT_SPACE + int(name[4:])
+
+
+class SystemNamer:
+    """
+    Keyed bijection between system index and 'AAA-0000' name.
+
+    The index is split into a (letters, digits) pair and pushed through a Feistel network
+    whose halves alternate between Z_17576 and Z_10000, so every round is invertible and
+    the output covers the name space exactly once. Names are unique by construction and
+    name <-> index needs neither a stored set nor retries.
+    """
+
+    def __init__(self, key: int):
+        self.key = int(key) % 2**64
+        self._round_keys = splitmix64(np.arange(FEISTEL_ROUNDS, dtype=np.uint64) ^ np.uint64(self.key))
+        self._round_keys_int = [int(k) for k in self._round_keys]
+
+    def _round(self, i, half, modulus):
+        return (splitmix64(half.astype(np.uint64) ^ self._round_keys[i]) % np.uint64(modulus)).astype(np.int64)
+
+    def encode(self, indices):
+        """Index -> name code, vectorized."""
+        indices = np.asarray(indices, dtype=np.int64)
+        x, y = np.divmod(indices, DIGIT_SPACE)  # x in Z_letters, y in Z_digits
+        sizes = (LETTER_SPACE, DIGIT_SPACE)
+        for i in range(FEISTEL_ROUNDS):
+            x, y = y, (x + self._round(i, y, sizes[i % 2])) % sizes[i % 2]
+        return x * DIGIT_SPACE + y
+
+    def decode(self, codes):
+        """Name code -> index, vectorized."""
+        codes = np.asarray(codes, dtype=np.int64)
+        x, y = np.divmod(codes, DIGIT_SPACE)
+        sizes = (LETTER_SPACE, DIGIT_SPACE)
+        for i in reversed(range(FEISTEL_ROUNDS)):
+            x, y = (y - self._round(i, x, sizes[i % 2])) % sizes[i % 2], x
+        return x * DIGIT_SPACE + y
+
+    def names(self, indices):
+        return codes_to_names(self.encode(indices))
+
+    # Scalar versions on plain ints, numpy call overhead dominates for a single name
+
+    def _round_scalar(self, i, half, modulus):
+        x = (half ^ self._round_keys_int[i]) + 0x9E3779B97F4A7C15 & MASK64
+        x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+        x = (x ^ (x >> 27)) * 0x94D049BB133111EB & MASK64
+        return (x ^ (x >> 31)) % modulus
+
+    def name(self, index: int):
+        x, y = divmod(int(index), DIGIT_SPACE)
+        sizes = (LETTER_SPACE, DIGIT_SPACE)
+        for i in range(FEISTEL_ROUNDS):
+            x, y = y, (x + self._round_scalar(i, y, sizes[i % 2])) % sizes[i % 2]
+        return f"{chr(65 + x // 676)}{chr(65 + x // 26 % 26)}{chr(65 + x % 26)}-{y:04d}"
+
+    def index_of(self, name: str):
+        """Index a name was given to, None if the string is not a system name."""
+        code = name_to_code(name)
+        if code is None:
+            return None
+        x, y = divmod(code, DIGIT_SPACE)
+        sizes = (LETTER_SPACE, DIGIT_SPACE)
+        for i in reversed(range(FEISTEL_ROUNDS)):
+            x, y = (y - self._round_scalar(i, x, sizes[i % 2])) % sizes[i % 2], x
+        return x * DIGIT_SPACE + y
@@ -2,6 +2,9 @@ from ..utils_class import *
 
 
 class Object():
+    # Attributes live in slots, not in a per instance __dict__: with tens of millions
+    # of bodies the dict is most of an object's size. Subclasses declare their own.
+    __slots__ = ("id", "position", "orbit", "system", "ships", "_parent")
 
     RESET_CODE = '\033[0m'
     BOLD = "\033[1m"
@@ -12,3 +15,50 @@ class Object():
         self.id = id
         self.position = position if position else Vec3(0.0, 0.0, 0.0)
         self.orbit = orbit if orbit is not None else []
+        self.system = None  # StarSystem whose index the object is in
+        self.ships = None  # ship -> None for the ships here, see fleet.Fleet
+        self._parent = None  # body it orbits in its system, set by StarSystem.register
+
+    def __setstate__(self, state):
+        """
+        Slots (and a subclass __dict__) come as a (dict, slots) pair. Pickles from before the
+        slots hold a single __dict__ with the old attribute names, _upgrade_state maps them.
+        """
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        else:
+            state = self._upgrade_state(dict(state))
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _upgrade_state(self, state):
+        """Old __dict__ state -> attributes to set, in order. Subclasses add their renames."""
+        return {"system": None, "ships": None, "_parent": None, **state}
+
+    def live(self):
+        """
+        The object itself, or its counterpart once its system was evicted by a LazySystems
+        and rebuilt (building it if needed): same place in the tree, so repeated names are fine.
+        Player state written to a stale object is lost with it, writers go through this.
+        """
+        system = self.system
+        if system is None or getattr(system, "evicted_from", None) is None:
+            return self
+        path = []
+        body = self
+        while body._parent is not None:
+            path.append(body._parent.orbit.index(body))
+            body = body._parent
+        try:
+            live = system.evicted_from[system.name].star
+        except KeyError:  # the system left the universe since
+            return self
+        for index in reversed(path):
+            live = live.orbit[index]
+        return live
+
+    def satellites(self):
+        """Ships at the object (newest first) then the bodies orbiting it."""
+        if not self.ships:
+            return self.orbit
+        return [*reversed(self.ships), *self.orbit]
@@ -1,6 +1,9 @@
+import sys
+from collections import OrderedDict
+
 import numpy as np
 import random
-from scipy.signal import convolve2d
+from scipy.ndimage import convolve1d
 
 from ..utils_class import *
 from .object import Object
@@ -16,10 +19,10 @@ from ..config import colors
 
 
 
-def height_to_color(value):
+def height_to_color(value, scheme="earth"):
     """Interpolates color from color_scheme based on value in [0,1]."""
 
-    color_scheme = planet_config.color_scheme_dic["earth"]
+    color_scheme = planet_config.color_scheme_dic[scheme]
 
     for i in range(len(color_scheme) - 1):
         v0, c0 = color_scheme[i]
@@ -29,106 +32,320 @@ def height_to_color(value):
             return c0 if t < 0.5 else c1
     return color_scheme[-1][1]
 
-def render_heightmap(map_data):
+
+_color_luts = {}
+
+def color_lut(scheme="earth"):
+    """
+    Per scheme arrays for the vectorized height_to_color: segment bounds and end colors,
+    the palette of the scheme, and the ANSI cell of every (top, bottom) palette pair.
+    Built once per scheme.
+    """
+    if scheme not in _color_luts:
+        color_scheme = planet_config.color_scheme_dic[scheme]
+        values = np.array([v for v, _ in color_scheme], dtype=np.float64)
+        palette = list(dict.fromkeys(c for _, c in color_scheme))
+        codes = np.array([palette.index(c) for _, c in color_scheme])
+        cells = np.array([
+            f"\x1b[48;5;{bottom}m\x1b[38;5;{top}m▀" for top in palette for bottom in palette
+        ], dtype=object)
+        _color_luts[scheme] = (values, codes, palette, cells)
+    return _color_luts[scheme]
+
+
+def height_to_palette(map_data, scheme="earth"):
+    """height_to_color over a whole array, as indices into the scheme palette (see color_lut)."""
+    values, codes, _, _ = color_lut(scheme)
+    map_data = np.asarray(map_data, dtype=np.float64)
+
+    # Same arithmetic as height_to_color: first segment whose upper bound is >= value,
+    # then the nearer end of it. Values above every bound (and NaN) take the last color.
+    segment = np.searchsorted(values[1:], map_data, side="left")
+    above = segment == len(values) - 1
+    segment = np.minimum(segment, len(values) - 2)
+    v0, v1 = values[segment], values[segment + 1]
+    with np.errstate(invalid="ignore", over="ignore"):
+        t = (map_data - v0) / (v1 - v0)
+    palette_index = np.where(t < 0.5, codes[segment], codes[segment + 1])
+    return np.where(above, codes[-1], palette_index)
+
+
+def render_heightmap(map_data, scheme="earth", width=None, file=None):
+    """
+    Draws the heightmap with half block characters, two rows per line.
+    width resamples the columns (nearest neighbour, rows follow to keep the aspect ratio).
+    The frame is built in one buffer and written once, it is also returned.
+    """
+    map_data = np.asarray(map_data)
     rows, cols = map_data.shape
-    for y in range(0, rows, 2):
-        top = map_data[y]
-        bottom = map_data[y+1] if y+1 < rows else np.zeros(cols)
-        line = ""
-        for t, b in zip(top, bottom):
-            color_top = height_to_color(t)
-            color_bottom = height_to_color(b)
-            line += f"\x1b[48;5;{color_bottom}m\x1b[38;5;{color_top}m▀"
-        print(line + "\x1b[0m")  # Reset
-
-
-def generate_heightmap(rows, cols, surface_seed):
+    if width is not None and width != cols:
+        height = max(1, round(rows * width / cols))
+        map_data = map_data[np.linspace(0, rows - 1, height).round().astype(int)][:, np.linspace(0, cols - 1, width).round().astype(int)]
+        rows, cols = map_data.shape
+    if rows % 2:
+        map_data = np.vstack([map_data, np.zeros((1, cols))])
+
+    _, _, palette, cells = color_lut(scheme)
+    colors = height_to_palette(map_data, scheme)
+    pairs = colors[0::2] * len(palette) + colors[1::2]
+
+    frame = "".join("".join(line) + "\x1b[0m\n" for line in np.take(cells, pairs).tolist())
+    (file or sys.stdout).write(frame)
+    return frame
+
+
+# Heightmaps are defined on lattices starting at this (lat, lon) resolution, any output resolution samples them
+HEIGHTMAP_BASE = (32, 64)
+SMOOTHING_SIZES = (3, 4, 5, 6)
+
+
+def smooth(field, size):
+    """
+    Binomial blur of the given size with wrap around, applied as two 1D passes: the same as
+    convolve2d(field, outer(k, k), mode="same", boundary="wrap") at a cost linear in size.
+    """
+    kernel = np.array([math.comb(size - 1, k) for k in range(size)], dtype=np.float64) / 2 ** (size - 1)
+    origin = -1 if size % 2 == 0 else 0  # even kernels are centered like convolve2d's "same"
+    field = convolve1d(field, kernel, axis=0, mode="wrap", origin=origin)
+    return convolve1d(field, kernel, axis=1, mode="wrap", origin=origin)
+
+
+def heightmap_octaves(surface_seed, octaves=1, base_shape=HEIGHTMAP_BASE, persistence=0.5):
+    """
+    Smoothed noise lattices of a surface, octave o at base_shape * 2**o with amplitude persistence**o.
+    Octave 0 and the smoothing size come from default_rng(surface_seed), octave o from default_rng([surface_seed, o]).
+    """
     rng = np.random.default_rng(surface_seed)
-    lat = np.linspace(-np.pi / 2, np.pi / 2, rows)
-    lon = np.linspace(0, 2 * np.pi, cols)
-    lat_grid, _ = np.meshgrid(lat, lon, indexing='ij')
-
-    noise = rng.random((rows, cols))
-    lat_weight = np.cos(lat_grid)
-
-    terrain = noise * lat_weight
-
-    terrain += np.ones((rows, cols)) *( 5.0 - np.exp(- (lat_grid*0.6)**8))
-
-    kernels = {
-        3: np.array([
-            [1, 2, 1],
-            [2, 4, 2],
-            [1, 2, 1]
-        ]) / 16,
-        4: np.array([
-            [1, 3, 3, 1],
-            [3, 9, 9, 3],
-            [3, 9, 9, 3],
-            [1, 3, 3, 1]
-        ]) / 64,
-        5: np.array([
-            [1, 4, 6, 4, 1],
-            [4,16,24,16, 4],
-            [6,24,36,24, 6],
-            [4,16,24,16, 4],
-            [1, 4, 6, 4, 1]
-        ]) / 256,
-        6: np.array([
-            [1, 5, 10, 10, 5, 1],
-            [5,25, 50, 50,25, 5],
-            [10,50,100,100,50,10],
-            [10,50,100,100,50,10],
-            [5,25, 50, 50,25, 5],
-            [1, 5, 10, 10, 5, 1]
-        ]) / 676
+    lattices = []
+    for octave in range(octaves):
+        rows, cols = base_shape[0] << octave, base_shape[1] << octave
+        if octave:
+            rng = np.random.default_rng([surface_seed, octave])
+        lat = np.linspace(-np.pi / 2, np.pi / 2, rows)[:, None]
+
+        terrain = rng.random((rows, cols)) * np.cos(lat)
+        if octave == 0:
+            size = SMOOTHING_SIZES[rng.integers(len(SMOOTHING_SIZES))]
+            terrain = terrain + (5.0 - np.exp(- (lat*0.6)**8))
+        lattices.append(smooth(terrain, size) * persistence**octave)
+    return lattices
+
+
+def sample_lattices(lattices, rows, cols, band=256):
+    """
+    Sum of the octave lattices bilinearly sampled on a rows x cols grid, periodic in longitude.
+    The grid covers the same surface whatever its resolution, filled band by band.
+    """
+    out = np.zeros((rows, cols))
+    for lattice in lattices:
+        lattice_rows, lattice_cols = lattice.shape
+
+        y = np.linspace(0, lattice_rows - 1, rows)
+        y0 = np.minimum(y.astype(int), lattice_rows - 2) if lattice_rows > 1 else np.zeros(rows, dtype=int)
+        fy = (y - y0)[:, None]
+        y1 = np.minimum(y0 + 1, lattice_rows - 1)
+
+        x = np.arange(cols) * (lattice_cols / cols)
+        x0 = x.astype(int)
+        fx = x - x0
+        x1 = (x0 + 1) % lattice_cols
+
+        for start in range(0, rows, band):
+            stop = min(start + band, rows)
+            f = fy[start:stop]
+            by_row = lattice[y0[start:stop]] * (1 - f) + lattice[y1[start:stop]] * f
+            out[start:stop] += by_row[:, x0] * (1 - fx) + by_row[:, x1] * fx
+    return out
+
+
+def _normalize(terrain, lattices, base_shape):
+    # Bounds come from the base resolution grid, so every resolution gets the same mapping
+    base = sample_lattices(lattices, *base_shape)
+    low, high = base.min(), base.max()
+    return np.clip((terrain - low) / (high - low), 0.0, 1.0, out=terrain)
+
+
+def generate_heightmap(rows, cols, surface_seed, octaves=1, base_shape=HEIGHTMAP_BASE):
+    """
+    Heightmap in [0, 1] at any resolution. The terrain only depends on surface_seed and octaves:
+    a 32x64 scan and a 4096x8192 export of the same seed show the same surface, the larger
+    one adds the detail of the extra octaves when octaves > 1.
+    """
+    lattices = heightmap_octaves(surface_seed, octaves, base_shape)
+    return _normalize(sample_lattices(lattices, rows, cols), lattices, base_shape)
+
+
+def heightmap_levels(surface_seed, levels, octaves=None, base_shape=HEIGHTMAP_BASE):
+    """Levels of detail base_shape * 2**level for level in range(levels), all from one set of lattices."""
+    lattices = heightmap_octaves(surface_seed, octaves or levels, base_shape)
+    return [
+        _normalize(sample_lattices(lattices, base_shape[0] << level, base_shape[1] << level), lattices, base_shape)
+        for level in range(levels)
+    ]
+
+
+# Resolution of the heightmap a scan shows
+SCAN_SHAPE = (32, 64)
+
+
+def scan_anomalies(surface_seed):
+    """Anomalies a scan reports, drawn from the surface seed so they can be computed anywhere."""
+    rng = random.Random(surface_seed)
+    return {
+        "athmosphere": rng.sample(planet_config.ATMOSPHERIC_ANOMALIES, k=rng.randint(1, 3)),
+        "terrain": rng.sample(planet_config.TERRAIN_ANOMALIES, k=rng.randint(1, 3)),
+        "underground": rng.sample(planet_config.UNDERGROUND_ANOMALIES, k=rng.randint(1, 3)),
     }
 
-    kernel_size = random.choice(list(kernels.keys()))
-    kernel = kernels[kernel_size]
 
-    terrain = convolve2d(terrain, kernel, mode='same', boundary='wrap')
-    terrain = (terrain - terrain.min()) / (terrain.max() - terrain.min())  # Normalize
-    return terrain
+class HeightmapCache:
+    """
+    Bounded LRU of generated heightmaps keyed by (surface_seed, rows, cols, octaves).
+    Terrain only depends on that key, so an evicted map is simply generated again.
+    Maps are handed out read only, they are shared between callers.
+    With tiles set (a tile_cache.TileCache) misses are read from / stored to disk instead of generated.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20, tiles=None):
+        self.max_bytes = max_bytes
+        self.tiles = tiles
+        self._maps = OrderedDict()
+        self._bytes = 0
+
+    def get(self, surface_seed, rows, cols, octaves=1):
+        key = (surface_seed, rows, cols, octaves)
+        heightmap = self._maps.get(key)
+        if heightmap is not None:
+            self._maps.move_to_end(key)
+            return heightmap
+
+        if self.tiles is not None:
+            heightmap = self.tiles.get(surface_seed, rows, cols, octaves)
+        else:
+            heightmap = generate_heightmap(rows, cols, surface_seed, octaves)
+        self.put(key, heightmap)
+        return heightmap
+
+    def put(self, key, heightmap):
+        """Adds a map computed elsewhere (e.g. by a scan worker) under its (seed, rows, cols, octaves) key."""
+        if key in self._maps:
+            self._bytes -= self._maps.pop(key).nbytes
+        heightmap.flags.writeable = False
+        self._maps[key] = heightmap
+        self._bytes += heightmap.nbytes
+        while len(self._maps) > 1 and self._bytes > self.max_bytes:
+            _, evicted = self._maps.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def clear(self):
+        self._maps.clear()
+        self._bytes = 0
+
+
+HEIGHTMAP_CACHE = HeightmapCache()
+
+
+# ==== Per type tables for Planet.batch, rows in type_properties order
+
+BATCH_TYPES = list(planet_config.type_properties)
+TYPE_INDEX = {name: i for i, name in enumerate(BATCH_TYPES)}
+FREE_TYPE_INDEX = np.array([TYPE_INDEX[t] for t in ["Gas", "Ice", "Rock", "Metal"]])  # drawn when no type is given
+BATCH_RANGES = np.array([
+    [planet_config.type_properties[t][key] for t in BATCH_TYPES]
+    for key in ("mass_range", "radius_range", "density_range")
+], dtype=np.float64)  # (property, type, low/high)
+BATCH_UNIFORMS = 7  # uniform draws per planet
+BATCH_ATMOSPHERE_COUNTS = np.array([len(planet_config.type_properties[t]["atmosphere_options"]) for t in BATCH_TYPES])
+
+
+def empty_anomalies():
+    return {
+        "athmosphere" : {},
+        "terrain" : {},
+        "underground" : {}
+    }
 
 
+# Planet properties backed by its ScanData
+SCAN_ATTRIBUTES = ("has_been_scanned", "surface_seed", "custom_heightmap", "anomalies")
+
+
+class ScanData:
+    """What a scan adds to a planet. Only scanned planets carry one, see Planet._scan."""
+    __slots__ = ("scanned", "surface_seed", "custom_heightmap", "anomalies")
+
+    def __init__(self):
+        self.scanned = False
+        self.surface_seed = None
+        self.custom_heightmap = None  # a map that does not come from surface_seed, see Planet.heightmap
+        self.anomalies = empty_anomalies()
+
+
+def _scan_property(name, default):
+    """Planet attribute stored on its ScanData, created on the first write that is not the default."""
+    def get(self):
+        return getattr(self._scan, name) if self._scan is not None else default()
+
+    def set(self, value):
+        if self._scan is None:
+            if value is None or value is False:
+                return
+            self._scan = ScanData()
+        setattr(self._scan, name, value)
+
+    return property(get, set)
 
-class Planet(Object):
-    # Common properties per planet type
 
+class Planet(Object):
+    __slots__ = (
+        "name", "orbit_radius", "is_moon", "parent_planet", "planet_type", "mass", "radius", "density",
+        "surface_gravity", "escape_velocity", "orbital_period", "rotation_period", "atmosphere",
+        "temperature", "core_composition", "_scan",
+    )
+
+    # Scan state, None/empty until the planet is scanned
+    has_been_scanned = _scan_property("scanned", lambda: False)
+    surface_seed = _scan_property("surface_seed", lambda: None)
+    custom_heightmap = _scan_property("custom_heightmap", lambda: None)
+    anomalies = _scan_property("anomalies", empty_anomalies)
+
+
+    def _upgrade_state(self, state):
+        # Scan attributes now live on a ScanData (set through the properties, after _scan).
+        # The old heightmap array is rebuilt from surface_seed, kept only when there is none
+        heightmap = state.pop("heightmap", None)
+        if heightmap is not None and state.get("surface_seed") is None:
+            state["custom_heightmap"] = heightmap
+        return super()._upgrade_state({"_scan": None, **state})
 
     def __init__(self, id: int, orbit_radius: float, position=None, orbit=None, 
-                name="Unnamed Planet", planet_type=None, is_moon=False, parent_planet=None):
+                name="Unnamed Planet", planet_type=None, is_moon=False, parent_planet=None, rng=None):
         super().__init__(id, position, orbit if orbit else [])
+        rng = rng if rng is not None else GLOBAL_RNG
 
         self.name = name
         self.orbit_radius = orbit_radius  # AU for planets, planetary radii or similar for moons
         self.is_moon = is_moon
         self.parent_planet = parent_planet  # Planet this moon orbits, None if planet
-        
-        
-        self.has_been_scanned = False
-        self.surface_seed = None
-        self.heightmap = None
-        self.anomalies = {
-            "athmosphere" : {},
-            "terrain" : {},
-            "underground" : {}
-        }
+        self._scan = None  # ScanData once scanned
 
         # If type not specified, randomly pick based on body type
         if planet_type is None:
-            planet_type = "Moon" if is_moon else random.choice(["Gas", "Ice", "Rock", "Metal"])
+            planet_type = "Moon" if is_moon else rng.choice(["Gas", "Ice", "Rock", "Metal"])
         self.planet_type = planet_type
 
         props = planet_config.type_properties[planet_type]
 
         # Mass & radius within type ranges
-        self.mass = round(random.uniform(*props["mass_range"]), 3)
-        self.radius = round(random.uniform(*props["radius_range"]), 3)
+        self.mass = round(rng.uniform(*props["mass_range"]), 3)
+        self.radius = round(rng.uniform(*props["radius_range"]), 3)
 
         # Density consistent with type
-        self.density = round(random.uniform(*props["density_range"]), 3)
+        self.density = round(rng.uniform(*props["density_range"]), 3)
 
         # Surface gravity (g = M / R^2), normalized to Earth units
         self.surface_gravity = round(self.mass / self.radius**2, 3)
@@ -148,10 +365,10 @@ class Planet(Object):
             self.orbital_period = round(math.sqrt(orbital_radius_AU**3), 5) * 365.25  # days
 
         # Rotation period random
-        self.rotation_period = round(random.uniform(10, 1000), 1)  # hours
+        self.rotation_period = round(rng.uniform(10, 1000), 1)  # hours
 
         # Atmosphere from options
-        self.atmosphere = random.choice(props["atmosphere_options"])
+        self.atmosphere = rng.choice(props["atmosphere_options"])
 
         # Temperature (simplified)
         if not is_moon:
@@ -159,11 +376,99 @@ class Planet(Object):
             self.temperature = round(288 / math.sqrt(self.orbit_radius), 1)
         else:
             # Moons cooler, assume lower temperature (arbitrary)
-            self.temperature = round(random.uniform(50, 250), 1)
+            self.temperature = round(rng.uniform(50, 250), 1)
 
         # Core composition
         self.core_composition = props["core_composition"]
 
+    @classmethod
+    def from_properties(cls, id: int, orbit_radius: float, name: str, planet_type: str, mass: float, radius: float,
+                        density: float, surface_gravity: float, escape_velocity: float, orbital_period: float,
+                        rotation_period: float, atmosphere: str, temperature: float,
+                        is_moon=False, parent_planet=None, core_composition=None):
+        """Rebuilds a planet from already known properties (e.g. read from disk), without any random draw."""
+        planet = cls.__new__(cls)
+        Object.__init__(planet, id)
+
+        planet.name = name
+        planet.orbit_radius = orbit_radius
+        planet.is_moon = is_moon
+        planet.parent_planet = parent_planet
+        planet._scan = None
+
+        planet.planet_type = planet_type
+        planet.mass = mass
+        planet.radius = radius
+        planet.density = density
+        planet.surface_gravity = surface_gravity
+        planet.escape_velocity = escape_velocity
+        planet.orbital_period = orbital_period
+        planet.rotation_period = rotation_period
+        planet.atmosphere = atmosphere
+        planet.temperature = temperature
+        planet.core_composition = core_composition or planet_config.type_properties[planet_type]["core_composition"]
+        return planet
+
+    @classmethod
+    def batch(cls, types, orbit_radii, is_moon=False, parents=None, ids=None, names=None, rng=None, uniforms=None):
+        """
+        Builds many planets at once, every random property drawn for all of them in one
+        array call. types (None entries are drawn like __init__ does) and orbit_radii are
+        per planet, is_moon and parents per planet or one value for all, ids and names
+        default to 0.. and "Unnamed Planet".
+        Same distributions as Planet(...) one by one, not the same draws.
+
+        uniforms, a (BATCH_UNIFORMS, n) array in [0, 1), replaces the draw from rng: bulk
+        generation draws each system's columns from its own stream and builds them together.
+        """
+        rng = rng if rng is not None else GLOBAL_RNG
+        orbit_radii = np.asarray(orbit_radii, dtype=np.float64)
+        n = len(orbit_radii)
+        is_moon = np.asarray(is_moon, dtype=bool) if np.ndim(is_moon) else np.full(n, is_moon, dtype=bool)
+        if not isinstance(parents, (list, tuple)):
+            parents = [parents] * n
+
+        # type, mass, radius, density, rotation, atmosphere, moon temperature
+        u = rng.np.random((BATCH_UNIFORMS, n)) if uniforms is None else uniforms
+
+        # ==== Types, as rows of the BATCH_TYPES tables
+        type_index = np.array([TYPE_INDEX[t] if t is not None else -1 for t in types], dtype=np.intp)
+        free = type_index < 0
+        type_index[free & is_moon] = TYPE_INDEX["Moon"]
+        drawn = free & ~is_moon
+        type_index[drawn] = FREE_TYPE_INDEX[(u[0, drawn] * len(FREE_TYPE_INDEX)).astype(np.intp)]
+
+        low, high = BATCH_RANGES[:, type_index, 0], BATCH_RANGES[:, type_index, 1]
+        mass, radius, density = np.round(low + (high - low) * u[1:4], 3)
+        surface_gravity = np.round(mass / radius**2, 3)
+        escape_velocity = np.round(np.sqrt(2 * surface_gravity * radius), 3)
+
+        parent_radius = np.array([p.radius if p is not None else 1 for p in parents], dtype=np.float64)
+        orbital_period = np.where(
+            is_moon,
+            np.round(np.sqrt((orbit_radii * 0.00000465 * parent_radius)**3), 5) * 365.25,  # days
+            np.round(np.sqrt(orbit_radii**3), 3),  # Earth years
+        )
+        rotation_period = np.round(10 + 990 * u[4], 1)
+        atmosphere_index = (u[5] * BATCH_ATMOSPHERE_COUNTS[type_index]).astype(np.intp)
+        temperature = np.where(is_moon, np.round(50 + 200 * u[6], 1), np.round(288 / np.sqrt(orbit_radii), 1))
+
+        ids = range(n) if ids is None else ids
+        names = ["Unnamed Planet"] * n if names is None else names
+        return [
+            cls.from_properties(
+                id, orbit_radius, name, BATCH_TYPES[t], mass=m, radius=r, density=d, surface_gravity=g,
+                escape_velocity=v, orbital_period=op, rotation_period=rp,
+                atmosphere=planet_config.type_properties[BATCH_TYPES[t]]["atmosphere_options"][a],
+                temperature=temp, is_moon=moon, parent_planet=parent if moon else None,
+            )
+            for id, orbit_radius, name, t, m, r, d, g, v, op, rp, a, temp, moon, parent in zip(
+                ids, orbit_radii.tolist(), names, type_index.tolist(), mass.tolist(), radius.tolist(),
+                density.tolist(), surface_gravity.tolist(), escape_velocity.tolist(), orbital_period.tolist(),
+                rotation_period.tolist(), atmosphere_index.tolist(), temperature.tolist(), is_moon.tolist(), parents,
+            )
+        ]
+
     def __str__(self):
         header = f"{colors.BOLD}{colors.CYAN}======== {colors.YELLOW}{self.name} ({'Moon' if self.is_moon else 'Planet'}) {colors.CYAN}========{colors.RESET}\n"
         return (
@@ -182,21 +487,46 @@ class Planet(Object):
             f"{colors.BOLD}{colors.CYAN}Atmosphere:{colors.RESET} {colors.YELLOW}{self.atmosphere}{colors.RESET}"
         )
 
-    def scan(self):
-
-
-        if not self.has_been_scanned:
-            self.has_been_scanned = True
-            self.surface_seed = random.randint(0, 99999999)
+    @property
+    def heightmap(self):
+        """
+        Scan resolution heightmap, None before the scan. Only surface_seed is stored,
+        the map is rebuilt through HEIGHTMAP_CACHE when needed.
+        """
+        if self.custom_heightmap is not None:
+            return self.custom_heightmap
+        if self.surface_seed is None:
+            return None
+        return HEIGHTMAP_CACHE.get(self.surface_seed, *SCAN_SHAPE)
+
+    @heightmap.setter
+    def heightmap(self, heightmap):
+        # Maps from elsewhere (old saves, hand made) are kept as they are
+        self.custom_heightmap = heightmap
+
+    def heightmap_at(self, rows, cols, octaves=1):
+        """The same terrain at another resolution, e.g. heightmap_at(4096, 8192, octaves=8) for an export."""
+        if self.surface_seed is None:
+            return None
+        return HEIGHTMAP_CACHE.get(self.surface_seed, rows, cols, octaves)
 
-            # Random anomalies
-            self.anomalies["athmosphere"] = random.sample(planet_config.ATMOSPHERIC_ANOMALIES, k=random.randint(1, 3))
-            self.anomalies["terrain"] = random.sample(planet_config.TERRAIN_ANOMALIES, k=random.randint(1, 3))
-            self.anomalies["underground"] = random.sample(planet_config.UNDERGROUND_ANOMALIES, k=random.randint(1, 3))
-
-            self.heightmap = generate_heightmap(32, 64, self.surface_seed)
-
-            
+    def scan(self):
+        self.compute_scan()
+        self.render_scan()
+
+    def compute_scan(self):
+        """
+        Scan without the output: draws the surface seed, everything else derives from it.
+        A planet of an evicted system scans its live counterpart and shares its results.
+        """
+        planet = self.live()
+        if not planet.has_been_scanned:
+            planet.has_been_scanned = True
+            planet.surface_seed = random.randint(0, 99999999)
+            planet.anomalies = scan_anomalies(planet.surface_seed)
+        self._scan = planet._scan
+
+    def render_scan(self):
         print(f"\n{colors.BOLD}{colors.CYAN} ======================= Terrain  Scanner ====================={colors.RESET}")
         render_heightmap(self.heightmap)
 
@@ -212,6 +542,3 @@ class Planet(Object):
         print(f"\n{colors.BOLD}{colors.CYAN}== Underground Anomalies =={colors.RESET}")
         for anomaly in self.anomalies["underground"]:
             print(f"  {colors.YELLOW}- {anomaly}{colors.RESET}")
-
-
-
@@ -3,10 +3,13 @@ import random
 
 from ..utils_class import *
 from .object import Object
+from ..fleet import FLEET
 
 
 class Ship(Object):
-    def __init__(self, id: int, stats: dict, current_location, position=None, orbit=None):
+    __slots__ = ("name", "type", "owner", "owner_color", "current_location", "fleet")
+
+    def __init__(self, id: int, stats: dict, current_location, position=None, orbit=None, fleet=None):
         super().__init__(id, position, orbit if orbit else [])
 
         self.name = stats.get("name", "unnamed")
@@ -15,10 +18,18 @@ class Ship(Object):
         self.owner_color = stats.get("owner_color", "\033[38;5;39m")
 
         self.current_location = current_location
+        if fleet is None:
+            # The fleet of the universe the location is in, the default one for a standalone body
+            system = current_location.system
+            fleet = system.fleet if system is not None and system.fleet is not None else FLEET
+        self.fleet = fleet
 
         self.spawn()
 
 
+    def _upgrade_state(self, state):
+        return super()._upgrade_state({"fleet": FLEET, **state})  # a Universe puts it in its own fleet
+
     def __str__(self):
         return (
             f" ======= {self.name} ======= \t"
@@ -32,12 +43,16 @@ class Ship(Object):
         """
         takes the new object (Star or Planet) where to spawn.
         """
-        self.current_location.orbit.insert(0, self)
+        self.fleet.add(self)
 
     def move(self, new_location):
         """
         takes the new object (Star or Planet) where to go.
         """
-        self.current_location.orbit.remove(self)
-        self.current_location = new_location
-        self.spawn()
+        self.fleet.move([self], new_location)
+
+    def despawn(self):
+        """
+        removes the ship from its location and its fleet.
+        """
+        self.fleet.remove(self)
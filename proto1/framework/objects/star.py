@@ -5,6 +5,8 @@ from .object import Object
 
 
 class Star(Object):
+    __slots__ = ("name", "spectral_class", "temperature", "mass", "radius", "luminosity")
+
     # Mapping of spectral classes to their temperature ranges (in Kelvin)
     SPECTRAL_TEMPERATURE_RANGES = {
         'O': (30000, 50000),
@@ -62,23 +64,33 @@ class Star(Object):
 
 
 
-    def __init__(self, id: int, spectral_class: str, position: Vec3 = None, orbit: list = None, name: str = "default"):
+    def __init__(self, id: int, spectral_class: str, position: Vec3 = None, orbit: list = None, name: str = "default",
+                 temperature=None, mass=None, radius=None, luminosity=None, rng=None):
         if orbit is None:
             orbit = []
         super().__init__(id, position, orbit)
         self.name = name
+        rng = rng if rng is not None else GLOBAL_RNG
 
+        # Properties can be passed in when they were already sampled elsewhere (bulk generation)
         self.spectral_class = spectral_class.upper()
-        self.temperature = self.assign_property(self.SPECTRAL_TEMPERATURE_RANGES)
-        self.mass = self.assign_property(self.SPECTRAL_MASS_RANGES)
-        self.radius = self.assign_property(self.SPECTRAL_RADIUS_RANGES)
-        self.luminosity = self.assign_property(self.SPECTRAL_LUMINOSITY_RANGES)
-        self.color_code = self.SPECTRAL_COLOR_CODES.get(self.spectral_class, self.RESET_CODE)
+        self.temperature = temperature if temperature is not None else self.assign_property(self.SPECTRAL_TEMPERATURE_RANGES, rng)
+        self.mass = mass if mass is not None else self.assign_property(self.SPECTRAL_MASS_RANGES, rng)
+        self.radius = radius if radius is not None else self.assign_property(self.SPECTRAL_RADIUS_RANGES, rng)
+        self.luminosity = luminosity if luminosity is not None else self.assign_property(self.SPECTRAL_LUMINOSITY_RANGES, rng)
+
+    def _upgrade_state(self, state):
+        state.pop("color_code", None)  # a property now
+        return super()._upgrade_state(state)
+
+    @property
+    def color_code(self):
+        return self.SPECTRAL_COLOR_CODES.get(self.spectral_class, self.RESET_CODE)
 
-    def assign_property(self, property_ranges):
+    def assign_property(self, property_ranges, rng=GLOBAL_RNG):
         if self.spectral_class in property_ranges:
             min_val, max_val = property_ranges[self.spectral_class]
-            return round(random.uniform(min_val, max_val), 2)
+            return round(rng.uniform(min_val, max_val), 2)
         else:
             raise ValueError(f"Unknown spectral class: {self.spectral_class}")
 
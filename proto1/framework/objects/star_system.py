@@ -2,13 +2,18 @@
 from ..utils_class import *
 from .object import Object
 from .star import Star
-from .planet import Planet
+from .planet import Planet, BATCH_UNIFORMS, BATCH_TYPES, TYPE_INDEX
 from .ship import Ship
+from ..scanning import scan_planets
 
 import random
+from collections import Counter
+from functools import lru_cache
+
 import numpy as np
 
 
+@lru_cache(maxsize=None)
 def int_to_roman(n):
     numerals = [
         (1000, "M"), (900, "CM"), (500, "D"), (400, "CD"),
@@ -23,98 +28,342 @@ def int_to_roman(n):
             n -= value
     return result
 
+# ==== display() formatting, shared with FlatSystem
+
+# ANSI color codes
+RESET = "\033[0m"
+BOLD = "\033[1m"
+
+PLANET_ICON_COLOR = "\033[38;5;209m"
+STAR_ICON_COLOR = "\033[38;5;226m"
+MOON_ICON_COLOR = "\033[38;5;47m"
+SHIP_ICON_COLOR = "\033[38;5;199m"
+
+NAME_COLOR = "\033[38;5;221m"     # Soft gold
+LABEL_COLOR = "\033[38;5;244m"    # Grayish for labels
+VALUE_COLOR = "\033[38;5;39m"     # Bright blue for values
+
+TYPE_COLOR = {
+    'Rock': "\033[38;5;220m",     # Yellow-orange
+    'Metal': "\033[38;5;250m",    # Light gray
+    'Gas': "\033[38;5;81m",       # Cyan
+    'Ice': "\033[38;5;111m",      # Light blue
+}
+
+
+def system_header(name):
+    return f"{BOLD}\033[92m ¤ Star System: {name}{RESET}"
+
+
+def body_line(body):
+    """One line of the display() tree, without the branch prefix. None for unknown objects."""
+    if isinstance(body, Star):
+        return (
+            f"{BOLD}{STAR_ICON_COLOR} * {NAME_COLOR}{body.name}{RESET} "
+            f"{LABEL_COLOR}(Spectral Class:{RESET} {VALUE_COLOR}{body.spectral_class}{RESET}{LABEL_COLOR}){RESET} "
+            f"Perceived color : {body.color_code}███{Object.RESET_CODE}"
+        )
+    elif isinstance(body, Planet):
+        symbol = f"{BOLD}{MOON_ICON_COLOR} •" if body.is_moon else f"{BOLD}{PLANET_ICON_COLOR} ⬤"
+        type_col = TYPE_COLOR.get(body.planet_type, "")
+        return (
+            f"{symbol} {BOLD}{NAME_COLOR}{body.name}{RESET} "
+            f"{type_col}{body.planet_type}{RESET}   \t"
+            f"{LABEL_COLOR}Orbit:{RESET} {VALUE_COLOR}{body.orbit_radius:3.3f} au{RESET} \t"
+            f"{LABEL_COLOR}Radius:{RESET} {VALUE_COLOR}{body.radius} R⊕{RESET}    \t"
+            f"{LABEL_COLOR}Density:{RESET} {VALUE_COLOR}{body.density} g/cm³{RESET} \t"
+        )
+    elif isinstance(body, Ship):
+        symbol = f"{BOLD}{SHIP_ICON_COLOR} ➤"
+        return (
+            f"{symbol} {BOLD}{body.owner_color}{body.name}{RESET}   "
+            f"{body.owner_color} {body.owner}    {LABEL_COLOR} {body.type} {RESET}"
+        )
+    return None
+
+
+# ==== Generation parameters
+
+SPECTRAL_CLASSES = ['O', 'B', 'A', 'F', 'G', 'K', 'M']
+INNER_TYPES = ['Rock', 'Metal']
+OUTER_TYPES = ['Gas', 'Ice', 'Rock']
+INNER_WEIGHTS = [0.8, 0.2]
+OUTER_WEIGHTS = [0.5, 0.3, 0.2]
+ORBIT_THRESHOLD = 2.0  # in AU, separates inner and outer planet types
+
+# Poisson distribution for number of moons
+MOON_LAMBDAS = {
+    'Gas': 3.0,
+    'Ice': 2.0,
+    'Rock': 0.5,
+    'Metal': 0.3,
+}
+
+MAX_SATELLITE_DEPTH = 5
+MAX_SUBPLANETS = 3
+SUBPLANET_MASS_THRESHOLD = 100  # mass threshold for subplanet generation
+
+FIRST_ORBIT_RADIUS = 0.3  # initial planet orbit radius in AU
+ORBIT_GAP_RANGE = (0.2, 1.5)  # AU, gaps between planet orbits
+
+# Convert all moon/subplanet/submoon orbits from Earth radii to AU:
+EARTH_RADII_IN_AU = 1 / 215  # ≈0.00465 AU per Earth radius
+
+MOON_ORBIT_RANGE = (5 * EARTH_RADII_IN_AU, 60 * EARTH_RADII_IN_AU)  # ≈ (0.023, 0.28) AU
+SUBPLANET_ORBIT_RANGE = (1.5 * EARTH_RADII_IN_AU, 5 * EARTH_RADII_IN_AU)  # ≈ (0.007, 0.023) AU
+# SUBMOON_ORBIT_RANGE = (3 * EARTH_RADII_IN_AU, 20 * EARTH_RADII_IN_AU)  # ≈ (0.014, 0.093) AU
+
+
+def weighted_choice(labels, weights, u):
+    """rng.choices(labels, weights) for every uniform in u."""
+    cumulative = np.cumsum(weights)
+    index = np.searchsorted(cumulative, u * cumulative[-1], side="right")
+    return np.array(labels)[np.minimum(index, len(labels) - 1)]
+
+
+def uniforms(rng, rows, n):
+    """
+    (rows, n) uniforms from the scalar stream of rng. Cheaper than a numpy generator
+    for the few bodies a system has per level.
+    """
+    return np.array([rng.random() for _ in range(rows * n)]).reshape(rows, n)
+
+
+def poisson_table(lambdas, size=64):
+    """Cumulative Poisson distribution for each lambda, one row each, up to size - 1."""
+    lambdas = np.asarray(lambdas, dtype=np.float64)[:, None]
+    k = np.arange(size)
+    log_pmf = k * np.log(np.where(lambdas > 0, lambdas, 1.0)) - lambdas - np.cumsum(np.log(np.maximum(k, 1)))
+    pmf = np.where(lambdas > 0, np.exp(log_pmf), k == 0)
+    return np.cumsum(pmf, axis=1)
+
+
+# Moon count distribution of every planet type, rows in BATCH_TYPES order
+MOON_CDF = poisson_table([MOON_LAMBDAS.get(t, 0.0) for t in BATCH_TYPES])
+
+
+def add_satellite_level(parents, owners, depth, systems, rngs, remaining):
+    """
+    Moons (and, under planets, subplanets) of every body in parents, the bodies of one
+    level across all systems. owners are the system index of each parent, remaining the
+    body budget left per system. Returns the new level and its owners.
+    """
+    # ==== How many satellites, one Poisson over every parent ====
+    per_system = np.bincount(owners, minlength=len(rngs)).tolist()
+    draws = [uniforms(rng, 2, k) for rng, k in zip(rngs, per_system)]  # moons, subplanets
+    u = np.concatenate(draws, axis=1)
+    type_index = np.array([TYPE_INDEX[parent.planet_type] for parent in parents], dtype=np.intp)
+    n_moons = (u[0][:, None] >= MOON_CDF[type_index]).sum(axis=1)
+
+    # ==== Add Subplanets for Massive Gas Giants ====
+    n_subplanets = np.zeros(len(parents), dtype=np.intp)
+    if depth == 1:
+        giants = np.array([p.planet_type == 'Gas' and p.mass > SUBPLANET_MASS_THRESHOLD for p in parents], dtype=bool)
+        n_subplanets[giants] = 1 + (u[1][giants] * MAX_SUBPLANETS).astype(np.intp)  # randint(1, MAX_SUBPLANETS)
+
+    # ==== The satellites, in tree order, within each system's budget ====
+    children = [[] for _ in rngs]  # (parent, is_moon, id, name) per system
+    for parent, s, moons, subplanets in zip(parents, owners, n_moons.tolist(), n_subplanets.tolist()):
+        children[s].extend(
+            (parent, True, parent.id * 10 + i + 1, f"{parent.name}-{int_to_roman(i + 1)}") for i in range(moons)
+        )
+        children[s].extend(
+            (parent, False, parent.id * 100 + j + 1, f"{parent.name}-{int_to_roman(j + 1)}") for j in range(subplanets)
+        )
+
+    specs, new_owners, draws = [], [], []
+    for s, rng in enumerate(rngs):
+        if len(children[s]) > remaining[s]:
+            del children[s][remaining[s]:]
+            systems[s].truncated = True
+        remaining[s] -= len(children[s])
+        specs.extend(children[s])
+        new_owners.extend([s] * len(children[s]))
+        draws.append(uniforms(rng, 1 + BATCH_UNIFORMS, len(children[s])))  # orbit, then Planet.batch's
+    if not specs:
+        return [], []
+    u = np.concatenate(draws, axis=1)
+
+    parents, is_moon, ids, names = zip(*specs)
+    is_moon = np.array(is_moon, dtype=bool)
+    low = np.where(is_moon, MOON_ORBIT_RANGE[0], SUBPLANET_ORBIT_RANGE[0])
+    high = np.where(is_moon, MOON_ORBIT_RANGE[1], SUBPLANET_ORBIT_RANGE[1])
+    types = [None if moon else 'Rock' for moon in is_moon.tolist()]
+    level = Planet.batch(types, low + (high - low) * u[0], is_moon=is_moon, parents=list(parents),
+                         ids=ids, names=names, uniforms=u[1:])
+    for parent, body in zip(parents, level):
+        parent.orbit.append(body)
+    return level, new_owners
+
+
+class TreeStats:
+    """
+    Size statistics of generated body trees: bodies per system, per tree level
+    (0 is the star, 1 the planets, ...) and how many systems hit their budget.
+
+        stats = TreeStats()
+        for system in systems:
+            stats.add(system)
+        print(stats)
+    """
+
+    def __init__(self):
+        self.sizes = Counter()  # bodies in a system -> number of systems
+        self.levels = []  # bodies at each level, over all systems
+        self.truncated = 0
+
+    def add(self, system):
+        level = [system.star] if system.star else []
+        depth = 0
+        size = 0
+        while level:
+            if depth == len(self.levels):
+                self.levels.append(0)
+            self.levels[depth] += len(level)
+            size += len(level)
+            level = [child for body in level for child in body.orbit if not isinstance(child, Ship)]
+            depth += 1
+        self.sizes[size] += 1
+        self.truncated += system.truncated
+
+    def merge(self, other):
+        self.sizes.update(other.sizes)
+        self.levels += [0] * (len(other.levels) - len(self.levels))
+        for depth, count in enumerate(other.levels):
+            self.levels[depth] += count
+        self.truncated += other.truncated
+        return self
+
+    @property
+    def systems(self):
+        return sum(self.sizes.values())
+
+    @property
+    def bodies(self):
+        return sum(size * count for size, count in self.sizes.items())
+
+    def percentile(self, q):
+        """Smallest system size that at least q percent of the systems do not exceed."""
+        target = q / 100 * self.systems
+        seen = 0
+        for size in sorted(self.sizes):
+            seen += self.sizes[size]
+            if seen >= target:
+                return size
+        return 0
+
+    def __str__(self):
+        if not self.systems:
+            return "No systems"
+        return (
+            f"{self.systems} systems, {self.bodies} bodies\n"
+            f"Bodies per system: mean {self.bodies / self.systems:.1f}, median {self.percentile(50)}, "
+            f"p99 {self.percentile(99)}, max {max(self.sizes)}\n"
+            f"Bodies per level: {', '.join(f'{depth}: {count}' for depth, count in enumerate(self.levels))}\n"
+            f"Systems cut by the body budget: {self.truncated}"
+        )
+
+
 class StarSystem(Object):
     def __init__(self, id: int, position: Vec3= Vec3(0.0, 0.0, 0.0), name="Unnamed System"):
         super().__init__(id, position, orbit=[])
         self.name = name
         self.star = None
 
-
-    def generate(self, n_planets=5):
-        # ==== Configuration Parameters ====
-        spectral_classes = ['O', 'B', 'A', 'F', 'G', 'K', 'M']
-        inner_types = ['Rock', 'Metal']
-        outer_types = ['Gas', 'Ice', 'Rock']
-        inner_weights = [0.8, 0.2]
-        outer_weights = [0.5, 0.3, 0.2]
-        orbit_threshold = 2.0  # in AU, separates inner and outer planet types
-
-        # Poisson distribution for number of moons
-        moon_lambdas = {
-            'Gas': 3.0,
-            'Ice': 2.0,
-            'Rock': 0.5,
-            'Metal': 0.3,
-        }
-
-        max_satellite_depth = 5
-        max_subplanets = 3
-        subplanet_mass_threshold = 100  # mass threshold for subplanet generation
-
-        orbit_radius = 0.3  # initial planet orbit radius in AU
-        orbit_gap_range = (0.2, 1.5)  # AU, gaps between planet orbits
-
-        # Convert all moon/subplanet/submoon orbits from Earth radii to AU:
-        EARTH_RADII_IN_AU = 1 / 215  # ≈0.00465 AU per Earth radius
-
-        moon_orbit_range = (5 * EARTH_RADII_IN_AU, 60 * EARTH_RADII_IN_AU)  # ≈ (0.023, 0.28) AU
-        subplanet_orbit_range = (1.5 * EARTH_RADII_IN_AU, 5 * EARTH_RADII_IN_AU)  # ≈ (0.007, 0.023) AU
-        # submoon_orbit_range = (3 * EARTH_RADII_IN_AU, 20 * EARTH_RADII_IN_AU)  # ≈ (0.014, 0.093) AU
-
-
-        # ==== Create Star ====
-        spectral_class = random.choice(spectral_classes)
-        self.star = Star(self.id * 10, spectral_class)
-        self.star.name = f"{spectral_class}-{self.name}"
-        self.orbit.append(self.star)
-
-        # ==== Recursive Satellite Function ====
-        def add_satellites(parent, depth):
-            if depth > max_satellite_depth:
-                return
-
-            # Determine number of moons
-            lam = moon_lambdas.get(parent.planet_type, 0.0)
-            n_satellites = np.random.poisson(lam)
-
-            for i in range(n_satellites):
-                moon_orbit = random.uniform(*moon_orbit_range)
-                moon_id = parent.id * 10 + i + 1
-                moon_name = f"{parent.name}-{int_to_roman(i + 1)}"
-                moon = Planet(moon_id, moon_orbit, name=moon_name, is_moon=True, parent_planet=parent)
-                parent.orbit.append(moon)
-                add_satellites(moon, depth + 1)
+        # name -> object and id -> object over every body (ships included), see register
+        self._by_name = {}
+        self._by_id = {}
+        self._shadowed = {}
+        self.truncated = False  # generation hit the body budget
+        self.evicted_from = None  # LazySystems that evicted the system and builds it again
+        self.removed = []  # names given to remove_object, replayed on a system rebuilt from its seed
+        self.fleet = None  # Fleet of the universe holding the system, ships spawned in it join it
+
+
+    def _upgrade_state(self, state):
+        defaults = {"_by_name": {}, "_by_id": {}, "_shadowed": {}, "truncated": False,
+                    "evicted_from": None, "removed": [], "fleet": None}
+        return super()._upgrade_state({**defaults, **state})
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if isinstance(state, tuple):
+            return
+        # Pickled before fleets: ships sat first in the orbit lists, newest first
+        stack = [self.star] if self.star else []
+        while stack:
+            body = stack.pop()
+            ships = [child for child in body.orbit if isinstance(child, Ship)]
+            if ships:
+                body.orbit = [child for child in body.orbit if not isinstance(child, Ship)]
+                body.ships = dict.fromkeys(reversed(ships))
+            stack.extend(body.orbit)
+        self.reindex()
+
+    def generate(self, n_planets=5, star=None, rng=None, max_bodies=None):
+        StarSystem.generate_many([self], [n_planets], [star], [rng], max_bodies=max_bodies)
+
+    @staticmethod
+    def generate_many(systems, n_planets, stars=None, rngs=None, max_bodies=None):
+        """
+        generate() for many systems at once, one tree level at a time: the planets of every
+        system, then all of their moons and subplanets, then the moons of those, ... Every
+        level is one Planet.batch and one vectorized Poisson over all its parents. Each system
+        draws its own columns from its own rng, so it comes out the same alone or in a batch.
+        stars and rngs are per system, None entries draw a star / use the global state.
+
+        max_bodies caps the bodies of each system, star included. A level that would go past
+        it keeps its first bodies in tree order and the system is marked truncated.
+        """
+        stars = stars if stars is not None else [None] * len(systems)
+        rngs = [rng if rng is not None else GLOBAL_RNG for rng in (rngs if rngs is not None else [None] * len(systems))]
+        remaining = [math.inf if max_bodies is None else max_bodies - 1 for _ in systems]  # after the star
+
+        # ==== Create Stars ====
+        for system, star, rng in zip(systems, stars, rngs):
+            if star is None:
+                spectral_class = rng.choice(SPECTRAL_CLASSES)
+                star = Star(system.id * 10, spectral_class, rng=rng)
+                star.name = f"{spectral_class}-{system.name}"
+            system.star = star
+            system.orbit.append(star)
+            system.truncated = False
 
         # ==== Create Planets ====
-        planets = []
-        for i in range(n_planets):
-            orbit_radius += random.uniform(*orbit_gap_range)
-            planet_id = self.id * 100 + i + 1
-            roman_index = int_to_roman(i + 1)
-            planet_name = f"{self.name}-{roman_index}"
-
-            if orbit_radius < orbit_threshold:
-                planet_type = random.choices(inner_types, weights=inner_weights)[0]
-            else:
-                planet_type = random.choices(outer_types, weights=outer_weights)[0]
-
-            planet = Planet(planet_id, orbit_radius, name=planet_name, planet_type=planet_type)
-            add_satellites(planet, depth=1)
-
-            # ==== Add Subplanets for Massive Gas Giants ====
-            if planet_type == 'Gas' and planet.mass > subplanet_mass_threshold:
-                n_subplanets = random.randint(1, max_subplanets)
-                for j in range(n_subplanets):
-                    sp_orbit = random.uniform(*subplanet_orbit_range)
-                    sp_id = planet_id * 100 + j + 1
-                    sp_name = f"{planet.name}-{int_to_roman(j + 1)}"
-                    subplanet = Planet(sp_id, sp_orbit, name=sp_name, planet_type='Rock')
-                    add_satellites(subplanet, depth=2)
-                    planet.orbit.append(subplanet)
-
-            planets.append(planet)
-
-        self.star.orbit.extend(planets)
+        draws, orbit_radii, ids, names = [], [], [], []
+        for s, (system, n, rng) in enumerate(zip(systems, n_planets, rngs)):
+            if n > remaining[s]:
+                n = remaining[s]
+                system.truncated = True
+            remaining[s] -= n
+
+            draw = uniforms(rng, 2 + BATCH_UNIFORMS, n)  # orbit gap, type, then Planet.batch's
+            gaps = ORBIT_GAP_RANGE[0] + (ORBIT_GAP_RANGE[1] - ORBIT_GAP_RANGE[0]) * draw[0]
+            orbit_radii.append(np.cumsum(np.concatenate([[FIRST_ORBIT_RADIUS], gaps]))[1:])
+            draws.append(draw)
+            ids.extend(system.id * 100 + i + 1 for i in range(n))
+            names.extend(f"{system.name}-{int_to_roman(i + 1)}" for i in range(n))
+        u = np.concatenate(draws, axis=1)
+        orbit_radii = np.concatenate(orbit_radii)
+        types = np.where(
+            orbit_radii < ORBIT_THRESHOLD,
+            weighted_choice(INNER_TYPES, INNER_WEIGHTS, u[1]),
+            weighted_choice(OUTER_TYPES, OUTER_WEIGHTS, u[1]),
+        ).tolist()
+
+        planets = Planet.batch(types, orbit_radii, ids=ids, names=names, uniforms=u[2:])
+        owners = [s for s, draw in enumerate(draws) for _ in range(draw.shape[1])]  # system of every body
+        for planet, s in zip(planets, owners):
+            systems[s].star.orbit.append(planet)
+
+        # ==== Satellites, level by level ====
+        parents, depth = planets, 1
+        while parents and depth <= MAX_SATELLITE_DEPTH:
+            parents, owners = add_satellite_level(parents, owners, depth, systems, rngs, remaining)
+            depth += 1
+
+        for system in systems:
+            system.reindex()
 
     def __str__(self):
         out = f"Star System: {self.name}\n"
@@ -132,27 +381,6 @@ class StarSystem(Object):
         return out
     
     def display(self):
-        # ANSI color codes
-        RESET = "\033[0m"
-        BOLD = "\033[1m"
-
-        PLANET_ICON_COLOR = "\033[38;5;209m"     
-        STAR_ICON_COLOR = "\033[38;5;226m"     
-        MOON_ICON_COLOR = "\033[38;5;47m"     
-        SHIP_ICON_COLOR = "\033[38;5;199m"     
-
-
-        NAME_COLOR = "\033[38;5;221m"     # Soft gold
-        LABEL_COLOR = "\033[38;5;244m"    # Grayish for labels
-        VALUE_COLOR = "\033[38;5;39m"     # Bright blue for values
-
-        type_color = {
-            'Rock': "\033[38;5;220m",     # Yellow-orange
-            'Metal': "\033[38;5;250m",    # Light gray
-            'Gas': "\033[38;5;81m",       # Cyan
-            'Ice': "\033[38;5;111m",      # Light blue
-        }
-
         def print_body(body, prefix="", is_last=True, ancestors_last=[]):
             connector = " └──>" if is_last else " ├──>"
 
@@ -162,51 +390,109 @@ class StarSystem(Object):
                 spacer += "     " if is_ancestor_last else " │   "
             spacer += connector
 
-            if isinstance(body, Star):
-                print(
-                    f"{spacer}{BOLD}{STAR_ICON_COLOR} * {NAME_COLOR}{body.name}{RESET} "
-                    f"{LABEL_COLOR}(Spectral Class:{RESET} {VALUE_COLOR}{body.spectral_class}{RESET}{LABEL_COLOR}){RESET} "
-                    f"Perceived color : {body.color_code}███{self.RESET_CODE}"
-                )
-            elif isinstance(body, Planet):
-                symbol = f"{BOLD}{MOON_ICON_COLOR} •" if body.is_moon else f"{BOLD}{PLANET_ICON_COLOR} ⬤"
-                type_col = type_color.get(body.planet_type, "")
-                print(
-                    f"{spacer}{symbol} {BOLD}{NAME_COLOR}{body.name}{RESET} "
-                    f"{type_col}{body.planet_type}{RESET}   \t"
-                    f"{LABEL_COLOR}Orbit:{RESET} {VALUE_COLOR}{body.orbit_radius:3.3f} au{RESET} \t"
-                    f"{LABEL_COLOR}Radius:{RESET} {VALUE_COLOR}{body.radius} R⊕{RESET}    \t"
-                    f"{LABEL_COLOR}Density:{RESET} {VALUE_COLOR}{body.density} g/cm³{RESET} \t"
-                )
-            elif isinstance(body, Ship):
-                symbol = f"{BOLD}{SHIP_ICON_COLOR} ➤"
-                print(
-                    f"{spacer}{symbol} {BOLD}{body.owner_color}{body.name}{RESET}   "
-                    f"{body.owner_color} {body.owner}    {LABEL_COLOR} {body.type} {RESET}"
-                )
-
-            last_index = len(body.orbit) - 1
-            for i, child in enumerate(body.orbit):
+            line = body_line(body)
+            if line is not None:
+                print(spacer + line)
+
+            children = body.satellites()
+            last_index = len(children) - 1
+            for i, child in enumerate(children):
                 is_last_child = (i == last_index)
                 print_body(child, prefix + "   ", is_last_child, ancestors_last + [is_last])
 
-        print(f"{BOLD}\033[92m ¤ Star System: {self.name}{RESET}")
+        print(system_header(self.name))
         print_body(self.star, is_last=True)
 
 
 
+    def walk(self):
+        """Every body of the system depth first, star included."""
+        stack = [self.star] if self.star else []
+        while stack:
+            body = stack.pop()
+            yield body
+            stack.extend(reversed(body.satellites()))
+
+    def scan_all(self, processes: int = None, progress=None, render: bool = False):
+        """
+        Scans every planet, moon and subplanet of the system on a process pool, see
+        scanning.scan_planets. Returns its generator: planets stream back as they finish and
+        nothing is scanned until it is iterated (list(system.scan_all()) to wait for all).
+        """
+        planets = [body for body in self.walk() if isinstance(body, Planet)]
+        return scan_planets(planets, processes=processes, progress=progress, render=render)
+
+    # ==== Object index
+
+    def register(self, obj, parent=None):
+        """
+        Adds obj and everything orbiting it to the index, parent being the body it orbits.
+        Generated names can repeat (moons and subplanets share the numbering), the first
+        body in depth first order keeps the name, the others wait in _shadowed.
+        """
+        stack = [(obj, parent)]
+        while stack:
+            body, parent = stack.pop()
+            body.system = self
+            if self._by_name.setdefault(body.name, body) is not body:
+                self._shadowed.setdefault(body.name, []).append(body)
+            self._by_id.setdefault(body.id, body)
+            body._parent = parent
+            stack.extend((child, body) for child in reversed(body.satellites()))
+
+    def unregister(self, obj):
+        """Drops obj and everything orbiting it from the index, the orbit lists are left alone."""
+        stack = [obj]
+        while stack:
+            body = stack.pop()
+            if body.system is self:
+                body.system = None
+                body._parent = None
+            stack.extend(body.satellites())
+
+            shadowed = self._shadowed.get(body.name, [])
+            if body in shadowed:
+                shadowed.remove(body)
+            elif self._by_name.get(body.name) is body:
+                if shadowed:
+                    self._by_name[body.name] = shadowed.pop(0)
+                else:
+                    del self._by_name[body.name]
+            if self._by_id.get(body.id) is body:
+                del self._by_id[body.id]
+
+    def reindex(self):
+        """Rebuilds the index from the orbit tree, after bodies were attached by hand."""
+        self._by_name.clear()
+        self._by_id.clear()
+        self._shadowed.clear()
+        if self.star:
+            self.register(self.star)
+
+    def remove_object(self, name):
+        """
+        Detaches a body (and what orbits it) from the system, returns it.
+        For a system in a Universe use Universe.remove_object, which also updates body_table.
+        """
+        obj = self._by_name.get(name)
+        if obj is None:
+            raise KeyError(name)
+        if isinstance(obj, Ship):
+            obj.despawn()
+            return obj
+        parent = obj._parent
+        if parent is None:
+            self.orbit.remove(obj)
+            self.star = None
+        else:
+            parent.orbit.remove(obj)
+        self.unregister(obj)
+        self.removed.append(name)
+        return obj
+
     def get_object(self, name):
-        def search(orbiting_bodies):
-            for obj in orbiting_bodies:
-                if obj.name == name:
-                    return obj
-                # Recursively search moons or sub-planets
-                if hasattr(obj, 'orbit'):
-                    found = search(obj.orbit)
-                    if found:
-                        return found
-            return None
+        """Star, planet, moon or ship by name, None if the system has none."""
+        return self._by_name.get(name)
 
-        if self.star:
-            return search(self.star.orbit)
-        return None
+    def get_object_by_id(self, id):
+        return self._by_id.get(id)
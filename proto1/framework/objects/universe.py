@@ -1,54 +1,290 @@
 import random
 import numpy as np
-import string
-import copy
 
 from ..utils_class import *
 
-from .star_system import StarSystem
+from .star_system import StarSystem, TreeStats
+from ..system_table import SystemTable, LazySystems, system_budget
+from ..spatial_index import SpatialIndex
+from ..parallel import generate_systems
+from ..storage import UniverseWriter, UniverseFile
+from ..naming import SystemNamer
+from ..query import BodyTable
+from ..scanning import scan_planets
+from ..memory import MemoryReport
+from ..fleet import Fleet
+from .planet import Planet
+from .ship import Ship
 
 
 class Universe:
     def __init__(self):
         self.systems = {}
         self.n_systems = None
+        self.table = None
+        self._spatial_index = None
+        self._body_table = None
+        self.fleet = Fleet()  # ships of this universe, ships spawned at its bodies join it
 
-    def generate(self, n_systems: int, poisson_lambda: float):
-        used_names = set()
+    def __setstate__(self, state):
+        if "fleet" not in state:
+            # Pickled before fleets, tables and indices: the ships join a fleet of their own
+            state = {"table": None, "_spatial_index": None, "_body_table": None, "fleet": Fleet(), **state}
+            for system in state["systems"].values():
+                system.fleet = state["fleet"]
+                for ship in [body for body in system.walk() if isinstance(body, Ship)]:
+                    ship.fleet = state["fleet"]
+                    ship.fleet.add(ship)
+        self.__dict__.update(state)
+
+    def generate(self, n_systems: int, poisson_lambda: float, bulk: bool = False,
+                 seed: int = None, processes: int = None, chunk_size: int = 256,
+                 lazy: bool = False, max_systems: int = None, max_bytes: int = None,
+                 max_bodies: int = None, max_bodies_per_system: int = None):
+        """
+        bulk=True samples every system level attribute as numpy columns in one pass
+        and only builds the StarSystem objects when they are accessed.
+
+        lazy=True is the seeded version of bulk: a system is only (id, name, position, seed)
+        until it is touched, then its body tree is regenerated from the seed. Built systems
+        sit in an LRU cache bounded by max_systems and/or max_bytes.
+
+        Otherwise seed and/or processes switch to seeded eager generation: each system gets
+        its own random stream derived from (seed, id) and systems are built on a process pool.
+        The result only depends on seed, not on the number of processes.
+
+        max_bodies_per_system caps the bodies (star included) of every system, max_bodies
+        caps the whole universe. The latter is shared evenly, each system gets
+        max_bodies // n_systems, so that every system can still be built on its own.
+        """
         self.n_systems = n_systems
+        self._spatial_index = None
+        self._body_table = None
+        budget = system_budget(n_systems, max_bodies, max_bodies_per_system)
 
-        def random_system_name():
-            while True:
-                prefix = ''.join(random.choices(string.ascii_uppercase, k=3))
-                suffix = ''.join(random.choices(string.digits, k=4))
-                name = f"{prefix}-{suffix}"
-                if name not in used_names:
-                    used_names.add(name)
-                    return name
+        if lazy and seed is None:
+            seed = random.getrandbits(63)
+
+        if bulk or lazy:
+            self.table = SystemTable.sample(n_systems, poisson_lambda, seed=seed if lazy else None, max_bodies=budget)
+            self.systems = LazySystems(self.table, max_systems=max_systems, max_bytes=max_bytes, fleet=self.fleet)
+            return
+
+        if seed is not None or processes is not None:
+            if seed is None:
+                seed = random.getrandbits(63)
+            self.table = None
+            self.systems = {}
+            for chunk in generate_systems(n_systems, poisson_lambda, seed, processes, chunk_size, budget):
+                for system in chunk:
+                    system.fleet = self.fleet
+                    self.systems[system.name] = system
+            return
+
+        self.table = None
+        self.systems = {}
+        namer = SystemNamer(random.getrandbits(63))
 
+        systems, planet_counts = [], []
+        positions = np.empty((n_systems, 3))  # one array, every system position is a view of its row
         for i in range(n_systems):
-            system_name = random_system_name()
-            n_planets = max(1, np.random.poisson(poisson_lambda))
+            system_name = namer.name(i)
+            planet_counts.append(max(1, np.random.poisson(poisson_lambda)))
 
-            pos = Vec3(
+            positions[i] = (
                 random.random(),
                 random.random(),
                 random.random()
             )
-            system = None
-            system = StarSystem(id=i, name=system_name, position=pos)
-            system.generate(n_planets=n_planets)
+            systems.append(StarSystem(id=i, name=system_name, position=Vec3View(positions, i)))
+
+        # Planets of every system sampled in one batch
+        StarSystem.generate_many(systems, planet_counts, max_bodies=budget)
+        for system in systems:
             # system.display()
-            self.systems[system_name] = copy.deepcopy(system)
+            system.fleet = self.fleet
+            self.systems[system.name] = system
+
 
 
+    def save(self, path):
+        """Writes the universe to the binary format, one system at a time."""
+        with UniverseWriter(path, meta={"n_systems": self.n_systems}) as writer:
+            for name in self.systems:
+                writer.add(self.systems[name])
+
+    @classmethod
+    def open(cls, path, max_systems: int = None, max_bytes: int = None):
+        """
+        Opens a universe saved with save(). Nothing but the header is read here,
+        systems are built from the mapped file when they are accessed.
+        """
+        universe = cls()
+        universe.table = UniverseFile(path, fleet=universe.fleet)
+        universe.systems = LazySystems(universe.table, max_systems=max_systems, max_bytes=max_bytes, fleet=universe.fleet)
+        universe.n_systems = len(universe.table)
+        return universe
 
     def info(self):
+        if self.table is not None:
+            # Everything info needs is in the table, no need to build the systems
+            for row in self.systems.rows():
+                print(*self.table.describe(row))
+            for name, system in self.systems.extra.items():
+                print(name, system.star.spectral_class, system.position)
+            return
+
         for name, system in self.systems.items():
             print(name, system.star.spectral_class, system.position)
 
 
 
+    def iter_generate(self, n_systems: int, poisson_lambda: float, seed: int = None,
+                      processes: int = 1, chunk_size: int = None,
+                      max_bodies: int = None, max_bodies_per_system: int = None):
+        """
+        Streams the systems of a seeded universe instead of keeping them: yields finished
+        StarSystem objects one by one, or lists of chunk_size of them. Nothing is stored on
+        the universe, so memory stays flat and the stream can go straight into a writer:
+
+            with UniverseWriter("universe.bin") as writer:
+                writer.extend(universe.iter_generate(10**7, 5.0, seed=1, chunk_size=1024))
+
+        Ids run from 0 to n_systems - 1 in order and names are unique across the stream.
+        The systems are the same as generate(n_systems, poisson_lambda, seed=seed), budgets included.
+        """
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.n_systems = n_systems
+        budget = system_budget(n_systems, max_bodies, max_bodies_per_system)
+
+        for chunk in generate_systems(n_systems, poisson_lambda, seed, processes, chunk_size or 256, budget):
+            if chunk_size:
+                yield chunk
+            else:
+                yield from chunk
+
+    def tree_stats(self):
+        """TreeStats over every system. Builds the systems of a lazy universe."""
+        stats = TreeStats()
+        for system in self.systems.values():
+            stats.add(system)
+        return stats
+
+    def memory_report(self, sample: int = None):
+        """
+        MemoryReport of the systems in memory, bytes broken down by class. Lazy universes
+        only report the systems currently built, nothing gets built for it.
+        sample=n measures n evenly spaced systems and scales up, for large universes.
+        """
+        report = MemoryReport()
+        systems = list(self.systems.built() if isinstance(self.systems, LazySystems) else self.systems.values())
+        weight = 1.0
+        if sample is not None and len(systems) > sample:
+            weight = len(systems) / sample
+            systems = [systems[int(i * weight)] for i in range(sample)]
+        for system in systems:
+            report.add(system, weight)
+        return report
+
+    def positions(self):
+        """
+        (names, Vec3Array) of every system position. Table backed universes with nothing
+        removed or added hand out the position column itself, without a copy.
+        """
+        if isinstance(self.systems, LazySystems):
+            # Table rows come straight from the position column, only added systems need a lookup
+            rows = self.systems.rows()
+            extra = self.systems.extra
+            names = self.table.names_of(rows) + list(extra)
+            if not extra and len(rows) == len(self.table):
+                return names, Vec3Array(self.table.position)
+            return names, Vec3Array(np.concatenate([
+                self.table.position[rows],
+                Vec3Array.from_vectors(s.position for s in extra.values()).data,
+            ]))
+        return list(self.systems), Vec3Array.from_vectors(s.position for s in self.systems.values())
+
+    @property
+    def spatial_index(self):
+        """k-d tree over system positions keyed by name, built on first use and kept up to date."""
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(*self.positions())
+        return self._spatial_index
+
+    @property
+    def body_table(self):
+        """
+        Columns of every star and planet for query(), built on first use and kept up to date.
+        Building it touches every system, except for opened files which are read column-wise.
+        """
+        if self._body_table is None:
+            self._body_table = BodyTable.from_universe(self)
+        return self._body_table
+
+    def query(self, predicate):
+        """Bodies matching a predicate, e.g. query((col("planet_type") == "Rock") & (col("mass") > 5))."""
+        return self.body_table.where(predicate, universe=self)
+
+    def add_system(self, system):
+        system.fleet = self.fleet
+        self.systems[system.name] = system
+        if self._spatial_index is not None:
+            self._spatial_index.insert(system.name, system.position)
+        if self._body_table is not None:
+            self._body_table.add(system)
+
+    def remove_system(self, name):
+        del self.systems[name]
+        if self._spatial_index is not None:
+            self._spatial_index.remove(name)
+        if self._body_table is not None:
+            self._body_table.remove(name)
+
+    def remove_object(self, name):
+        """
+        Detaches a body (and what orbits it) from its system and updates body_table, returns it.
+        Go through this rather than StarSystem.remove_object for systems of a universe.
+        """
+        system = self._system_of(name)
+        if system is None:
+            raise KeyError(name)
+        obj = system.remove_object(name)
+        if self._body_table is not None and system.name in self._body_table:
+            self._body_table.add(system)  # replaces the system's rows
+        return obj
+
+    def _system_of(self, name):
+        parts = name.split("-")
+        if len(parts[0]) == 1:
+            parts = parts[1:]
+        return self.get_system("-".join(parts[:2]))
+
+    def get_object(self, name):
+        """
+        Resolves a body name ("AAA-0000-III-II", or "G-AAA-0000" for a star) in O(1):
+        the system comes from the name prefix, the body from the system's index.
+        """
+        system = self._system_of(name)
+        if system is None:
+            return None
+        return system.get_object(name)
+
+    def scan_bodies(self, names, processes: int = None, progress=None, render: bool = False):
+        """
+        Scans the planets with the given names ("AAA-0000-III-II") across a process pool,
+        see scanning.scan_planets. Returns its generator, which yields the planets as they
+        finish and only scans while iterated. Unknown names raise KeyError right away.
+        Results go to the live planets, systems evicted meanwhile (max_systems) keep them.
+        """
+        planets = []
+        for name in names:
+            body = self.get_object(name)
+            if not isinstance(body, Planet):
+                raise KeyError(f"No planet named {name}")
+            planets.append(body)
+        return scan_planets(planets, processes=processes, progress=progress, render=render)
+
     def get_system(self, name):
         try: 
             return self.systems[name]
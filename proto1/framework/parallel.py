@@ -0,0 +1,43 @@
+import os
+from collections import deque
+from multiprocessing import Pool
+
+from .system_table import SystemTable
+
+
+def _generate_chunk(table):
+    return table.build_systems(range(len(table)))
+
+
+def generate_systems(n_systems: int, poisson_lambda: float, seed: int, processes: int = None, chunk_size: int = 256,
+                     max_bodies: int = None):
+    """
+    Generates systems 0..n-1 and yields them back in chunks (lists of StarSystem), in id order.
+    The system level columns are sampled block by block from the seed, then every worker
+    builds the body trees of its rows from their own per-system streams.
+    processes=None uses every core, processes=1 runs inline without a pool.
+    Only a bounded number of chunks is in flight, so memory stays flat however many
+    systems are generated. The output only depends on seed, never on processes or chunk_size.
+    max_bodies is the body budget of each system, see StarSystem.generate_many.
+    """
+    chunks = (
+        block.slice(start, start + chunk_size)
+        for block in SystemTable.iter_blocks(n_systems, poisson_lambda, seed, max_bodies)
+        for start in range(0, len(block), chunk_size)
+    )
+
+    processes = processes or os.cpu_count()
+    if processes == 1:
+        for chunk in chunks:
+            yield _generate_chunk(chunk)
+        return
+
+    with Pool(processes) as pool:
+        # Results come back in submission order, each chunk pickled on its own
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.apply_async(_generate_chunk, (chunk,)))
+            if len(in_flight) >= 2 * processes:
+                yield in_flight.popleft().get()
+        while in_flight:
+            yield in_flight.popleft().get()
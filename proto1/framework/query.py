@@ -0,0 +1,356 @@
+"""
+Columnar index over every star and planet of a universe, one row per body and one
+flat numpy column per attribute. Questions are predicates over the columns,
+evaluated as vectorized masks:
+
+    # G-class systems with a Rock planet between 0.8 and 1.5 AU at 250-320 K
+    result = universe.query(
+        (col("spectral_class") == "G") & (col("planet_type") == "Rock")
+        & col("orbit_radius").between(0.8, 1.5) & col("temperature").between(250, 320)
+    )
+    result.systems(), result.ids(), result.objects()
+
+spectral_class is the class of the system's star on every row, so planets can be
+filtered by their star. Categorical columns are stored as codes and compared by label.
+"""
+import operator
+
+import numpy as np
+
+from .utils_class import *
+from .system_table import SPECTRAL_CLASSES, LazySystems
+from .storage import PLANET_TYPES, NO_STAR, UniverseFile, celestial_bodies
+from .exporters import SystemWriter
+
+
+KINDS = ["star", "planet", "moon"]
+NO_CODE = 255  # planet_type of a star
+
+CATEGORIES = {
+    "kind": KINDS,
+    "spectral_class": SPECTRAL_CLASSES,
+    "planet_type": PLANET_TYPES,
+}
+
+COLUMNS = {
+    "id": np.int64,
+    "system": np.int64,           # StarSystem.id
+    "parent": np.int64,           # id of the orbited body, -1 for stars
+    "kind": np.uint8,
+    "spectral_class": np.uint8,   # of the system's star
+    "planet_type": np.uint8,
+    "is_moon": np.bool_,
+    "orbit_radius": np.float64,   # nan for stars
+    "mass": np.float64,
+    "radius": np.float64,
+    "density": np.float64,        # nan for stars
+    "temperature": np.float64,
+}
+
+# Bookkeeping: system slot, position among celestial_bodies(system) (-1 for the star), removed or not
+_INTERNAL = {"_slot": np.int64, "_body": np.int32, "_alive": np.bool_}
+
+
+# ==== Predicates
+
+class Predicate:
+    """Boolean expression over the columns, combined with &, | and ~."""
+
+    def __init__(self, evaluate, text):
+        self._evaluate = evaluate
+        self.text = text
+
+    def mask(self, columns):
+        return self._evaluate(columns)
+
+    def __and__(self, other):
+        return Predicate(lambda c: self.mask(c) & other.mask(c), f"({self.text} & {other.text})")
+
+    def __or__(self, other):
+        return Predicate(lambda c: self.mask(c) | other.mask(c), f"({self.text} | {other.text})")
+
+    def __invert__(self):
+        return Predicate(lambda c: ~self.mask(c), f"~{self.text}")
+
+    def __repr__(self):
+        return f"Predicate({self.text})"
+
+
+class Column:
+    """Reference to a column, comparisons give predicates."""
+
+    def __init__(self, name):
+        if name not in COLUMNS:
+            raise KeyError(f"Unknown column {name!r}, expected one of {list(COLUMNS)}")
+        self.name = name
+
+    def _code(self, value):
+        labels = CATEGORIES.get(self.name)
+        if labels is None or not isinstance(value, str):
+            return value
+        if value not in labels:
+            raise ValueError(f"{value!r} is not a {self.name}, expected one of {labels}")
+        return labels.index(value)
+
+    def _compare(self, op, value, symbol):
+        name, code = self.name, self._code(value)
+        return Predicate(lambda c: op(c[name], code), f"{name} {symbol} {value!r}")
+
+    def __eq__(self, value): return self._compare(operator.eq, value, "==")
+    def __ne__(self, value): return self._compare(operator.ne, value, "!=")
+    def __lt__(self, value): return self._compare(operator.lt, value, "<")
+    def __le__(self, value): return self._compare(operator.le, value, "<=")
+    def __gt__(self, value): return self._compare(operator.gt, value, ">")
+    def __ge__(self, value): return self._compare(operator.ge, value, ">=")
+
+    def between(self, low, high):
+        """low <= column <= high"""
+        return (self >= low) & (self <= high)
+
+    def isin(self, values):
+        name, codes = self.name, [self._code(value) for value in values]
+        return Predicate(lambda c: np.isin(c[name], codes), f"{name} in {list(values)!r}")
+
+
+def col(name):
+    return Column(name)
+
+
+# ==== Table
+
+class BodyTable(SystemWriter):
+    """
+    Growable columns of every star and planet (ships left out), grouped per system.
+    Systems are added with add/extend (which also take the chunks of Universe.iter_generate)
+    and removed with remove, removed rows are masked out and compacted away once
+    they make up half of the table.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._columns = {name: np.empty(capacity, dtype) for name, dtype in {**COLUMNS, **_INTERNAL}.items()}
+        self._size = 0
+        self._dead = 0
+
+        self._names = []      # slot -> system name, None when it comes from the source file
+        self._slots = {}      # system name -> slot, for systems added by name
+        self._removed = set()
+        self._source = None   # UniverseFile providing slots [0, len(source))
+
+    @classmethod
+    def from_universe(cls, universe):
+        """Indexes every system of a universe. Opened files are read column-wise, without building systems."""
+        table = cls()
+        if isinstance(universe.table, UniverseFile) and isinstance(universe.systems, LazySystems):
+            table._load_file(universe.table, universe.systems.rows())
+            table.extend(universe.systems.extra.values())
+        else:
+            table.extend(universe.systems[name] for name in universe.systems)
+        return table
+
+    def __len__(self):
+        return self._size - self._dead
+
+    def __contains__(self, name):
+        return self._slot_of(name) is not None
+
+    def column(self, name):
+        """Values of a column, removed rows included. A view, only valid until the table changes."""
+        return self._columns[name][:self._size]
+
+    def columns(self):
+        return {name: self.column(name) for name in COLUMNS}
+
+    def where(self, predicate, universe=None):
+        """Rows matching the predicate, universe is where QueryResult.objects resolves them."""
+        mask = predicate.mask(self.columns()) & self.column("_alive")
+        return QueryResult(self, np.flatnonzero(mask), universe)
+
+    # ==== Updates
+
+    def add(self, system):
+        self.extend([system])
+
+    def extend(self, systems, batch: int = 4096):
+        pending = []
+        for item in systems:
+            pending.extend(item if isinstance(item, list) else [item])
+            if len(pending) >= batch:
+                self._add_systems(pending)
+                pending = []
+        self._add_systems(pending)
+
+    def _add_systems(self, systems):
+        rows = []
+        for system in systems:
+            if system.name in self:
+                # Rows of the batch so far go in first, they may belong to the replaced system
+                self._append_rows(rows)
+                rows = []
+                self.remove(system.name)
+            slot = len(self._names)
+            self._names.append(system.name)
+            self._slots[system.name] = slot
+
+            star = system.star
+            if star is None:
+                continue
+            spectral_class = SPECTRAL_CLASSES.index(star.spectral_class)
+            rows.append((
+                star.id, system.id, -1, 0, spectral_class, NO_CODE, False,
+                np.nan, star.mass, star.radius, np.nan, star.temperature, slot, -1, True,
+            ))
+            for k, (body, parent) in enumerate(celestial_bodies(system)):
+                rows.append((
+                    body.id, system.id, (parent or star).id, 2 if body.is_moon else 1, spectral_class,
+                    PLANET_TYPES.index(body.planet_type), body.is_moon, body.orbit_radius,
+                    body.mass, body.radius, body.density, body.temperature, slot, k, True,
+                ))
+
+        self._append_rows(rows)
+
+    def remove(self, name):
+        slot = self._slot_of(name)
+        if slot is None:
+            raise KeyError(name)
+        # Slots only grow as systems are added, so a system's rows are one sorted run
+        start, stop = np.searchsorted(self.column("_slot"), [slot, slot + 1])
+        self._columns["_alive"][start:stop] = False
+        self._dead += int(stop - start)
+        self._removed.add(slot)
+        self._slots.pop(name, None)
+
+        if self._dead > self._size // 2:
+            self._compact()
+
+    def close(self):
+        pass
+
+    def _append_rows(self, rows):
+        if rows:
+            self._append(dict(zip(self._columns, zip(*rows))), len(rows))
+
+    def _append(self, values, n):
+        if self._size + n > len(self._columns["id"]):
+            capacity = max(2 * len(self._columns["id"]), self._size + n)
+            for name, column in self._columns.items():
+                grown = np.empty(capacity, column.dtype)
+                grown[:self._size] = column[:self._size]
+                self._columns[name] = grown
+        for name, column in self._columns.items():
+            column[self._size:self._size + n] = values[name]
+        self._size += n
+
+    def _compact(self):
+        keep = self.column("_alive").copy()
+        for name, column in self._columns.items():
+            kept = column[:self._size][keep]
+            column[:len(kept)] = kept
+        self._size = int(keep.sum())
+        self._dead = 0
+
+    def _slot_of(self, name):
+        slot = self._slots.get(name)
+        if slot is None and self._source is not None:
+            slot = self._source.find(name)
+        return None if slot is None or slot in self._removed else slot
+
+    def _name_of(self, slot):
+        name = self._names[slot]
+        return self._source.name_of(slot) if name is None else name
+
+    def _load_file(self, file, rows):
+        """Fills the table straight from the sections of an opened universe file."""
+        systems = np.asarray(file.systems)
+        stars = np.asarray(file.stars)
+        bodies = np.asarray(file.bodies)
+
+        def remap(codes, kind, labels):
+            lookup = np.array([labels.index(label) for label in file.enums[kind]] + [NO_CODE], dtype=np.uint8)
+            return lookup[np.minimum(codes, len(lookup) - 1)]
+
+        has_star = stars["spectral_class"] != NO_STAR
+        spectral_class = remap(stars["spectral_class"], "spectral_class", SPECTRAL_CLASSES)
+        slots = np.arange(len(systems))
+        system_of = bodies["system"]
+
+        # Rows per system: its star, then its bodies in file order (celestial_bodies order)
+        stars_before = np.cumsum(has_star)
+        star_rows = systems["first_body"][has_star] + stars_before[has_star] - 1
+        body_rows = np.arange(len(bodies)) + stars_before[system_of]
+
+        n = int(has_star.sum()) + len(bodies)
+        values = {name: np.empty(n, dtype) for name, dtype in {**COLUMNS, **_INTERNAL}.items()}
+        for name, star_values, body_values in (
+            ("id", stars["id"][has_star], bodies["id"]),
+            ("system", systems["id"][has_star], systems["id"][system_of]),
+            ("parent", -1, np.where(bodies["parent"] < 0, stars["id"][system_of], bodies["id"][bodies["parent"]])),
+            ("kind", 0, 1 + bodies["is_moon"]),
+            ("spectral_class", spectral_class[has_star], spectral_class[system_of]),
+            ("planet_type", NO_CODE, remap(bodies["planet_type"], "planet_type", PLANET_TYPES)),
+            ("is_moon", False, bodies["is_moon"]),
+            ("orbit_radius", np.nan, bodies["orbit_radius"]),
+            ("mass", stars["mass"][has_star], bodies["mass"]),
+            ("radius", stars["radius"][has_star], bodies["radius"]),
+            ("density", np.nan, bodies["density"]),
+            ("temperature", stars["temperature"][has_star], bodies["temperature"]),
+            ("_slot", slots[has_star], system_of),
+            ("_body", -1, np.arange(len(bodies)) - systems["first_body"][system_of]),
+        ):
+            values[name][star_rows] = star_values
+            values[name][body_rows] = body_values
+        values["_alive"] = np.isin(values["_slot"], rows)
+
+        self._source = file
+        self._names = [None] * len(systems)
+        self._removed = set(np.setdiff1d(slots, rows).tolist())
+        self._append(values, n)
+        self._dead = n - int(values["_alive"].sum())
+
+
+class QueryResult:
+    """Matching rows of a query, copied out of the table so later updates do not shift them."""
+
+    def __init__(self, table, rows, universe=None):
+        self.table = table
+        self.universe = universe
+        self._values = {name: table.column(name)[rows] for name in list(COLUMNS) + ["_slot", "_body"]}
+
+    def __len__(self):
+        return len(self._values["id"])
+
+    def column(self, name):
+        return self._values[name]
+
+    def labels(self, name):
+        """Column values, categorical ones as their labels."""
+        labels = CATEGORIES.get(name)
+        if labels is None:
+            return self._values[name].tolist()
+        return [labels[code] if code < len(labels) else None for code in self._values[name]]
+
+    def ids(self):
+        return self._values["id"]
+
+    def systems(self):
+        """Names of the systems with at least one match, in table order."""
+        return [self.table._name_of(int(slot)) for slot in np.unique(self._values["_slot"])]
+
+    def objects(self):
+        """The matching Star/Planet objects, systems are fetched (built if lazy) through the universe."""
+        if self.universe is None:
+            raise ValueError("Objects can only be resolved on a result from Universe.query")
+
+        objects = []
+        current = None
+        for slot, k in zip(self._values["_slot"].tolist(), self._values["_body"].tolist()):
+            if slot != current:
+                current = slot
+                system = self.universe.get_system(self.table._name_of(slot))
+                bodies = None
+            if k < 0:
+                objects.append(system.star)
+                continue
+            if bodies is None:
+                bodies = [body for body, _ in celestial_bodies(system)]
+            objects.append(bodies[k])
+        return objects
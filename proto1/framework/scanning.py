@@ -0,0 +1,90 @@
+"""
+Batch scanning: many planets at once, the heavy part (heightmaps, anomalies) on a process pool.
+
+Surface seeds are drawn here in the order of the planets, exactly as a loop of
+planet.scan() would draw them, and everything else derives from the seed. A batch
+therefore leaves the planets in the same state as serial scans, in any number of processes.
+"""
+import os
+import random
+import sys
+from multiprocessing import Pool
+
+from .objects.planet import HEIGHTMAP_CACHE, SCAN_SHAPE, generate_heightmap, scan_anomalies
+
+
+def _scan_job(job):
+    index, surface_seed, tiles = job
+    rows, cols = SCAN_SHAPE
+    if tiles is not None:
+        heightmap = tiles.get(surface_seed, rows, cols)
+    else:
+        heightmap = generate_heightmap(rows, cols, surface_seed)
+    return index, scan_anomalies(surface_seed), heightmap
+
+
+def print_progress(done, total, planet):
+    """progress callback writing one updating line to stderr."""
+    sys.stderr.write(f"\rScanned {done}/{total} {planet.name:<24}")
+    if done == total:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+def scan_planets(planets, processes: int = None, progress=None, render: bool = False):
+    """
+    Scans planets and yields each one as soon as its results are in (planets scanned
+    before come first). progress(done, total, planet) is called for every planet,
+    render=True prints each scan report as it arrives, like planet.scan() would.
+    processes=None uses every core, processes=1 runs inline without a pool.
+
+    Results are applied when they arrive, to the live planet (see Object.live: systems of
+    a lazy universe may be evicted meanwhile), which is what is yielded. A planet whose
+    result never came, e.g. the generator was closed early, is left untouched.
+    """
+    planets = list(dict.fromkeys(planets))  # the same planet twice is scanned once
+    total = len(planets)
+    done = 0
+
+    def finished(planet):
+        nonlocal done
+        done += 1
+        if progress is not None:
+            progress(done, total, planet)
+        if render:
+            planet.render_scan()
+        return planet
+
+    pending, seeds = [], []
+    for planet in planets:
+        live = planet.live()
+        if live.has_been_scanned:
+            planet._scan = live._scan
+            yield finished(live)
+        else:
+            pending.append(planet)
+            seeds.append(random.randint(0, 99999999))
+
+    jobs = [(i, seed, HEIGHTMAP_CACHE.tiles) for i, seed in enumerate(seeds)]
+    processes = processes or os.cpu_count()
+    if processes == 1 or len(jobs) <= 1:
+        results = map(_scan_job, jobs)
+        pool = None
+    else:
+        pool = Pool(min(processes, len(jobs)))
+        # Small chunks keep results streaming, large enough to amortize the pickling
+        chunksize = max(1, min(32, len(jobs) // (4 * processes)))
+        results = pool.imap_unordered(_scan_job, jobs, chunksize=chunksize)
+
+    try:
+        for index, anomalies, heightmap in results:
+            held, planet = pending[index], pending[index].live()
+            planet.has_been_scanned = True
+            planet.surface_seed = seeds[index]
+            planet.anomalies = anomalies
+            held._scan = planet._scan
+            HEIGHTMAP_CACHE.put((planet.surface_seed, *SCAN_SHAPE, 1), heightmap)
+            yield finished(planet)
+    finally:
+        if pool is not None:
+            pool.terminate()
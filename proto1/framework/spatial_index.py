@@ -0,0 +1,169 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .utils_class import *
+
+
+def as_points(points):
+    """
+    Accepts a Vec3, a single (x, y, z), a sequence of either or a Vec3Array.
+    Returns an (N, 3) float array and whether a single point was given.
+    """
+    if isinstance(points, Vec3Array):
+        return points.data, False
+    if isinstance(points, Vec3):
+        return np.array([points.to_list()], dtype=np.float64), True
+    if len(points) and isinstance(points[0], Vec3):
+        return np.array([p.to_list() for p in points], dtype=np.float64), False
+
+    array = np.asarray(points, dtype=np.float64)
+    if array.ndim == 1:
+        return array.reshape(1, 3), True
+    return array.reshape(-1, 3), False
+
+
+class SpatialIndex:
+    """
+    k-d tree over system positions, keyed by system name.
+
+    scipy's cKDTree is static, so inserts go to a small pending buffer that is
+    brute forced at query time and removals are tombstoned. The tree is rebuilt
+    once either of them grows past rebuild_ratio of the tree size.
+    All query methods take one point or many, a batch returns one result per point.
+    """
+
+    def __init__(self, keys=(), positions=None, rebuild_ratio: float = 0.1, min_rebuild: int = 256):
+        self.rebuild_ratio = rebuild_ratio
+        self.min_rebuild = min_rebuild
+
+        self._pending = {}  # key -> position, not in the tree yet
+        self._build(list(keys), np.empty((0, 3)) if positions is None else np.asarray(positions, dtype=np.float64))
+
+    def _build(self, keys, positions):
+        self._keys = np.array(keys, dtype=object)
+        self._points = positions.reshape(-1, 3)
+        self._rows = {key: row for row, key in enumerate(keys)}
+        self._alive = np.ones(len(keys), dtype=bool)
+        self._n_dead = 0
+        self._tree = cKDTree(self._points) if len(keys) else None
+
+    def rebuild(self):
+        alive = self._alive
+        keys = self._keys[alive].tolist() + list(self._pending)
+        positions = np.concatenate([self._points[alive], np.array(list(self._pending.values())).reshape(-1, 3)])
+        self._pending = {}
+        self._build(keys, positions)
+
+    def _maybe_rebuild(self):
+        limit = max(self.min_rebuild, self.rebuild_ratio * len(self._keys))
+        if len(self._pending) > limit or self._n_dead > limit:
+            self.rebuild()
+
+    def __len__(self):
+        return len(self._keys) - self._n_dead + len(self._pending)
+
+    def __contains__(self, key):
+        return key in self._pending or key in self._rows
+
+    # ==== Updates ====
+
+    def insert(self, key, position):
+        if key in self:
+            self.remove(key)
+        point, _ = as_points(position)
+        self._pending[key] = point[0]
+        self._maybe_rebuild()
+
+    def remove(self, key):
+        if key in self._pending:
+            del self._pending[key]
+            return
+        row = self._rows.pop(key)
+        self._alive[row] = False
+        self._n_dead += 1
+        self._maybe_rebuild()
+
+    # ==== Queries ====
+
+    def _pending_arrays(self):
+        return list(self._pending), np.array(list(self._pending.values())).reshape(-1, 3)
+
+    def nearest(self, points, k: int = 1):
+        """k nearest keys with their distances, sorted by distance."""
+        points, single = as_points(points)
+        pending_keys, pending_points = self._pending_arrays()
+
+        results = []
+        tree_hits = self._tree_nearest(points, k)
+        for point, (distances, rows) in zip(points, tree_hits):
+            candidates = [(d, self._keys[r]) for d, r in zip(distances, rows)]
+            if pending_keys:
+                pending_distances = np.linalg.norm(pending_points - point, axis=1)
+                candidates += list(zip(pending_distances.tolist(), pending_keys))
+            candidates.sort(key=lambda c: c[0])
+            results.append([(key, distance) for distance, key in candidates[:k]])
+
+        return results[0] if single else results
+
+    def _tree_nearest(self, points, k):
+        n_tree = len(self._keys)
+        if self._tree is None or n_tree == self._n_dead:
+            return [([], [])] * len(points)
+
+        # Tombstones can hide the real neighbours, widen the query until k live ones are found
+        k_query = min(k + min(self._n_dead, k), n_tree)
+        while True:
+            distances, rows = self._tree.query(points, k=k_query)
+            distances = distances.reshape(len(points), -1)
+            rows = rows.reshape(len(points), -1)
+            alive = self._alive[rows]
+            if k_query >= n_tree or alive.sum(axis=1).min() >= k:
+                return [(d[a][:k].tolist(), r[a][:k].tolist()) for d, r, a in zip(distances, rows, alive)]
+            k_query = min(2 * k_query, n_tree)
+
+    def within(self, points, radius: float):
+        """Keys of every position within radius of each point."""
+        points, single = as_points(points)
+        pending_keys, pending_points = self._pending_arrays()
+
+        if self._tree is not None:
+            tree_hits = self._tree.query_ball_point(points, radius)
+        else:
+            tree_hits = [[] for _ in points]
+
+        results = []
+        for point, rows in zip(points, tree_hits):
+            keys = [self._keys[r] for r in rows if self._alive[r]]
+            if pending_keys:
+                close = np.linalg.norm(pending_points - point, axis=1) <= radius
+                keys += [key for key, c in zip(pending_keys, close) if c]
+            results.append(keys)
+
+        return results[0] if single else results
+
+    def in_box(self, low, high):
+        """Keys of every position inside the axis aligned box(es) [low, high]."""
+        low, single = as_points(low)
+        high, _ = as_points(high)
+        pending_keys, pending_points = self._pending_arrays()
+
+        # Chebyshev ball around the box centre covers the box, filter the corners out afterwards
+        centers = (low + high) / 2
+        half_extents = (high - low) / 2
+        if self._tree is not None:
+            tree_hits = self._tree.query_ball_point(centers, half_extents.max(axis=1), p=np.inf)
+        else:
+            tree_hits = [[] for _ in centers]
+
+        results = []
+        for lo, hi, rows in zip(low, high, tree_hits):
+            rows = np.asarray(rows, dtype=np.int64)
+            rows = rows[self._alive[rows]]
+            inside = np.all((self._points[rows] >= lo) & (self._points[rows] <= hi), axis=1)
+            keys = self._keys[rows[inside]].tolist()
+            if pending_keys:
+                inside = np.all((pending_points >= lo) & (pending_points <= hi), axis=1)
+                keys += [key for key, i in zip(pending_keys, inside) if i]
+            results.append(keys)
+
+        return results[0] if single else results
@@ -0,0 +1,407 @@
+"""
+Binary universe file, read through np.memmap.
+
+Layout:
+    b"UNIVERSE" | u32 version | u32 header length | JSON header | padding | sections
+
+Every section is a flat numpy array starting on a 64 byte boundary, the header
+gives its dtype, shape and offset (from the end of the padded header).
+
+    systems            one row per system (id, position, name, first body, body count)
+    stars              one row per system, same order
+    bodies             every planet/moon/subplanet, grouped per system, depth first,
+                       parent is a body index (-1 when orbiting the star)
+    strings            utf-8 blob every name points into (offset, length)
+    system_names       sorted system names, with system_name_order for name -> row
+    player_state       JSON blob: ships and scan results
+    heightmaps         float64 blob of custom heightmaps, generated ones are rebuilt from surface_seed
+
+Opening a file only parses the header, pages are read when a system is touched.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .utils_class import *
+from .objects.star import Star
+from .objects.planet import Planet
+from .objects.ship import Ship
+from .objects.star_system import StarSystem
+from .config import planet as planet_config
+from .system_table import SPECTRAL_CLASSES
+from .exporters import SystemWriter
+
+
+MAGIC = b"UNIVERSE"
+VERSION = 1
+ALIGNMENT = 64
+
+NO_STAR = 255
+
+PLANET_TYPES = list(planet_config.type_properties)
+ATMOSPHERES = list(dict.fromkeys(a for props in planet_config.type_properties.values() for a in props["atmosphere_options"]))
+CORE_COMPOSITIONS = list(dict.fromkeys(props["core_composition"] for props in planet_config.type_properties.values()))
+
+SYSTEM_DTYPE = np.dtype([
+    ("id", "<i8"),
+    ("position", "<f8", (3,)),
+    ("name_offset", "<i8"),
+    ("name_length", "<i4"),
+    ("first_body", "<i8"),
+    ("n_bodies", "<i4"),
+])
+
+STAR_DTYPE = np.dtype([
+    ("id", "<i8"),
+    ("spectral_class", "u1"),
+    ("temperature", "<f8"),
+    ("mass", "<f8"),
+    ("radius", "<f8"),
+    ("luminosity", "<f8"),
+    ("name_offset", "<i8"),
+    ("name_length", "<i4"),
+])
+
+BODY_DTYPE = np.dtype([
+    ("id", "<i8"),
+    ("system", "<i8"),
+    ("parent", "<i8"),
+    ("name_offset", "<i8"),
+    ("name_length", "<i4"),
+    ("planet_type", "u1"),
+    ("is_moon", "?"),
+    ("atmosphere", "u1"),
+    ("core_composition", "u1"),
+    ("orbit_radius", "<f8"),
+    ("mass", "<f8"),
+    ("radius", "<f8"),
+    ("density", "<f8"),
+    ("surface_gravity", "<f8"),
+    ("escape_velocity", "<f8"),
+    ("orbital_period", "<f8"),
+    ("rotation_period", "<f8"),
+    ("temperature", "<f8"),
+])
+
+SPOOLED_SECTIONS = {
+    "systems": SYSTEM_DTYPE,
+    "stars": STAR_DTYPE,
+    "bodies": BODY_DTYPE,
+    "strings": np.dtype("u1"),
+    "heightmaps": np.dtype("<f8"),
+}
+
+
+def _aligned(n):
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+def celestial_bodies(system):
+    """(body, parent) of every planet, moon and subplanet depth first, ships left out."""
+    stack = [(child, None) for child in reversed(system.star.orbit)] if system.star else []
+    while stack:
+        body, parent = stack.pop()
+        if isinstance(body, Ship):
+            continue
+        yield body, parent
+        stack.extend((child, body) for child in reversed(body.orbit))
+
+
+class UniverseWriter(SystemWriter):
+    """
+    Writes systems one at a time, memory use does not grow with the universe.
+    Sections are spooled to temporary files next to the target and stitched together on close.
+
+        with UniverseWriter("universe.bin") as writer:
+            for system in systems:
+                writer.add(system)
+    """
+
+    def __init__(self, path, meta: dict = None):
+        self.path = path
+        self.meta = meta or {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        self._spools = {name: tempfile.TemporaryFile(dir=directory) for name in SPOOLED_SECTIONS}
+        self._counts = dict.fromkeys(SPOOLED_SECTIONS, 0)
+        self._names = []
+        self._player_state = {"ships": [], "scans": []}
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def _append(self, section, array):
+        array = np.ascontiguousarray(array, dtype=SPOOLED_SECTIONS[section])
+        self._spools[section].write(array.tobytes())
+        self._counts[section] += array.size
+
+    def _string(self, text):
+        data = text.encode("utf-8")
+        offset = self._counts["strings"]
+        self._append("strings", np.frombuffer(data, dtype=np.uint8))
+        return offset, len(data)
+
+    def add(self, system):
+        row = len(self._names)
+        self._names.append(system.name)
+
+        first_body = self._counts["bodies"]
+        local = {}  # id(body) -> index inside the system
+        records = []
+        for body, parent in celestial_bodies(system):
+            local[id(body)] = len(records)
+            records.append((
+                body.id, row, -1 if parent is None else first_body + local[id(parent)], *self._string(body.name),
+                PLANET_TYPES.index(body.planet_type), body.is_moon,
+                ATMOSPHERES.index(body.atmosphere), CORE_COMPOSITIONS.index(body.core_composition),
+                body.orbit_radius, body.mass, body.radius, body.density, body.surface_gravity,
+                body.escape_velocity, body.orbital_period, body.rotation_period, body.temperature,
+            ))
+            self._add_player_state(row, len(records) - 1, body)
+        self._append("bodies", np.array(records, dtype=BODY_DTYPE))
+
+        star = system.star
+        if star is not None:
+            self._append("stars", np.array([(
+                star.id, SPECTRAL_CLASSES.index(star.spectral_class), star.temperature,
+                star.mass, star.radius, star.luminosity, *self._string(star.name),
+            )], dtype=STAR_DTYPE))
+            self._add_player_state(row, -1, star)
+        else:
+            self._append("stars", np.array([(0, NO_STAR, 0, 0, 0, 0, 0, 0)], dtype=STAR_DTYPE))
+
+        self._append("systems", np.array([(
+            system.id, system.position.to_list(), *self._string(system.name), first_body, len(records),
+        )], dtype=SYSTEM_DTYPE))
+
+    def _add_player_state(self, row, body, obj):
+        # Ships are listed in display order so loading can rebuild the same order
+        for ship in obj.satellites():
+            if isinstance(ship, Ship):
+                self._player_state["ships"].append({
+                    "system": row, "body": body, "id": ship.id,
+                    "stats": {"name": ship.name, "type": ship.type, "owner": ship.owner, "owner_color": ship.owner_color},
+                })
+
+        if isinstance(obj, Planet) and obj.has_been_scanned:
+            # Generated maps are rebuilt from surface_seed, only custom ones take space
+            heightmap = None
+            if obj.custom_heightmap is not None:
+                heightmap = [self._counts["heightmaps"], *obj.custom_heightmap.shape]
+                self._append("heightmaps", obj.custom_heightmap.ravel())
+            self._player_state["scans"].append({
+                "system": row, "body": body, "surface_seed": obj.surface_seed,
+                "anomalies": obj.anomalies, "heightmap": heightmap,
+            })
+
+    def close(self):
+        names = np.array([name.encode("utf-8") for name in self._names], dtype=bytes)
+        order = np.argsort(names, kind="stable")
+        in_memory = {
+            "system_names": names[order],
+            "system_name_order": order.astype(np.int64),
+            "player_state": np.frombuffer(json.dumps(self._player_state).encode("utf-8"), dtype=np.uint8),
+        }
+
+        sections = {}
+        offset = 0
+        for name, dtype in SPOOLED_SECTIONS.items():
+            sections[name] = {"dtype": np.lib.format.dtype_to_descr(dtype), "shape": [self._counts[name]], "offset": offset}
+            offset = _aligned(offset + self._counts[name] * dtype.itemsize)
+        for name, array in in_memory.items():
+            sections[name] = {"dtype": np.lib.format.dtype_to_descr(array.dtype), "shape": list(array.shape), "offset": offset}
+            offset = _aligned(offset + array.nbytes)
+
+        header = json.dumps({
+            "version": VERSION,
+            "n_systems": len(self._names),
+            "enums": {
+                "spectral_class": SPECTRAL_CLASSES,
+                "planet_type": PLANET_TYPES,
+                "atmosphere": ATMOSPHERES,
+                "core_composition": CORE_COMPOSITIONS,
+            },
+            "meta": self.meta,
+            "sections": sections,
+        }).encode("utf-8")
+
+        # Written under a temporary name first, readers never see a half written file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(np.array([VERSION, len(header)], dtype="<u4").tobytes())
+            f.write(header)
+            data_start = _aligned(f.tell())
+            for name in list(SPOOLED_SECTIONS) + list(in_memory):
+                f.write(b"\0" * (data_start + sections[name]["offset"] - f.tell()))
+                if name in self._spools:
+                    self._spools[name].seek(0)
+                    shutil.copyfileobj(self._spools[name], f)
+                else:
+                    f.write(in_memory[name].tobytes())
+        os.replace(tmp_path, self.path)
+        self._discard()
+
+    def _discard(self):
+        for spool in self._spools.values():
+            spool.close()
+
+
+class UniverseFile:
+    """
+    Read side of the binary format. Sections are memory mapped, so opening is
+    independent of the file size and only the pages of touched systems are read.
+    Implements the table interface LazySystems builds systems from.
+    """
+
+    def __init__(self, path, fleet=None):
+        self.path = path
+        self.fleet = fleet  # saved ships are spawned here, the default fleet when None
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a universe file")
+            version, header_length = np.frombuffer(f.read(8), dtype="<u4")
+            if version > VERSION:
+                raise ValueError(f"{path} uses format version {version}, this reader knows up to {VERSION}")
+            self.header = json.loads(f.read(header_length))
+            data_start = _aligned(f.tell())
+
+        self.sections = {}
+        for name, section in self.header["sections"].items():
+            dtype = np.lib.format.descr_to_dtype(section["dtype"])
+            shape = tuple(section["shape"])
+            if np.prod(shape) == 0:
+                self.sections[name] = np.empty(shape, dtype=dtype)
+            else:
+                self.sections[name] = np.memmap(path, dtype=dtype, mode="r", offset=data_start + section["offset"], shape=shape)
+
+        self.systems = self.sections["systems"]
+        self.stars = self.sections["stars"]
+        self.bodies = self.sections["bodies"]
+        self.strings = self.sections["strings"]
+        self.position = self.systems["position"]
+
+        self.enums = self.header["enums"]
+        self.meta = self.header["meta"]
+        self._player_state = None
+        self._ships_loaded = set()
+
+    def __len__(self):
+        return len(self.systems)
+
+    can_rebuild = True
+
+    def string(self, offset, length):
+        return bytes(self.strings[offset:offset + length]).decode("utf-8")
+
+    def name_of(self, row: int):
+        record = self.systems[row]
+        return self.string(record["name_offset"], record["name_length"])
+
+    def names_of(self, rows):
+        return [self.name_of(row) for row in rows]
+
+    def find(self, name):
+        """Row of a system name by binary search on the sorted name section, None if unknown."""
+        names = self.sections["system_names"]
+        key = name.encode("utf-8")
+        i = int(np.searchsorted(names, key))
+        if i < len(names) and names[i] == key:
+            return int(self.sections["system_name_order"][i])
+        return None
+
+    def describe(self, row: int):
+        star = self.stars[row]
+        spectral_class = None if star["spectral_class"] == NO_STAR else self.enums["spectral_class"][star["spectral_class"]]
+        return self.name_of(row), spectral_class, Vec3(*self.position[row].tolist())
+
+    @property
+    def player_state(self):
+        """Ships and scans grouped by system row, parsed on first use."""
+        if self._player_state is None:
+            state = json.loads(bytes(self.sections["player_state"]).decode("utf-8"))
+            self._player_state = {}
+            for kind in ("ships", "scans"):
+                for entry in state[kind]:
+                    self._player_state.setdefault(entry["system"], {"ships": [], "scans": []})[kind].append(entry)
+        return self._player_state
+
+    def build_system(self, row: int):
+        record = self.systems[row]
+        system = StarSystem(
+            id=int(record["id"]),
+            name=self.string(record["name_offset"], record["name_length"]),
+            position=Vec3(*record["position"].tolist()),
+        )
+
+        star_record = self.stars[row]
+        if star_record["spectral_class"] == NO_STAR:
+            return system
+
+        star = Star(
+            int(star_record["id"]),
+            self.enums["spectral_class"][star_record["spectral_class"]],
+            name=self.string(star_record["name_offset"], star_record["name_length"]),
+            temperature=float(star_record["temperature"]),
+            mass=float(star_record["mass"]),
+            radius=float(star_record["radius"]),
+            luminosity=float(star_record["luminosity"]),
+        )
+        system.star = star
+        system.orbit.append(star)
+
+        first = int(record["first_body"])
+        bodies = []
+        for body in np.array(self.bodies[first:first + int(record["n_bodies"])]):
+            parent = None if body["parent"] < 0 else bodies[body["parent"] - first]
+            planet = Planet.from_properties(
+                int(body["id"]), float(body["orbit_radius"]),
+                name=self.string(body["name_offset"], body["name_length"]),
+                planet_type=self.enums["planet_type"][body["planet_type"]],
+                mass=float(body["mass"]),
+                radius=float(body["radius"]),
+                density=float(body["density"]),
+                surface_gravity=float(body["surface_gravity"]),
+                escape_velocity=float(body["escape_velocity"]),
+                orbital_period=float(body["orbital_period"]),
+                rotation_period=float(body["rotation_period"]),
+                atmosphere=self.enums["atmosphere"][body["atmosphere"]],
+                temperature=float(body["temperature"]),
+                is_moon=bool(body["is_moon"]),
+                parent_planet=parent if body["is_moon"] else None,
+                core_composition=self.enums["core_composition"][body["core_composition"]],
+            )
+            (star if parent is None else parent).orbit.append(planet)
+            bodies.append(planet)
+
+        self._apply_player_state(row, star, bodies)
+        system.reindex()
+        return system
+
+    def _apply_player_state(self, row, star, bodies):
+        state = self.player_state.get(row)
+        if state is None:
+            return
+
+        for scan in state["scans"]:
+            planet = bodies[scan["body"]]
+            planet.has_been_scanned = True
+            planet.surface_seed = scan["surface_seed"]
+            planet.anomalies = scan["anomalies"]
+            if scan["heightmap"] is not None:
+                offset, rows, cols = scan["heightmap"]
+                planet.custom_heightmap = np.array(self.sections["heightmaps"][offset:offset + rows * cols]).reshape(rows, cols)
+
+        # Ships are only created once, afterwards they live in the universe (and its overlays)
+        if row in self._ships_loaded:
+            return
+        self._ships_loaded.add(row)
+        for ship in reversed(state["ships"]):
+            location = star if ship["body"] < 0 else bodies[ship["body"]]
+            Ship(ship["id"], ship["stats"], location, fleet=self.fleet)
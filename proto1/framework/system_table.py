@@ -0,0 +1,376 @@
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+import numpy as np
+
+from .utils_class import *
+from .objects.star import Star
+from .objects.star_system import StarSystem
+from .objects.planet import Planet, SCAN_ATTRIBUTES
+from .objects.ship import Ship
+from .naming import SystemNamer, NAME_SPACE
+
+
+SPECTRAL_CLASSES = ['O', 'B', 'A', 'F', 'G', 'K', 'M']
+
+# Seeded tables are sampled in blocks of this many rows, each block from its own stream
+BLOCK_ROWS = 1 << 16
+
+# Rough resident size of one generated body (Planet + Vec3 + attributes), used to size the system cache
+BODY_BYTES_ESTIMATE = 800
+
+
+def system_seeds(master_seed: int, ids):
+    """Independent stream seed per system, derived from the universe seed and the system id only."""
+    key = splitmix64(np.array([master_seed % 2**64], dtype=np.uint64))
+    return splitmix64(np.asarray(ids, dtype=np.uint64) ^ key)
+
+
+def system_budget(n_systems: int, max_bodies: int = None, max_bodies_per_system: int = None):
+    """
+    Body budget of each system from a universe wide and/or a per system one, None for no limit.
+    The universe budget is split evenly so a system's budget never depends on the others.
+    """
+    budgets = [budget for budget in (max_bodies_per_system, max_bodies // max(1, n_systems) if max_bodies is not None else None)
+               if budget is not None]
+    return min(budgets) if budgets else None
+
+
+class SystemTable:
+    """
+    Struct-of-arrays storage for the system level attributes of a universe.
+    One row per system, every column is a flat numpy array.
+    """
+
+    def __init__(self, n_systems: int, namer: SystemNamer, seeded: bool = False, first_id: int = 0):
+        if first_id + n_systems > NAME_SPACE:
+            raise ValueError(f"At most {NAME_SPACE} systems can be named")
+
+        # Names are a keyed bijection of the id, no name column is stored
+        self.namer = namer
+        self.id = np.arange(first_id, first_id + n_systems, dtype=np.int64)
+        self.position = np.zeros((n_systems, 3), dtype=np.float64)
+        self.n_planets = np.zeros(n_systems, dtype=np.int32)
+
+        # Star columns, spectral class stored as an index into SPECTRAL_CLASSES
+        self.spectral_class = np.zeros(n_systems, dtype=np.uint8)
+        self.star_temperature = np.zeros(n_systems, dtype=np.float64)
+        self.star_mass = np.zeros(n_systems, dtype=np.float64)
+        self.star_radius = np.zeros(n_systems, dtype=np.float64)
+        self.star_luminosity = np.zeros(n_systems, dtype=np.float64)
+
+        # Seed of each system's own random stream, None when the planets come from the global state
+        self.seed = np.zeros(n_systems, dtype=np.uint64) if seeded else None
+
+        # Most bodies a built system may have (star included), None for no limit
+        self.max_bodies = None
+
+    def __len__(self):
+        return len(self.id)
+
+    @property
+    def seeded(self):
+        return self.seed is not None
+
+    @property
+    def can_rebuild(self):
+        """Whether a built system can be dropped and built again identically."""
+        return self.seeded
+
+    def find(self, name):
+        """Row of a system name, None if unknown. Inverts the name permutation, nothing is stored."""
+        system_id = self.namer.index_of(name)
+        if system_id is None:
+            return None
+        row = system_id - int(self.id[0]) if len(self) else -1
+        return row if 0 <= row < len(self) else None
+
+    def name_of(self, row: int):
+        return self.namer.name(int(self.id[row]))
+
+    def names_of(self, rows):
+        return self.namer.names(self.id[rows]).tolist()
+
+    @property
+    def name(self):
+        """Names of every row, built on demand."""
+        return self.namer.names(self.id)
+
+    def describe(self, row: int):
+        """(name, spectral class, position) of a row, what Universe.info prints."""
+        return self.name_of(row), SPECTRAL_CLASSES[self.spectral_class[row]], Vec3(*self.position[row].tolist())
+
+    def columns(self):
+        return {name: column for name, column in vars(self).items() if isinstance(column, np.ndarray) and not name.startswith("_")}
+
+    def slice(self, start: int, stop: int):
+        """Table over rows [start, stop), the columns are views."""
+        table = SystemTable.__new__(SystemTable)
+        table.namer = self.namer
+        table.seed = None
+        table.max_bodies = self.max_bodies
+        for name, column in self.columns().items():
+            setattr(table, name, column[start:stop])
+        return table
+
+    @classmethod
+    def sample(cls, n_systems: int, poisson_lambda: float, seed: int = None, max_bodies: int = None):
+        """
+        Samples every system level attribute in one vectorized pass.
+        With a seed the table, and every system built from it, is fully reproducible:
+        rows are sampled in fixed blocks of BLOCK_ROWS, each from its own stream, so
+        sample() and iter_blocks() give the same rows.
+        max_bodies is the body budget of every system built from the table.
+        """
+        if seed is None:
+            table = cls(n_systems, SystemNamer(np.random.randint(0, 2**63, dtype=np.int64)))
+            table._fill(np.random, np.random.randint, poisson_lambda)
+            table.max_bodies = max_bodies
+            return table
+
+        table = cls(n_systems, cls.seeded_namer(seed), seeded=True)
+        table.max_bodies = max_bodies
+        for start in range(0, n_systems, BLOCK_ROWS):
+            table.slice(start, start + BLOCK_ROWS)._fill_seeded(seed, poisson_lambda)
+        return table
+
+    @classmethod
+    def iter_blocks(cls, n_systems: int, poisson_lambda: float, seed: int, max_bodies: int = None):
+        """The rows of sample(n_systems, poisson_lambda, seed, max_bodies), one block table at a time."""
+        namer = cls.seeded_namer(seed)
+        for start in range(0, n_systems, BLOCK_ROWS):
+            table = cls(min(BLOCK_ROWS, n_systems - start), namer, seeded=True, first_id=start)
+            table.max_bodies = max_bodies
+            table._fill_seeded(seed, poisson_lambda)
+            yield table
+
+    @staticmethod
+    def seeded_namer(seed: int):
+        return SystemNamer(int(system_seeds(seed, [NAME_SPACE])[0]))
+
+    def _fill_seeded(self, seed, poisson_lambda):
+        rng = np.random.default_rng([seed % 2**64, int(self.id[0]) // BLOCK_ROWS])
+        self.seed[:] = system_seeds(seed, self.id)
+        self._fill(rng, rng.integers, poisson_lambda)
+
+    def _fill(self, rng, integers, poisson_lambda):
+        n_systems = len(self)
+        self.position[:] = rng.random((n_systems, 3))
+        self.n_planets[:] = np.maximum(1, rng.poisson(poisson_lambda, size=n_systems))
+        self.spectral_class[:] = integers(0, len(SPECTRAL_CLASSES), size=n_systems)
+
+        # Per class (min, max) lookup arrays, indexed by the spectral class column
+        for column, ranges in (
+            (self.star_temperature, Star.SPECTRAL_TEMPERATURE_RANGES),
+            (self.star_mass, Star.SPECTRAL_MASS_RANGES),
+            (self.star_radius, Star.SPECTRAL_RADIUS_RANGES),
+            (self.star_luminosity, Star.SPECTRAL_LUMINOSITY_RANGES),
+        ):
+            low = np.array([ranges[c][0] for c in SPECTRAL_CLASSES], dtype=np.float64)[self.spectral_class]
+            high = np.array([ranges[c][1] for c in SPECTRAL_CLASSES], dtype=np.float64)[self.spectral_class]
+            column[:] = np.round(rng.uniform(low, high), 2)
+
+    def build_star(self, row: int):
+        spectral_class = SPECTRAL_CLASSES[self.spectral_class[row]]
+        return Star(
+            int(self.id[row]) * 10,
+            spectral_class,
+            name=f"{spectral_class}-{self.name_of(row)}",
+            temperature=float(self.star_temperature[row]),
+            mass=float(self.star_mass[row]),
+            radius=float(self.star_radius[row]),
+            luminosity=float(self.star_luminosity[row]),
+        )
+
+    def build_system(self, row: int):
+        """
+        Materializes the full StarSystem for one row, planets are generated at this point.
+        Seeded rows give the same body tree every time they are built.
+        """
+        return self.build_systems([row])[0]
+
+    def build_systems(self, rows):
+        """build_system for many rows, their planets sampled together (see StarSystem.generate_many)."""
+        systems = [
+            StarSystem(id=int(self.id[row]), name=self.name_of(row), position=Vec3View(self.position, row))
+            for row in rows
+        ]
+        StarSystem.generate_many(
+            systems,
+            [int(self.n_planets[row]) for row in rows],
+            stars=[self.build_star(row) for row in rows],
+            rngs=[Rng(int(self.seed[row])) if self.seeded else None for row in rows],
+            max_bodies=self.max_bodies,
+        )
+        return systems
+
+
+class LazySystems(MutableMapping):
+    """
+    name -> StarSystem mapping over a system table (SystemTable, or an opened UniverseFile).
+    Systems are built the first time they are accessed. Systems added later live
+    next to the table, removed rows are only marked as such.
+
+    When the table can rebuild its systems (seeded or on disk) the built systems sit in
+    an LRU cache bounded by max_systems and/or max_bytes, evicted ones are built again
+    when touched. Player state that cannot be regenerated (ships, scan results) is kept
+    as an overlay when a system is evicted and put back on the rebuilt one.
+    """
+
+    def __init__(self, table, max_systems: int = None, max_bytes: int = None, fleet=None):
+        if (max_systems is not None or max_bytes is not None) and not table.can_rebuild:
+            raise ValueError("Only systems of a seeded or stored table can be evicted and rebuilt")
+
+        self.table = table
+        self.max_systems = max_systems
+        self.max_bytes = max_bytes
+        self.fleet = fleet  # given to the systems built, see StarSystem.fleet
+
+        self._removed = set()
+        self._built = OrderedDict()  # row -> StarSystem, least recently used first
+        self._built_bytes = {}
+        self._cached_bytes = 0
+        self._overlays = {}  # row -> player state of an evicted system
+        self._extra = {}
+
+    def _row(self, name):
+        row = self.table.find(name)
+        if row is None or row in self._removed:
+            raise KeyError(name)
+        return row
+
+    def rows(self):
+        """Rows of the table still in the universe."""
+        rows = np.arange(len(self.table))
+        if self._removed:
+            rows = np.setdiff1d(rows, np.fromiter(self._removed, dtype=np.int64))
+        return rows
+
+    @property
+    def extra(self):
+        """Systems added on top of the table, name -> StarSystem."""
+        return self._extra
+
+    def __getitem__(self, name):
+        if name in self._extra:
+            return self._extra[name]
+        row = self._row(name)
+
+        system = self._built.get(row)
+        if system is not None:
+            self._built.move_to_end(row)
+            return system
+
+        system = self.table.build_system(row)
+        system.fleet = self.fleet
+        overlay = self._overlays.pop(row, None)
+        if overlay:
+            restore_overlay(system, overlay)
+
+        self._built[row] = system
+        self._built_bytes[row] = BODY_BYTES_ESTIMATE * sum(1 for _ in system.walk())
+        self._cached_bytes += self._built_bytes[row]
+        self._evict()
+        return system
+
+    def _evict(self):
+        while len(self._built) > 1 and (
+            (self.max_systems is not None and len(self._built) > self.max_systems)
+            or (self.max_bytes is not None and self._cached_bytes > self.max_bytes)
+        ):
+            row, system = self._built.popitem(last=False)
+            self._cached_bytes -= self._built_bytes.pop(row)
+            system.evicted_from = self  # ships sent to its bodies go to the rebuilt ones
+            overlay = capture_overlay(system)
+            if overlay:
+                self._overlays[row] = overlay
+
+    @property
+    def cached(self):
+        """Number of systems currently built."""
+        return len(self._built)
+
+    @property
+    def cached_bytes(self):
+        return self._cached_bytes
+
+    def built(self):
+        """The systems currently in memory: built rows and added systems. Builds nothing."""
+        yield from self._built.values()
+        yield from self._extra.values()
+
+    def __setitem__(self, name, system):
+        if name in self:
+            del self[name]
+        self._extra[name] = system
+
+    def __delitem__(self, name):
+        if name in self._extra:
+            del self._extra[name]
+            return
+        row = self._row(name)
+        self._removed.add(row)
+        self._overlays.pop(row, None)
+        if row in self._built:
+            del self._built[row]
+            self._cached_bytes -= self._built_bytes.pop(row)
+
+    def __iter__(self):
+        # Names are produced a block at a time, the table may not store them
+        for start in range(0, len(self.table), 4096):
+            rows = np.arange(start, min(start + 4096, len(self.table)))
+            if self._removed:
+                rows = rows[~np.isin(rows, np.fromiter(self._removed, dtype=np.int64))]
+            yield from self.table.names_of(rows)
+        yield from self._extra
+
+    def __len__(self):
+        return len(self.table) - len(self._removed) + len(self._extra)
+
+    def __contains__(self, name):
+        if name in self._extra:
+            return True
+        row = self.table.find(name)
+        return row is not None and row not in self._removed
+
+
+def capture_overlay(system):
+    """
+    Player state of a system that regeneration would lose: removed bodies, ships and scan
+    results. Returns (names given to remove_object in order, {body name: (body, ships, scan)}
+    for the bodies that have any), None if there is nothing to keep.
+    """
+    overlay = {}
+    for body in system.walk():
+        if isinstance(body, Ship):
+            continue
+        ships = [child for child in body.satellites() if isinstance(child, Ship)]
+        scan = None
+        if isinstance(body, Planet) and body.has_been_scanned:
+            scan = {attribute: getattr(body, attribute) for attribute in SCAN_ATTRIBUTES}
+        if ships or scan:
+            overlay[body.name] = (body, ships, scan)
+    if not overlay and not system.removed:
+        return None
+    return list(system.removed), overlay
+
+
+def restore_overlay(system, overlay):
+    removed, overlay = overlay
+    # Same generation, same removals in the same order: the same bodies go (names can repeat)
+    for name in removed:
+        system.remove_object(name)
+    for body in list(system.walk()):
+        if body.name not in overlay:
+            continue
+        old_body, ships, scan = overlay[body.name]
+
+        # Ships that moved away while the system was evicted no longer belong here
+        ships = [ship for ship in ships if ship.current_location is old_body]
+        for ship in reversed(ships):  # oldest first, so they display in the same order
+            ship.fleet.move([ship], body)
+
+        if scan:
+            for attribute, value in scan.items():
+                setattr(body, attribute, value)
+    system.reindex()
@@ -0,0 +1,153 @@
+"""
+On-disk heightmap cache, for maps too large to regenerate on every use.
+
+Every map is one file named after its full key: surface seed, resolution, octaves,
+GENERATOR_VERSION and quantization, e.g. 1234_4096x8192_o8_v1_u16.npy. Maps are stored
+quantized to uint8/uint16, as .npy files read back through np.memmap, or compressed
+.npz files (smaller, read fully). Files are written under a temporary name and renamed
+into place, so concurrent readers (other processes included) see either nothing or a
+complete file. Bumping GENERATOR_VERSION changes every key, old files are never read again
+and age out through the size based eviction.
+"""
+import os
+import tempfile
+import tokenize
+import zipfile
+import zlib
+
+import numpy as np
+
+from .objects.planet import generate_heightmap
+
+
+# Bump whenever generate_heightmap changes its output for a given seed
+GENERATOR_VERSION = 1
+
+QUANTIZED_DTYPES = {8: np.uint8, 16: np.uint16}
+
+# What np.load raises on a missing, truncated or corrupt file (a garbled .npy header,
+# a broken zip or deflate stream), all of them a cache miss
+UNREADABLE_FILE_ERRORS = (OSError, ValueError, KeyError, EOFError, SyntaxError, NotImplementedError,
+                          tokenize.TokenError, zipfile.BadZipFile, zlib.error)
+
+
+def quantize(heightmap, bits=16):
+    top = np.iinfo(QUANTIZED_DTYPES[bits]).max
+    return np.round(np.clip(heightmap, 0.0, 1.0) * top).astype(QUANTIZED_DTYPES[bits])
+
+
+def dequantize(quantized):
+    return quantized.astype(np.float32) / np.float32(np.iinfo(quantized.dtype).max)
+
+
+class TileCache:
+    """
+    Directory of quantized heightmaps bounded by max_bytes, least recently used files are
+    removed first. Misses generate the map and store it.
+
+        tiles = TileCache("cache/heightmaps", max_bytes=2**30)
+        heightmap = tiles.get(planet.surface_seed, 4096, 8192, octaves=8)
+    """
+
+    def __init__(self, directory, max_bytes: int = 2**30, bits: int = 16, compress: bool = False):
+        if bits not in QUANTIZED_DTYPES:
+            raise ValueError(f"bits must be one of {list(QUANTIZED_DTYPES)}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.bits = bits
+        self.compress = compress
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, surface_seed, rows, cols, octaves=1):
+        extension = "npz" if self.compress else "npy"
+        name = f"{surface_seed}_{rows}x{cols}_o{octaves}_v{GENERATOR_VERSION}_u{self.bits}.{extension}"
+        return os.path.join(self.directory, name)
+
+    def get(self, surface_seed, rows, cols, octaves=1):
+        """Heightmap in [0, 1] as float32, from the cache or generated and stored."""
+        return dequantize(self.get_quantized(surface_seed, rows, cols, octaves))
+
+    def get_quantized(self, surface_seed, rows, cols, octaves=1):
+        """
+        The stored uint8/uint16 map. Uncompressed entries come back memory mapped, so
+        a band of a large map only reads its own pages.
+        """
+        path = self.path(surface_seed, rows, cols, octaves)
+        quantized = self._load(path, (rows, cols))
+        if quantized is None:
+            quantized = quantize(generate_heightmap(rows, cols, surface_seed, octaves), self.bits)
+            self._store(path, quantized)
+        return quantized
+
+    def _load(self, path, shape):
+        try:
+            if self.compress:
+                with np.load(path) as archive:
+                    quantized = archive["heightmap"]
+            else:
+                quantized = np.load(path, mmap_mode="r")
+        except UNREADABLE_FILE_ERRORS:
+            return None
+
+        # Never hand out a file that does not match its key
+        if quantized.shape != shape or quantized.dtype != QUANTIZED_DTYPES[self.bits]:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # recency for the eviction
+        except OSError:
+            pass
+        return quantized
+
+    def _store(self, path, quantized):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=os.path.splitext(path)[1])
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if self.compress:
+                    np.savez_compressed(f, heightmap=quantized)
+                else:
+                    np.save(f, quantized)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict(keep=path)
+
+    def entries(self):
+        """(mtime, size, path) of every cached map, oldest first."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith(".tmp-"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # removed by another process meanwhile
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    @property
+    def nbytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """Removes the least recently used maps until the directory fits in max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path != keep and self._remove(path):
+                total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        # Readers that already mapped the file keep their pages, the name just goes away
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
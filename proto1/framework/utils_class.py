@@ -1,6 +1,12 @@
 import math
+import random
+
+import numpy as np
+from scipy.spatial.distance import cdist
 
 class Vec3:
+    __slots__ = ("x", "y", "z")
+
     def __init__(self, x, y, z):
         self.x = x
         self.y = y
@@ -9,6 +15,11 @@ class Vec3:
     def __repr__(self):
         return f"Vec3({self.x}, {self.y}, {self.z})"
 
+    def __setstate__(self, state):
+        # (None, slots), or a plain __dict__ in pickles from before the slots
+        for name, value in (state[1] if isinstance(state, tuple) else state).items():
+            setattr(self, name, value)
+
     def to_list(self):
         return [self.x, self.y, self.z]
 
@@ -36,3 +47,239 @@ class Vec3:
         cos_theta = self.cos_angle_with(other)
         angle = math.acos(cos_theta)
         return math.degrees(angle) if degrees else angle
+
+
+class Vec3View(Vec3):
+    """Vec3 over one row of an (N, 3) array: reads and writes go to the array, nothing is copied."""
+    __slots__ = ("_data", "_row")
+
+    # Arrays up to this many rows are pickled whole, so the views of a chunk of systems
+    # (parallel.generate_systems, 256 rows by default) still share one array once unpickled:
+    # 35 pickled and 106 resident bytes per view, against 65 and 232 with a 1-row array each
+    # (benchmarks/bench_vec3.py). The whole array costs 24 bytes per row even when a single
+    # view is pickled, so views into bigger arrays, a universe's position column, only take
+    # their own row along. 4096 bounds that to 96 KiB and covers chunk_size up to 4096.
+    SHARED_PICKLE_ROWS = 4096
+
+    def __init__(self, data, row):
+        self._data = data
+        self._row = row
+
+    def __reduce__(self):
+        if len(self._data) <= Vec3View.SHARED_PICKLE_ROWS:
+            return Vec3View, (self._data, self._row)
+        return Vec3View, (self._data[self._row:self._row + 1].copy(), 0)
+
+    def _component(axis):
+        def get(self):
+            return float(self._data[self._row, axis])
+
+        def set(self, value):
+            self._data[self._row, axis] = value
+
+        return property(get, set)
+
+    x = _component(0)
+    y = _component(1)
+    z = _component(2)
+    del _component
+
+    def to_list(self):
+        return self._data[self._row].tolist()
+
+
+def _vectors(value):
+    """Vec3, Vec3Array or anything numpy takes as an array of (..., 3) vectors."""
+    if isinstance(value, Vec3Array):
+        return value.data
+    if isinstance(value, Vec3):
+        return np.array(value.to_list(), dtype=np.float64)
+    return np.asarray(value, dtype=np.float64)
+
+
+class Vec3Array:
+    """
+    N vectors as one (N, 3) float64 array, the batched counterpart of Vec3. Methods work
+    row-wise and broadcast against a single Vec3, e.g. stars.distance_to(ship.position).
+    An existing (N, 3) float64 array is wrapped without a copy, and indexing a row gives a
+    Vec3View into it, so positions can be shared with a table column.
+    """
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[1] != 3:
+            data = data.reshape(-1, 3)
+        self.data = data
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        return cls(np.array([v.to_list() for v in vectors], dtype=np.float64).reshape(-1, 3))
+
+    @classmethod
+    def zeros(cls, n):
+        return cls(np.zeros((n, 3)))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Vec3View(self.data, int(index) % len(self.data))
+        return Vec3Array(self.data[index])  # slices stay views, masks and index arrays copy
+
+    def __setitem__(self, index, value):
+        self.data[index] = _vectors(value)
+
+    def __iter__(self):
+        return (Vec3View(self.data, row) for row in range(len(self.data)))
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype)
+
+    def __repr__(self):
+        return f"Vec3Array({len(self)} vectors)"
+
+    def to_list(self):
+        return self.data.tolist()
+
+    @property
+    def x(self):
+        return self.data[:, 0]
+
+    @property
+    def y(self):
+        return self.data[:, 1]
+
+    @property
+    def z(self):
+        return self.data[:, 2]
+
+    # ==== Arithmetic, broadcasting against a Vec3, a Vec3Array or scalars
+
+    def __add__(self, other):
+        return Vec3Array(self.data + _vectors(other))
+
+    def __sub__(self, other):
+        return Vec3Array(self.data - _vectors(other))
+
+    def __rsub__(self, other):
+        return Vec3Array(_vectors(other) - self.data)
+
+    def __mul__(self, other):
+        return Vec3Array(self.data * _column(other))
+
+    def __truediv__(self, other):
+        return Vec3Array(self.data / _column(other))
+
+    def __neg__(self):
+        return Vec3Array(-self.data)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    # ==== Vector math, one value per row
+
+    def norm(self):
+        return np.sqrt(np.einsum("ij,ij->i", self.data, self.data))
+
+    def dot(self, other):
+        other = _vectors(other)
+        return self.data @ other if other.ndim == 1 else np.einsum("ij,ij->i", self.data, other)
+
+    def cross(self, other):
+        return Vec3Array(np.cross(self.data, _vectors(other)))
+
+    def cos_angle_with(self, other):
+        norms = self.norm() * (np.linalg.norm(_vectors(other), axis=-1))
+        if np.any(norms == 0):
+            raise ValueError("Cannot compute angle with zero-length vector")
+        return np.clip(self.dot(other) / norms, -1.0, 1.0)  # clip to avoid domain errors
+
+    def angle_with(self, other, degrees=False):
+        angle = np.arccos(self.cos_angle_with(other))
+        return np.degrees(angle) if degrees else angle
+
+    def distance_to(self, other):
+        """Distance of every row to one point, or row by row to another Vec3Array."""
+        difference = self.data - _vectors(other)
+        return np.sqrt(np.einsum("ij,ij->i", difference, difference))
+
+    def pairwise_distances(self, other=None):
+        """(N, M) distances between every row and every row of other (self when None)."""
+        return cdist(self.data, self.data if other is None else _vectors(other).reshape(-1, 3))
+
+
+def _column(value):
+    """Scalars as they are, one scalar per row as an (N, 1) column."""
+    value = np.asarray(value, dtype=np.float64)
+    return value[:, None] if value.ndim == 1 else value
+
+
+def splitmix64(x):
+    """splitmix64 finalizer on a uint64 array, a cheap vectorized integer hash."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class Rng(random.Random):
+    """
+    Random stream handed to the generators: the `random.Random` API plus poisson,
+    and a numpy Generator (`rng.np`) split off the same stream for array draws.
+    Two Rng built from the same seed produce the same objects.
+    """
+
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self._np = None
+
+    @property
+    def np(self):
+        if self._np is None:
+            self._np = np.random.default_rng(self.getrandbits(64))
+        return self._np
+
+    def poisson(self, lam, size=None):
+        if size is not None or lam > 30:
+            return self.np.poisson(lam, size)
+
+        # Knuth's method, cheap for the small lambdas used by the generators
+        limit = math.exp(-lam)
+        k = 0
+        p = self.random()
+        while p > limit:
+            k += 1
+            p *= self.random()
+        return k
+
+
+class GlobalRng:
+    """Same interface on top of the process-global `random` / `np.random` state, the default everywhere."""
+
+    np = np.random
+
+    def random(self):
+        return random.random()
+
+    def uniform(self, a, b):
+        return random.uniform(a, b)
+
+    def randint(self, a, b):
+        return random.randint(a, b)
+
+    def choice(self, seq):
+        return random.choice(seq)
+
+    def choices(self, population, weights=None, k=1):
+        return random.choices(population, weights=weights, k=k)
+
+    def sample(self, population, k):
+        return random.sample(population, k=k)
+
+    def poisson(self, lam, size=None):
+        return np.random.poisson(lam, size)
+
+
+GLOBAL_RNG = GlobalRng()
@@ -1,4 +1,5 @@
 import framework as fr
+from framework.memory import public_attributes
 import numpy as np
 
 
@@ -20,12 +21,14 @@ planet.scan()
 print(planet)
 
 
+# Heightmaps are not in __dict__: a scanned planet only keeps surface_seed
+# and planet.heightmap rebuilds the map from it
 def to_serializable(obj):
     data = {}
-    for k, v in obj.__dict__.items():
+    for k, v in public_attributes(obj).items():  # the model classes use __slots__, not __dict__
         if isinstance(v, np.ndarray):
             data[k] = v.tolist()  # Convert to nested lists
-        elif hasattr(v, "__dict__"):
+        elif hasattr(v, "__dict__") or hasattr(v, "__slots__"):
             data[k] = to_serializable(v)
         elif isinstance(v, (list, dict, str, int, float, bool)) or v is None:
             data[k] = v
@@ -41,7 +44,7 @@ data = json.dumps(serial, indent=2)
 # print(data)
 
 # import matplotlib.pyplot as plt
-# plt.imshow(serial["heightmap"])
+# plt.imshow(planet.heightmap)
 # plt.show()
 # =============================== StarSysem creation
 # ss = fr.StarSystem(1, name="HIP-2234")
@@ -74,16 +77,12 @@ data = json.dumps(serial, indent=2)
 #     p2 = ss2.get_object(ss2.name+"-I")
 
 #     # Save
-#     import pickle
-#     with open("universe.pkl", "wb") as f:
-#         pickle.dump(universe, f)
+#     universe.save("universe.bin")
 
 
 # elif action == "load":
-#     import pickle
-#     with open("universe.pkl", "rb") as f:
-#         universe2 = pickle.load(f)
-#         universe2.info()
+#     universe2 = fr.Universe.open("universe.bin")
+#     universe2.info()
 #     ss2 = universe2.systems[next(iter(universe2.systems))]
 #     ss2.display()
     # p2 = ss2.get_object(ss2.name+"-I")
@@ -0,0 +1,71 @@
+"""
+Frame rate of SolarSystem.animate on solar_system.json, rendered with Agg through
+FuncAnimation's own frame path (_draw_next_frame), with and without blitting, against
+frames rebuilt from scratch like display() does. Also checks that a blitted frame looks
+like a fully drawn one.
+
+    python benchmarks/bench_animation.py [n_frames]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from framework.objects import SolarSystem
+
+
+def fps(label, draw_frame, n_frames):
+    start = time.perf_counter()
+    for frame in range(n_frames):
+        draw_frame(frame)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {n_frames / elapsed:8.1f} fps")
+
+
+def started(animation):
+    """What the first draw event does for an animation shown on screen."""
+    animation._init_draw()
+    animation._fig.canvas.draw()
+    return animation
+
+
+def pixels(animation):
+    return np.asarray(animation._fig.canvas.buffer_rgba()).copy()
+
+
+if __name__ == "__main__":
+    n_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    system = SolarSystem.from_json(os.path.join(ROOT, "solar_system.json"))
+    ages = np.linspace(0.0, 2.0, n_frames)
+    print(f"{len(system.bodies())} bodies, {n_frames} frames\n")
+
+    start = time.perf_counter()
+    full = started(system.animate(ages, blit=False, show=False))
+    print(f"{'animate() setup':<44} {(time.perf_counter() - start) * 1e3:8.1f} ms")
+    fps("animate(blit=False)", lambda frame: full._draw_next_frame(frame, blit=False), n_frames)
+
+    blitted = started(system.animate(ages, blit=True, show=False))
+    fps("animate(blit=True)", lambda frame: blitted._draw_next_frame(frame, blit=True), n_frames)
+
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_subplot(111, projection="3d")
+    def rebuilt(frame):
+        ax.cla()
+        system._display_compiled(ax, ages[frame])
+        ax.legend()
+        fig.canvas.draw()
+    fps("rebuilt every frame (display style)", rebuilt, n_frames)
+
+    # Same frame blitted and fully drawn
+    frame = n_frames // 2
+    full._draw_next_frame(frame, blit=False)
+    blitted._draw_next_frame(frame, blit=True)
+    differing = np.count_nonzero(np.any(pixels(full) != pixels(blitted), axis=-1))
+    print(f"\npixels differing between a blitted and a full frame: {differing}")
@@ -0,0 +1,67 @@
+"""
+Kepler solver: solves per second, accuracy of the eccentric anomaly per eccentricity and
+number of Halley steps (against bisection), then physically timed positions for
+solar_system.json checked against Planet.get_position(kepler=True).
+
+    python benchmarks/bench_kepler.py [n_solves]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from framework.common.kepler import solve_kepler
+from framework.objects import SolarSystem
+
+ECCENTRICITIES = (0.0, 0.1, 0.5, 0.9, 0.99, 0.999, 0.999999)
+
+
+def bisection(M, e, steps=80):
+    """Reference E for M in [-pi, pi], slow but cannot miss."""
+    m = np.abs(M)
+    lo, hi = np.zeros_like(m), np.full_like(m, np.pi)
+    for _ in range(steps):
+        mid = (lo + hi) / 2
+        below = mid - e * np.sin(mid) < m
+        lo, hi = np.where(below, mid, lo), np.where(below, hi, mid)
+    return np.copysign((lo + hi) / 2, M)
+
+
+if __name__ == "__main__":
+    n_solves = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    M = rng.uniform(-np.pi, np.pi, n_solves)
+    e = rng.uniform(0.0, 0.999, n_solves)
+
+    for iterations in (0, 1, 2, 3):
+        start = time.perf_counter()
+        solve_kepler(M, e, iterations)
+        elapsed = time.perf_counter() - start
+        print(f"{iterations} Halley steps {n_solves / elapsed:14,.0f} solves/s")
+
+    # Near perihelion is where high eccentricities are hard, sample it densely
+    M = np.concatenate([rng.uniform(-np.pi, np.pi, 200_000), np.geomspace(1e-12, 1e-1, 10_000)])
+    print(f"\nmax |E - E_ref| (rad)\n{'e':>10}" + "".join(f"{f'{i} steps':>10}" for i in (0, 1, 2, 3)))
+    for ecc in ECCENTRICITIES:
+        reference = bisection(M, ecc)
+        errors = [np.abs(solve_kepler(M, ecc, i) - reference).max() for i in (0, 1, 2, 3)]
+        print(f"{ecc:>10}" + "".join(f"{error:>10.1e}" for error in errors))
+
+    # ======= Timed positions of the solar system
+    system = SolarSystem.from_json(os.path.join(ROOT, "solar_system.json"))
+    ages = np.linspace(0.0, 100.0, 10_000)  # years since creation_date
+    start = time.perf_counter()
+    positions = system.positions(ages, kepler=True)
+    elapsed = time.perf_counter() - start
+    print(f"\n{positions.shape[0]} bodies x {len(ages)} ages {positions[..., 0].size / elapsed:14,.0f} positions/s")
+
+    row = {body.name: i for i, body in enumerate(system.bodies())}["Mercury"]
+    mercury = system.bodies()[row]
+    reference = np.array([mercury.get_position(age, kepler=True) for age in ages[:1000]])
+    around_sun = positions[row, :1000] - positions[0, :1000]
+    print(f"Mercury against get_position(kepler=True): max difference {np.abs(around_sun - reference).max():.1e} au")
+    print(f"not finite: {np.count_nonzero(~np.isfinite(positions))}")
@@ -0,0 +1,63 @@
+"""
+Orbit polylines for solar_system.json: points per redraw with the old fixed 500 against
+adaptive sampling, then redraw time at new ages with a cold and a warm orbit cache.
+
+    python benchmarks/bench_orbits.py [n_redraws]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from framework.objects import SolarSystem, orbit_samples
+
+
+def geometry(system, ax, cached):
+    """Orbit polylines of one redraw, regenerated like before or from the cache."""
+    table = system.compile()
+    if not cached:
+        return [planet._generate_orbit() for planet in table.bodies]
+    num_points = orbit_samples(table.a, table.e, system._screen_scale(ax))
+    return [planet.orbit_points(n) for planet, n in zip(table.bodies, num_points)]
+
+
+def redraw(system, ax, age):
+    ax.cla()
+    system._display_compiled(ax, age)
+    ax.figure.canvas.draw()
+
+
+if __name__ == "__main__":
+    n_redraws = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    system = SolarSystem.from_json(os.path.join(ROOT, "solar_system.json"))
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_subplot(111, projection="3d")
+
+    table = system.compile()
+    num_points = orbit_samples(table.a, table.e, system._screen_scale(ax))
+    print(f"{len(table)} bodies, {500 * len(table)} orbit points fixed, {num_points.sum()} adaptive")
+
+    for label, cached in (("regenerated, 500 points", False), ("cached, adaptive", True)):
+        start = time.perf_counter()
+        for _ in range(200):
+            geometry(system, ax, cached)
+        print(f"{'orbit geometry, ' + label:<40} {(time.perf_counter() - start) / 200 * 1e3:8.3f} ms/redraw")
+
+    for label in ("cold cache", "warm cache"):
+        if label == "cold cache":
+            for planet in table.bodies:
+                planet._orbit_cache.clear()
+        start = time.perf_counter()
+        redraw(system, ax, 0.0)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for age in np.linspace(0.0, 1.0, n_redraws):
+            redraw(system, ax, age)
+        print(f"{'full redraw (Agg), ' + label:<40} {first * 1e3:8.1f} ms first, {(time.perf_counter() - start) / n_redraws * 1e3:8.1f} ms next")
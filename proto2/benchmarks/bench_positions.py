@@ -0,0 +1,63 @@
+"""
+Trajectory sampling for solar_system.json: get_position per body and per age, summed
+down the hierarchy like display() used to, against one SolarSystem.positions(ages) call.
+Then what keeping the compiled OrbitTable up to date costs.
+
+    python benchmarks/bench_positions.py [n_ages]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from framework.objects import SolarSystem
+
+
+def per_call(system, ages):
+    """(n_bodies, n_ages, 3) the slow way, one get_position per body and age."""
+    out = []
+    def walk(body, centers):
+        positions = np.array([body.get_position(age) for age in ages]) + centers
+        out.append(positions)
+        for child in body.bound_objects:
+            walk(child, positions)
+    walk(system.root, np.zeros((len(ages), 3)))
+    return np.array(out)
+
+
+if __name__ == "__main__":
+    n_ages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    system = SolarSystem.from_json(os.path.join(ROOT, "solar_system.json"))
+    n_bodies = len(system.bodies())
+    ages = np.linspace(0.0, 5.0, n_ages)
+    print(f"{n_bodies} bodies, {n_ages} ages\n")
+
+    start = time.perf_counter()
+    reference = per_call(system, ages)
+    slow = time.perf_counter() - start
+    start = time.perf_counter()
+    positions = system.positions(ages)
+    fast = time.perf_counter() - start
+
+    scale = np.abs(reference).max(axis=(1, 2), keepdims=True)
+    print(f"{'get_position per body and age':<32} {n_bodies * n_ages / slow:14,.0f} positions/s")
+    print(f"{'SolarSystem.positions':<32} {n_bodies * n_ages / fast:14,.0f} positions/s  ({slow / fast:.0f}x)")
+    print(f"max relative difference {np.max(np.abs(positions - reference) / scale):.2e}")
+
+    # ======= Compiled table upkeep
+    start = time.perf_counter()
+    for _ in range(100):
+        system.invalidate()
+        system.compile()
+    build = (time.perf_counter() - start) / 100
+    body = system.bodies()[-1]
+    start = time.perf_counter()
+    for i in range(100):
+        body.start_phase = i / 100
+        system.compile()
+    refresh = (time.perf_counter() - start) / 100
+    print(f"\ncompile() from scratch {build * 1e6:8.0f} µs, after one element change {refresh * 1e6:8.0f} µs")
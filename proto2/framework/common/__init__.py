@@ -1 +1,2 @@
-from .colors import Colors
\ No newline at end of file
+from .colors import Colors
+from .kepler import solve_kepler
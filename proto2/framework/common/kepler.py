@@ -0,0 +1,37 @@
+import numpy as np
+
+
+KEPLER_ITERATIONS = 2  # Halley steps after Markley's starter, see benchmarks/bench_kepler.py
+
+
+def solve_kepler(mean_anomaly, e, iterations=KEPLER_ITERATIONS):
+    """
+    Eccentric anomaly E solving Kepler's equation M = E - e sin(E), for arrays of mean
+    anomalies and eccentricities (|e| < 1, broadcast together). Fixed cost: Markley's
+    (1995) cubic starter is within ~4e-4 rad everywhere, then a fixed number of Halley steps.
+    Returns E modulo 2 pi.
+    """
+    M = np.asarray(mean_anomaly, dtype=np.float64)
+    e = np.asarray(e, dtype=np.float64)
+
+    # A negative e (r_min > r_max in the data) is the same orbit with the periapsis half a turn away
+    shift = np.where(e < 0, np.pi, 0.0)
+    e = np.abs(e)
+    M = np.remainder(M - shift + np.pi, 2 * np.pi) - np.pi
+    m = np.abs(M)  # solved on [0, pi], E(-M) = -E(M)
+
+    # ======= Starter
+    alpha = (3 * np.pi**2 + 1.6 * np.pi * (np.pi - m) / (1 + e)) / (np.pi**2 - 6)
+    d = 3 * (1 - e) + alpha * e
+    q = 2 * alpha * d * (1 - e) - m * m
+    r = 3 * alpha * d * (d - 1 + e) * m + m**3
+    w = (np.abs(r) + np.sqrt(q**3 + r * r))**(2 / 3)
+    E = (2 * r * w / (w * w + w * q + q * q) + m) / d
+
+    # ======= Halley refinement
+    for _ in range(iterations):
+        s, c = np.sin(E), np.cos(E)
+        f = E - e * s - m
+        f1 = 1 - e * c
+        E = E - 2 * f * f1 / (2 * f1 * f1 - f * e * s)
+    return np.copysign(E, M) + shift
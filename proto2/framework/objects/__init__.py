@@ -1,2 +1,3 @@
 from .planet import *
-from .solar_system import *
\ No newline at end of file
+from .solar_system import *
+from .orbit_table import OrbitTable
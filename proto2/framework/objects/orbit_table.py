@@ -0,0 +1,143 @@
+import numpy as np
+
+from .planet import rotation_matrices
+from ..common.kepler import solve_kepler
+
+
+class OrbitTable:
+    """
+    The body tree flattened into arrays, one row per body: orbital elements, composite
+    rotation matrices, parent row (-1 for the root) and depth. Parents always come
+    before their children, so the row order is a topological order of the tree.
+
+    Kept up to date in place: bodies mark their row when an element changes
+    (refresh() recomputes just those rows), added subtrees are appended and removed
+    ones compacted away, the tree is never walked again.
+    """
+
+    ELEMENTS = ("a", "e", "b", "phi", "theta", "alpha", "start_phase", "period")
+
+    def __init__(self, root):
+        self.bodies = []
+        self.parent = np.empty(0, dtype=np.int64)
+        self.depth = np.empty(0, dtype=np.int64)
+        for name in self.ELEMENTS:
+            setattr(self, name, np.empty(0))
+        self.rotation = np.empty((0, 3, 3))
+        self._rows = {}  # id(body) -> row
+        self._dirty = set()
+        self._levels = None
+        self.append(root)
+
+    def __len__(self):
+        return len(self.bodies)
+
+    def row(self, body):
+        return self._rows[id(body)]
+
+    @property
+    def levels(self):
+        """Rows at each depth, the order children can be processed after their parents."""
+        if self._levels is None:
+            self._levels = [np.flatnonzero(self.depth == d) for d in range(self.depth.max() + 1)]
+        return self._levels
+
+    # ======= Structure ======
+
+    def append(self, body, parent=None):
+        """Adds body and everything bound to it as new rows, parent being the body it orbits."""
+        parent_row = -1 if parent is None else self.row(parent)
+        parent_depth = -1 if parent is None else self.depth[parent_row]
+        rows, parents, depths = [], [], []
+        stack = [(body, parent_row, parent_depth + 1)]
+        while stack:
+            body, parent_row, depth = stack.pop()
+            index = len(self.bodies) + len(rows)
+            rows.append(body)
+            parents.append(parent_row)
+            depths.append(depth)
+            stack.extend((child, index, depth + 1) for child in reversed(body.bound_objects))
+
+        for body in rows:
+            self._rows[id(body)] = len(self.bodies)
+            self.bodies.append(body)
+            body._table = self
+        self.parent = np.concatenate([self.parent, parents])
+        self.depth = np.concatenate([self.depth, depths])
+        for name in self.ELEMENTS:
+            setattr(self, name, np.concatenate([getattr(self, name), [self._element(body, name) for body in rows]]))
+        self.rotation = np.concatenate([self.rotation, rotation_matrices(self.phi[-len(rows):], self.theta[-len(rows):], self.alpha[-len(rows):])])
+        self._levels = None
+
+    def remove(self, body):
+        """Drops the rows of body and everything bound to it."""
+        removed = np.zeros(len(self), dtype=bool)
+        removed[self.row(body)] = True
+        for level in self.levels[self.depth[self.row(body)] + 1:]:
+            removed[level] |= removed[self.parent[level]]
+
+        keep = np.flatnonzero(~removed)
+        new_row = np.full(len(self), -1)
+        new_row[keep] = np.arange(len(keep))
+        for row in np.flatnonzero(removed):
+            self.bodies[row]._table = None
+            self._dirty.discard(row)
+        self._dirty = {int(new_row[row]) for row in self._dirty}
+
+        self.bodies = [self.bodies[row] for row in keep]
+        self._rows = {id(body): row for row, body in enumerate(self.bodies)}
+        parent = self.parent[keep]
+        self.parent = np.where(parent < 0, -1, new_row[parent])
+        self.depth = self.depth[keep]
+        for name in self.ELEMENTS:
+            setattr(self, name, getattr(self, name)[keep])
+        self.rotation = self.rotation[keep]
+        self._levels = None
+
+    # ======= Elements ======
+
+    def mark(self, body):
+        """Called by a body whose elements changed, the row is recomputed on refresh()."""
+        self._dirty.add(self.row(body))
+
+    def refresh(self):
+        if not self._dirty:
+            return
+        rows = np.fromiter(self._dirty, dtype=np.int64)
+        self._dirty.clear()
+        for name in self.ELEMENTS:
+            getattr(self, name)[rows] = [self._element(self.bodies[row], name) for row in rows]
+        self.rotation[rows] = rotation_matrices(self.phi[rows], self.theta[rows], self.alpha[rows])
+
+    @staticmethod
+    def _element(body, name):
+        value = getattr(body, name)
+        return np.nan if value is None else value  # period of a body with no known period
+
+    # ======= Queries ======
+
+    def positions(self, ages, kepler=False):
+        """
+        Absolute position of every row at every age, shape (n_bodies, n_ages, 3).
+        kepler=True: ages in years since the epoch, see Planet.get_position.
+        """
+        ages = np.atleast_1d(np.asarray(ages, dtype=np.float64))
+        a, e, b = self.a[:, None], self.e[:, None], self.b[:, None]
+
+        # Position on the ellipse in the orbital plane (z = 0), then rotated
+        if kepler:
+            unknown = np.flatnonzero(np.isnan(self.period))
+            if len(unknown):
+                names = ", ".join(self.bodies[row].name for row in unknown)
+                raise ValueError(f"No period for {names}, give them one or the mass of the body they orbit")
+            t = solve_kepler(2 * np.pi * ((self.start_phase[:, None] + ages[None, :] / self.period[:, None]) % 1.0), e)
+        else:
+            t = 2 * np.pi * ((ages[None, :] + self.start_phase[:, None]) % 1.0)
+        x = a * np.cos(t) - a * e
+        y = b * np.sin(t)
+        positions = x[..., None] * self.rotation[:, None, :, 0] + y[..., None] * self.rotation[:, None, :, 1]
+
+        # Children orbit their parent, add the parent offsets one depth level at a time
+        for level in self.levels[1:]:
+            positions[level] += positions[self.parent[level]]
+        return positions
@@ -2,9 +2,74 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from ..common.kepler import solve_kepler
+
+
+# ======= Orbit polylines ======
+ORBIT_TOLERANCE = 0.5  # pixels a polyline segment may stray from the ellipse
+ORBIT_MAX_TURN = np.radians(5)  # direction change between segments, keeps eccentric periapses round
+ORBIT_VISIBLE = 4  # pixels, orbits with a smaller semi-major axis get the minimum
+MIN_ORBIT_POINTS, MAX_ORBIT_POINTS = 16, 4096
+SCREEN_SIZE = 800  # pixels an orbit plotted on its own spans
+
+
+def orbit_samples(a, e, scale):
+    """
+    Points for a smooth polyline of an orbit drawn at scale pixels per unit, vectorized
+    over a and e. Sampling is uniform in eccentric anomaly: the sagitta of a step dE is
+    a dE^2 / 8 and the tangent turns by up to dE / sqrt(1 - e^2) at the periapsis.
+    Rounded up to a multiple of 16 so small zoom changes keep hitting the cache.
+    """
+    a_px = np.abs(a) * scale
+    step = np.minimum(np.sqrt(8 * ORBIT_TOLERANCE / np.maximum(a_px, 1e-300)),
+                      ORBIT_MAX_TURN * np.sqrt(1 - np.square(e)))
+    n = 16 * np.ceil((2 * np.pi / step + 1) / 16)
+    n = np.where(a_px < ORBIT_VISIBLE, MIN_ORBIT_POINTS, n)
+    return np.clip(n, MIN_ORBIT_POINTS, MAX_ORBIT_POINTS).astype(int)
+
+
+def rotation_matrices(phi, theta, alpha):
+    """Composite rotations Rz(alpha) @ Ry(theta) @ Rx(phi) for arrays of angles (radians), shape (n, 3, 3)."""
+    cp, sp = np.cos(phi), np.sin(phi)
+    ct, st = np.cos(theta), np.sin(theta)
+    ca, sa = np.cos(alpha), np.sin(alpha)
+    return np.stack([
+        np.stack([ca * ct, ca * st * sp - sa * cp, ca * st * cp + sa * sp], axis=-1),
+        np.stack([sa * ct, sa * st * sp + ca * cp, sa * st * cp - ca * sp], axis=-1),
+        np.stack([-st, ct * sp, ct * cp], axis=-1),
+    ], axis=-2)
+
+
 class Planet:
-    def __init__(self, name="Unnamed", r_min=1, r_max=1, phi=0, theta=0, alpha=0, bound_objects=None, start_phase=0.0):
-        
+    ELEMENTS = ("a", "e", "b", "phi", "theta", "alpha", "start_phase", "period")
+    SHAPE = ("a", "e", "b", "phi", "theta", "alpha")  # the elements the orbit polyline depends on
+
+    @classmethod
+    def from_dict(cls, data, central_mass=1.0, root=True):
+        """
+        Body and its bound objects from the nested dicts of solar_system.json. A body without
+        "period" gets Kepler's law around its parent's "mass" (solar masses); the root is
+        taken as a 1 solar mass star, other parents need their mass given.
+        """
+        mass = data.get("mass", 1.0 if root else None)
+        return cls(
+            name=data.get("name", "Unnamed"),
+            r_min=data.get("r_min", 1),
+            r_max=data.get("r_max", 1),
+            phi=data.get("phi", 0),
+            theta=data.get("theta", 0),
+            alpha=data.get("alpha", 0),
+            start_phase=data.get("start_phase", 0.0),
+            period=data.get("period"),
+            central_mass=central_mass,
+            bound_objects=[cls.from_dict(obj, central_mass=mass, root=False) for obj in data.get("bound_objects", [])]
+        )
+
+    def __init__(self, name="Unnamed", r_min=1, r_max=1, phi=0, theta=0, alpha=0, bound_objects=None, start_phase=0.0,
+                 period=None, central_mass=1.0):
+        self._table = None  # OrbitTable the body is compiled into, told when elements change
+        self._orbit_cache = {}  # num_points -> polyline from _generate_orbit, dropped when the shape changes
+
         r_max = r_max if r_max > 1e-10 else 1e-10 # To avoid div/0
         r_min = r_min if r_min > 1e-10 else 1e-10 # To avoid div/0
         
@@ -24,6 +89,28 @@ class Planet:
 
         self.start_phase = start_phase % 1.0  # Fraction along orbit (0=start, 1=full cycle)
 
+        # Orbital period in years, Kepler's third law around central_mass (solar masses) if not given.
+        # None when neither is known, kepler=True positions then raise
+        if period is None and central_mass is not None:
+            period = np.sqrt(self.a**3 / central_mass)
+        self.period = period
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in Planet.SHAPE:
+            self._orbit_cache.clear()
+        if name in Planet.ELEMENTS and self._table is not None:
+            self._table.mark(self)
+
+    def add_bound_object(self, body):
+        self.bound_objects.append(body)
+        if self._table is not None:
+            self._table.append(body, parent=self)
+
+    def remove_bound_object(self, body):
+        self.bound_objects.remove(body)
+        if self._table is not None:
+            self._table.remove(body)
 
     def _generate_orbit(self, num_points=500):
         # Parametric ellipse in 2D (x = a cos, y = b sin), centered at one focus
@@ -34,10 +121,26 @@ class Planet:
         orbit = np.stack([x, y, z], axis=0)
 
         # Apply composite rotation: Rx(phi) -> Ry(theta) -> Rz(alpha)
-        R = self._rotation_matrix_z(self.alpha) @ self._rotation_matrix_y(self.theta) @ self._rotation_matrix_x(self.phi)
-        orbit = R @ orbit
+        orbit = self.rotation_matrix() @ orbit
         return orbit
 
+    def orbit_points(self, num_points=None, scale=None):
+        """
+        Cached orbit polyline, (3, num_points). Without num_points the count comes from
+        orbit_samples at scale pixels per unit, by default the orbit spanning SCREEN_SIZE.
+        """
+        if num_points is None:
+            if scale is None:
+                scale = SCREEN_SIZE / (2 * self.a * (1 + abs(self.e)))
+            num_points = int(orbit_samples(self.a, self.e, scale))
+        orbit = self._orbit_cache.get(num_points)
+        if orbit is None:
+            orbit = self._orbit_cache[num_points] = self._generate_orbit(num_points)
+        return orbit
+
+    def rotation_matrix(self):
+        return self._rotation_matrix_z(self.alpha) @ self._rotation_matrix_y(self.theta) @ self._rotation_matrix_x(self.phi)
+
     def _rotation_matrix_x(self, angle):
         c, s = np.cos(angle), np.sin(angle)
         return np.array([[1, 0, 0],
@@ -58,21 +161,30 @@ class Planet:
 
 
 
-    def get_position(self, age):
-        t = 2 * np.pi * ((age + self.start_phase) % 1.0)
+    def get_position(self, age, kepler=False):
+        """
+        Position around the parent. By default age is a fraction of orbit used directly as the
+        eccentric anomaly. With kepler=True age is in years since the epoch, start_phase is
+        the mean anomaly at the epoch and the body moves at its true speed along the ellipse.
+        """
+        if kepler:
+            if self.period is None:
+                raise ValueError(f"{self.name} has no period, give it one or the mass of the body it orbits")
+            t = solve_kepler(2 * np.pi * ((self.start_phase + age / self.period) % 1.0), self.e)
+        else:
+            t = 2 * np.pi * ((age + self.start_phase) % 1.0)
         x = self.a * np.cos(t) - self.a * self.e
         y = self.b * np.sin(t)
         z = 0.0
         pos = np.array([x, y, z])
 
         # Same rotation order
-        R = self._rotation_matrix_z(self.alpha) @ self._rotation_matrix_y(self.theta) @ self._rotation_matrix_x(self.phi)
-        return R @ pos
+        return self.rotation_matrix() @ pos
 
 
 
     def plot_orbit(self, ax=None, show=True, color='blue', label=None, center=(0, 0, 0)):
-        self.orbit = self._generate_orbit()
+        self.orbit = self.orbit_points()
         
         # Translate orbit to new center
         center = np.asarray(center).reshape(3, 1)
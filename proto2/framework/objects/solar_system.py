@@ -1,32 +1,77 @@
+import json
+
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+
+from .planet import Planet, orbit_samples, ORBIT_TOLERANCE
+from .orbit_table import OrbitTable
+
 
 class SolarSystem:
     def __init__(self, root, name="Unnamed System", creation_date=0.0):
         self.root = root
         self.name = name
         self.creation_date = creation_date
+        self._table = None
 
-    def _display_recursive(self, planet, ax, age, center):
-        # Plot orbit around current center
-        planet.orbit = planet._generate_orbit()
-        orbit = planet.orbit + np.array(center).reshape(3, 1)
-        ax.plot(orbit[0], orbit[1], orbit[2], label=planet.name)
+    @classmethod
+    def from_json(cls, filepath):
+        with open(filepath, "r") as f:
+            data = json.load(f)
+        root = Planet.from_dict(data["root"])
+        return cls(root=root, name=data.get("name", "Unnamed System"), creation_date=data.get("creation_date", 0.0))
 
-        # Plot body at current position
-        position = planet.get_position(age) + center
-        ax.scatter(*position, label=f"{planet.name}", s=20)
+    def compile(self):
+        """
+        The body tree as an OrbitTable, shared by positions() and display(). Built on first
+        use, then kept in sync by the bodies: use Planet.add_bound_object/remove_bound_object
+        to change the tree, or invalidate() after editing bound_objects by hand.
+        """
+        if self._table is None or self._table.bodies[0] is not self.root:
+            self.invalidate()
+            self._table = OrbitTable(self.root)
+        self._table.refresh()
+        return self._table
 
-        # Recurse for moons/children
-        for child in planet.bound_objects:
-            self._display_recursive(child, ax, age, position)
+    def invalidate(self):
+        if self._table is not None:
+            for body in self._table.bodies:
+                body._table = None
+        self._table = None
 
-    def display(self, age=0.0):
-        fig = plt.figure(figsize=(10, 8))
-        ax = fig.add_subplot(111, projection='3d')
-        self._display_recursive(self.root, ax, age, center=np.zeros(3))
+    def bodies(self):
+        """Every body, in the row order of positions(): parents before their children."""
+        return list(self.compile().bodies)
 
-        ax.set_title(f"Solar System: {self.name} (Age = {age:.2f})")
+    def positions(self, ages, kepler=False):
+        """
+        Absolute position of every body (bodies() order) at every age, shape (n_bodies, n_ages, 3).
+        Same as summing get_position down the hierarchy, computed on the compiled arrays.
+        kepler=True: physically timed, ages in years since creation_date, see Planet.get_position.
+        """
+        return self.compile().positions(ages, kepler=kepler)
+
+    def _display_compiled(self, ax, age):
+        # Positions of every body from one batched call, orbits drawn around their parent
+        table = self.compile()
+        positions = table.positions(age)[:, 0]
+        num_points = orbit_samples(table.a, table.e, self._screen_scale(ax))
+        for row, planet in enumerate(table.bodies):
+            center = positions[table.parent[row]] if table.parent[row] >= 0 else np.zeros(3)
+            planet.orbit = planet.orbit_points(num_points[row])
+            orbit = planet.orbit + center.reshape(3, 1)
+            ax.plot(orbit[0], orbit[1], orbit[2], label=planet.name)
+            ax.scatter(*positions[row], label=f"{planet.name}", s=20)
+
+    def _screen_scale(self, ax):
+        """Pixels per unit when the widest orbit spans the axes."""
+        table = self.compile()
+        width, height = ax.figure.get_size_inches() * ax.figure.dpi
+        extent = np.max(table.a * (1 + np.abs(table.e)))
+        return min(width, height) / (2 * extent)
+
+    def _equal_axes(self, ax):
         ax.set_xlabel("X")
         ax.set_ylabel("Y")
         ax.set_zlabel("Z")
@@ -56,6 +101,60 @@ class SolarSystem:
         # Now force equal aspect
         ax.set_box_aspect([1, 1, 1])
 
+    def display(self, age=0.0):
+        fig = plt.figure(figsize=(10, 8))
+        ax = fig.add_subplot(111, projection='3d')
+        self._display_compiled(ax, age)
+
+        ax.set_title(f"Solar System: {self.name} (Age = {age:.2f})")
+        self._equal_axes(ax)
 
         ax.legend()
         plt.show()
+
+    # ======= Animation ======
+
+    def animate(self, ages, kepler=False, interval=40, blit=True, show=True):
+        """
+        Time-lapse over ages (see positions() for kepler). Orbit lines are created once and
+        each frame only moves artists: the body markers, and the orbits whose parent moves
+        by more than ORBIT_TOLERANCE pixels (moons), shifted along with it. Positions for
+        every frame come from one positions() call. Returns the FuncAnimation, keep a
+        reference to it while it plays.
+        """
+        table = self.compile()
+        ages = np.atleast_1d(np.asarray(ages, dtype=np.float64))
+        positions = table.positions(ages, kepler=kepler)  # (n_bodies, n_frames, 3)
+        has_parent = table.parent >= 0
+        centers = np.zeros_like(positions)
+        centers[has_parent] = positions[table.parent[has_parent]]
+
+        fig = plt.figure(figsize=(10, 8))
+        ax = fig.add_subplot(111, projection='3d')
+        scale = self._screen_scale(ax)
+        num_points = orbit_samples(table.a, table.e, scale)
+        orbits = [planet.orbit_points(n) for planet, n in zip(table.bodies, num_points)]
+        lines = [ax.plot(*(orbit + centers[row, 0][:, None]), label=planet.name)[0]
+                 for row, (planet, orbit) in enumerate(zip(table.bodies, orbits))]
+        bodies = ax.scatter(*positions[:, 0].T, c=[line.get_color() for line in lines], s=20)
+        moving = np.flatnonzero(np.ptp(centers, axis=1).max(axis=1) * scale > ORBIT_TOLERANCE)
+
+        # The age is drawn inside the axes: blitting only restores and redraws ax.bbox
+        ax.set_title(f"Solar System: {self.name}")
+        age = ax.text2D(0.02, 0.95, "", transform=ax.transAxes)
+        self._equal_axes(ax)
+        ax.legend()
+
+        def update(frame):
+            bodies._offsets3d = tuple(positions[:, frame].T)
+            if blit:
+                bodies.do_3d_projection()  # a full draw projects it, draw_artist does not
+            for row in moving:
+                lines[row].set_data_3d(*(orbits[row] + centers[row, frame][:, None]))
+            age.set_text(f"Age = {ages[frame]:.2f}")
+            return [bodies, age, *(lines[row] for row in moving)]
+
+        animation = FuncAnimation(fig, update, frames=len(ages), interval=interval, blit=blit)
+        if show:
+            plt.show()
+        return animation